@@ -323,6 +323,8 @@ class Endpoint(APIView):
             response["X-Hits"] = cursor_result.hits
         if cursor_result.max_hits is not None:
             response["X-Max-Hits"] = cursor_result.max_hits
+        if cursor_result.hits is not None and cursor_result.hits_exact is not None:
+            response["X-Hits-Exact"] = "true" if cursor_result.hits_exact else "false"
         response["Link"] = ", ".join(
             [
                 self.build_cursor_link(request, "previous", cursor_result.prev),
@@ -1,5 +1,6 @@
 import re
 from collections import namedtuple
+from copy import deepcopy
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
@@ -29,6 +30,7 @@ from sentry.search.utils import (
     parse_percentage,
 )
 from sentry.utils.compat import filter, map
+from sentry.utils.lru import LRUCache
 from sentry.utils.snuba import is_duration_measurement, is_measurement, is_span_op_breakdown
 from sentry.utils.validators import is_event_id, is_span_id
 
@@ -465,6 +467,9 @@ class SearchVisitor(NodeVisitor):
             config = SearchConfig()
         self.config = config
         self.params = params if params is not None else {}
+        # Whether the result only depends on the parse tree, the config and
+        # whether there are params, see `parse_search_query`.
+        self.is_cacheable = True
 
     @cached_property
     def key_mappings_lookup(self):
@@ -528,6 +533,11 @@ class SearchVisitor(NodeVisitor):
 
         return ParenExpression(children)
 
+    def _resolve_function(self, search_key):
+        if self.params:
+            self.is_cacheable = False
+        return resolve_field(search_key.name, self.params, functions_acl=FUNCTIONS.keys())
+
     # --- Start of filter visitors
 
     def _handle_basic_filter(self, search_key, operator, search_value):
@@ -600,6 +610,8 @@ class SearchVisitor(NodeVisitor):
         (search_key, _, value) = children
 
         if self.is_date_key(search_key.name):
+            # Relative dates are resolved against the current time
+            self.is_cacheable = False
             try:
                 from_val, to_val = parse_datetime_range(value.text)
             except InvalidQuery as exc:
@@ -701,7 +713,7 @@ class SearchVisitor(NodeVisitor):
         try:
             # Even if the search value matches duration format, only act as
             # duration for certain columns
-            function = resolve_field(search_key.name, self.params, functions_acl=FUNCTIONS.keys())
+            function = self._resolve_function(search_key)
 
             is_duration_key = False
             if function.aggregate is not None:
@@ -737,7 +749,7 @@ class SearchVisitor(NodeVisitor):
         try:
             # Even if the search value matches percentage format, only act as
             # percentage for certain columns
-            function = resolve_field(search_key.name, self.params, functions_acl=FUNCTIONS.keys())
+            function = self._resolve_function(search_key)
             if function.aggregate is not None and self.is_percentage_key(function.aggregate[0]):
                 aggregate_value = parse_percentage(search_value)
         except ValueError:
@@ -783,6 +795,7 @@ class SearchVisitor(NodeVisitor):
         operator = handle_negation(negation, operator)
         is_date_aggregate = any(key in search_key.name for key in self.config.date_keys)
         if is_date_aggregate:
+            self.is_cacheable = False
             try:
                 from_val, to_val = parse_datetime_range(search_value.text)
             except InvalidQuery as exc:
@@ -1070,20 +1083,53 @@ default_config = SearchConfig(
 )
 
 
+#: The number of parse trees of distinct queries kept per process.
+PARSE_TREE_CACHE_SIZE = 500
+#: The number of parsed filter lists kept per process.
+PARSE_RESULT_CACHE_SIZE = 1000
+
+_parse_tree_cache: LRUCache = LRUCache(PARSE_TREE_CACHE_SIZE)
+_parse_result_cache: LRUCache = LRUCache(PARSE_RESULT_CACHE_SIZE)
+
+
 def parse_search_query(query, config=None, params=None) -> Sequence[SearchFilter]:
+    """
+    Parses a search query into a list of filters.
+
+    Parsing the grammar is expensive for long queries, and the same queries are
+    parsed over and over, so the parse tree of a query is cached. The filters
+    built from it are cached as well, keyed by the identity of the config and
+    whether there are params, unless they depend on the current time (relative
+    dates) or on the contents of the params. Every caller gets its own copy of
+    the filters, so they're free to modify them.
+    """
     if config is None:
         config = default_config
 
-    try:
-        tree = event_search_grammar.parse(query)
-    except IncompleteParseError as e:
-        idx = e.column()
-        prefix = query[max(0, idx - 5) : idx]
-        suffix = query[idx : (idx + 5)]
-        raise InvalidSearchQuery(
-            "{} {}".format(
-                f"Parse error at '{prefix}{suffix}' (column {e.column():d}).",
-                "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
+    cache_key = (query, id(config), bool(params))
+    cached = _parse_result_cache.get(cache_key)
+    # The cached config keeps its id from being reused by another config
+    if cached is not None and cached[0] is config:
+        return deepcopy(cached[1])
+
+    tree = _parse_tree_cache.get(query)
+    if tree is None:
+        try:
+            tree = event_search_grammar.parse(query)
+        except IncompleteParseError as e:
+            idx = e.column()
+            prefix = query[max(0, idx - 5) : idx]
+            suffix = query[idx : (idx + 5)]
+            raise InvalidSearchQuery(
+                "{} {}".format(
+                    f"Parse error at '{prefix}{suffix}' (column {e.column():d}).",
+                    "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
+                )
             )
-        )
-    return SearchVisitor(config, params=params).visit(tree)
+        _parse_tree_cache.set(query, tree)
+
+    visitor = SearchVisitor(config, params=params)
+    result = visitor.visit(tree)
+    if visitor.is_cacheable:
+        _parse_result_cache.set(cache_key, (config, deepcopy(result)))
+    return result
@@ -9,8 +9,12 @@ from django.db.models.functions import Lower
 from django.db.models.sql.datastructures import EmptyResultSet
 from django.utils import timezone
 
+from sentry import options
+from sentry.utils import json, metrics
+from sentry.utils.cache import cache
 from sentry.utils.compat import map, zip
 from sentry.utils.cursors import Cursor, CursorResult, build_cursor
+from sentry.utils.hashlib import md5_text
 
 quote_name = connections["default"].ops.quote_name
 
@@ -18,6 +22,18 @@ quote_name = connections["default"].ops.quote_name
 MAX_LIMIT = 100
 MAX_HITS_LIMIT = 1000
 
+# Strategies for counting hits of ``BasePaginator`` querysets:
+#: Count the matching rows (up to ``max_hits``) on every request.
+COUNT_HITS_EXACT = "exact"
+#: Cache exact counts for ``HITS_CACHE_TTL`` seconds, keyed by the query.
+COUNT_HITS_CACHED = "cached"
+#: Use the row estimate of the Postgres planner if it exceeds ``max_hits``,
+#: and count the matching rows otherwise.
+COUNT_HITS_ESTIMATE = "estimate"
+COUNT_HITS_STRATEGIES = (COUNT_HITS_EXACT, COUNT_HITS_CACHED, COUNT_HITS_ESTIMATE)
+
+HITS_CACHE_TTL = 30
+
 
 class BadPaginationError(Exception):
     pass
@@ -25,7 +41,13 @@ class BadPaginationError(Exception):
 
 class BasePaginator:
     def __init__(
-        self, queryset, order_by=None, max_limit=MAX_LIMIT, on_results=None, post_query_filter=None
+        self,
+        queryset,
+        order_by=None,
+        max_limit=MAX_LIMIT,
+        on_results=None,
+        post_query_filter=None,
+        count_hits_strategy=None,
     ):
 
         if order_by:
@@ -40,6 +62,9 @@ class BasePaginator:
         self.max_limit = max_limit
         self.on_results = on_results
         self.post_query_filter = post_query_filter
+        # Defaults to the globally configured strategy.
+        self.count_hits_strategy = count_hits_strategy
+        assert count_hits_strategy in COUNT_HITS_STRATEGIES + (None,)
 
     def _is_asc(self, is_prev):
         return (self.desc and is_prev) or not (self.desc or is_prev)
@@ -122,8 +147,9 @@ class BasePaginator:
         # max_hits can be limited to speed up the query
         if max_hits is None:
             max_hits = MAX_HITS_LIMIT
+        hits_exact = None
         if count_hits:
-            hits = self.count_hits(max_hits)
+            hits, hits_exact = self.get_hits(max_hits)
         elif known_hits is not None:
             hits = known_hits
         else:
@@ -164,6 +190,7 @@ class BasePaginator:
             limit=limit,
             hits=hits,
             max_hits=max_hits if count_hits else None,
+            hits_exact=hits_exact,
             cursor=cursor,
             is_desc=self.desc,
             key=self.get_item_key,
@@ -178,22 +205,88 @@ class BasePaginator:
 
         return cursor
 
-    def count_hits(self, max_hits):
-        if not max_hits:
-            return 0
-        hits_query = self.queryset.values()[:max_hits].query
+    def _get_hits_sql(self, max_hits=None):
+        hits_query = self.queryset.values()
+        if max_hits is not None:
+            hits_query = hits_query[:max_hits]
+        hits_query = hits_query.query
         # clear out any select fields (include select_related) and pull just the id
         hits_query.clear_select_clause()
         hits_query.add_fields(["id"])
         hits_query.clear_ordering(force_empty=True)
+        return hits_query.sql_with_params()
+
+    def count_hits(self, max_hits):
+        if not max_hits:
+            return 0
         try:
-            h_sql, h_params = hits_query.sql_with_params()
+            h_sql, h_params = self._get_hits_sql(max_hits)
         except EmptyResultSet:
             return 0
         cursor = connections[self.queryset.db].cursor()
         cursor.execute(f"SELECT COUNT(*) FROM ({h_sql}) as t", h_params)
         return cursor.fetchone()[0]
 
+    def estimate_hits(self):
+        """
+        Returns the number of matching rows estimated by the Postgres planner.
+        """
+        try:
+            h_sql, h_params = self._get_hits_sql()
+        except EmptyResultSet:
+            return 0
+        cursor = connections[self.queryset.db].cursor()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {h_sql}", h_params)
+        plan = cursor.fetchone()[0]
+        # Depending on the driver, the plan is returned decoded or as a string.
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_hits(self, max_hits):
+        """
+        Returns ``(hits, exact)``, the number of hits up to ``max_hits`` and
+        whether that number is exact, using the configured strategy.
+        """
+        if not max_hits:
+            return 0, True
+
+        strategy = self.count_hits_strategy or options.get("api.paginator.count-hits-strategy")
+        if strategy == COUNT_HITS_ESTIMATE:
+            try:
+                estimate = self.estimate_hits()
+            except Exception:
+                metrics.incr("api.paginator.estimate_hits_failed", skip_internal=True)
+            else:
+                if estimate > max_hits:
+                    metrics.incr(
+                        "api.paginator.count_hits",
+                        tags={"strategy": strategy, "result": "estimate"},
+                    )
+                    return max_hits, False
+        elif strategy == COUNT_HITS_CACHED:
+            try:
+                h_sql, h_params = self._get_hits_sql(max_hits)
+            except EmptyResultSet:
+                return 0, True
+            cache_key = "api.paginator.hits:{}".format(
+                md5_text(self.queryset.db, h_sql, repr(h_params)).hexdigest()
+            )
+            hits = cache.get(cache_key)
+            if hits is not None:
+                metrics.incr(
+                    "api.paginator.count_hits", tags={"strategy": strategy, "result": "cached"}
+                )
+                return hits, False
+
+            hits = self.count_hits(max_hits)
+            cache.set(cache_key, hits, HITS_CACHE_TTL)
+            metrics.incr("api.paginator.count_hits", tags={"strategy": strategy, "result": "exact"})
+            return hits, True
+
+        metrics.incr("api.paginator.count_hits", tags={"strategy": strategy, "result": "exact"})
+        return self.count_hits(max_hits), True
+
 
 class Paginator(BasePaginator):
     def get_item_key(self, item, for_prev=False):
@@ -1,6 +1,8 @@
 import functools
 import logging
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Iterable, Mapping, Optional, Tuple
 
@@ -9,8 +11,9 @@ import sentry_sdk
 from django.conf import settings
 from django.db.models import Min, prefetch_related_objects
 from django.utils import timezone
+from sentry_sdk import Hub
 
-from sentry import release_health, tagstore, tsdb
+from sentry import options, release_health, tagstore, tsdb
 from sentry.api.serializers import Serializer, register, serialize
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.serializers.models.plugin import is_plugin_deprecated
@@ -73,6 +76,64 @@ def merge_list_dictionaries(dict1, dict2):
         dict1.setdefault(key, []).extend(val)
 
 
+# The queries may run bulk queries on the thread pool of ``sentry.utils.snuba``
+# themselves, so they get a pool of their own.
+_stats_query_pool = ThreadPoolExecutor(max_workers=10)
+
+
+def _run_stats_query(hub, query):
+    with hub:
+        start = time.time()
+        result = query()
+        return result, time.time() - start
+
+
+def run_stats_queries(queries):
+    """
+    Starts running independent queries, given as a mapping of names to
+    callables. Returns a function that waits for the queries and returns their
+    results by name.
+
+    The queries run concurrently if the
+    ``serializers.group-stream.concurrent-queries`` option is set, and one
+    after another when their results are requested otherwise.
+    """
+    start = time.time()
+    if options.get("serializers.group-stream.concurrent-queries"):
+        mode = "concurrent"
+        futures = {
+            name: _stats_query_pool.submit(_run_stats_query, Hub(Hub.current), query)
+            for name, query in queries.items()
+        }
+        get_result = lambda name: futures[name].result()
+    else:
+        mode = "serial"
+        get_result = lambda name: _run_stats_query(Hub.current, queries[name])
+
+    def wait():
+        results = {}
+        durations = {}
+        for name in queries:
+            results[name], durations[name] = get_result(name)
+
+        for name, duration in durations.items():
+            metrics.timing(
+                "serializers.group_stream.query", duration, tags={"mode": mode, "query": name}
+            )
+        if durations:
+            # In concurrent mode, the slowest query bounds how long the
+            # serializer waits for the queries.
+            metrics.timing(
+                "serializers.group_stream.critical_path",
+                max(durations.values()),
+                tags={"mode": mode},
+            )
+        metrics.timing("serializers.group_stream.wait", time.time() - start, tags={"mode": mode})
+        return results
+
+    return wait
+
+
 class GroupSerializerBase(Serializer):
     def __init__(
         self,
@@ -908,18 +969,21 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                 start=self.start,
                 end=self.end,
             )
-            time_range_result = partial_execute_seen_stats_query()
-            filtered_result = (
-                partial_execute_seen_stats_query(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
-            )
-            if not self._collapse("lifetime"):
-                lifetime_result = (
-                    partial_execute_seen_stats_query(start=None, end=None)
-                    if self.start or self.end
-                    else time_range_result
+            queries = {"time_range": partial_execute_seen_stats_query}
+            if self.conditions and not self._collapse("filtered"):
+                queries["filtered"] = functools.partial(
+                    partial_execute_seen_stats_query, conditions=self.conditions
                 )
+            if not self._collapse("lifetime") and (self.start or self.end):
+                queries["lifetime"] = functools.partial(
+                    partial_execute_seen_stats_query, start=None, end=None
+                )
+            results = run_stats_queries(queries)()
+
+            time_range_result = results["time_range"]
+            filtered_result = results.get("filtered")
+            if not self._collapse("lifetime"):
+                lifetime_result = results.get("lifetime", time_range_result)
             else:
                 lifetime_result = None
 
@@ -942,7 +1006,60 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             **query_params,
         )
 
+    def _get_session_counts(self, item_list):
+        uniq_project_ids = list({item.project_id for item in item_list})
+        cache_keys = {pid: self._build_session_cache_key(pid) for pid in uniq_project_ids}
+        cache_data = cache.get_many(cache_keys.values())
+        session_counts = {}
+        missed_items = []
+        for item in item_list:
+            num_sessions = cache_data.get(cache_keys[item.project_id])
+            if num_sessions is None:
+                found = "miss"
+                missed_items.append(item)
+            else:
+                found = "hit"
+                session_counts[item] = num_sessions
+            metrics.incr(f"group.get_session_counts.{found}")
+
+        if missed_items:
+            project_ids = list({item.project_id for item in missed_items})
+            project_sessions = release_health.get_num_sessions_per_project(
+                project_ids,
+                self.start,
+                self.end,
+                self.environment_ids,
+            )
+
+            results = {}
+            for project_id, count in project_sessions:
+                cache_key = self._build_session_cache_key(project_id)
+                results[project_id] = count
+                cache.set(cache_key, count, 3600)
+
+            for item in missed_items:
+                session_counts[item] = results.get(item.project_id)
+
+        return session_counts
+
     def get_attrs(self, item_list, user):
+        # The stats queries don't depend on the base attributes, so they are
+        # started first and (with concurrent queries) run while those are
+        # fetched.
+        wait_for_stats = None
+        if self.stats_period and not self._collapse("stats"):
+            partial_get_stats = functools.partial(
+                self.get_stats, item_list=item_list, user=user, environment_ids=self.environment_ids
+            )
+            queries = {"stats": partial_get_stats}
+            if self.conditions and not self._collapse("filtered"):
+                queries["filtered_stats"] = functools.partial(
+                    partial_get_stats, conditions=self.conditions
+                )
+            if self._expand("sessions"):
+                queries["session_counts"] = functools.partial(self._get_session_counts, item_list)
+            wait_for_stats = run_stats_queries(queries)
+
         if not self._collapse("base"):
             attrs = super().get_attrs(item_list, user)
         else:
@@ -952,64 +1069,19 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             else:
                 attrs = {item: {} for item in item_list}
 
-        if self.stats_period and not self._collapse("stats"):
-            partial_get_stats = functools.partial(
-                self.get_stats, item_list=item_list, user=user, environment_ids=self.environment_ids
-            )
-            stats = partial_get_stats()
-            filtered_stats = (
-                partial_get_stats(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
-            )
+        if wait_for_stats is not None:
+            results = wait_for_stats()
+            stats = results["stats"]
+            filtered_stats = results.get("filtered_stats")
             for item in item_list:
                 if filtered_stats:
                     attrs[item].update({"filtered_stats": filtered_stats[item.id]})
                 attrs[item].update({"stats": stats[item.id]})
 
-            if self._expand("sessions"):
-                uniq_project_ids = list({item.project_id for item in item_list})
-                cache_keys = {pid: self._build_session_cache_key(pid) for pid in uniq_project_ids}
-                cache_data = cache.get_many(cache_keys.values())
-                missed_items = []
+            if "session_counts" in results:
+                session_counts = results["session_counts"]
                 for item in item_list:
-                    num_sessions = cache_data.get(cache_keys[item.project_id])
-                    if num_sessions is None:
-                        found = "miss"
-                        missed_items.append(item)
-                    else:
-                        found = "hit"
-                        attrs[item].update(
-                            {
-                                "sessionCount": num_sessions,
-                            }
-                        )
-                    metrics.incr(f"group.get_session_counts.{found}")
-
-                if missed_items:
-                    project_ids = list({item.project_id for item in missed_items})
-                    project_sessions = release_health.get_num_sessions_per_project(
-                        project_ids,
-                        self.start,
-                        self.end,
-                        self.environment_ids,
-                    )
-
-                    results = {}
-                    for project_id, count in project_sessions:
-                        cache_key = self._build_session_cache_key(project_id)
-                        results[project_id] = count
-                        cache.set(cache_key, count, 3600)
-
-                    for item in missed_items:
-                        if item.project_id in results.keys():
-                            attrs[item].update(
-                                {
-                                    "sessionCount": results[item.project_id],
-                                }
-                            )
-                        else:
-                            attrs[item].update({"sessionCount": None})
+                    attrs[item].update({"sessionCount": session_counts[item]})
 
         if self._expand("inbox"):
             inbox_stats = get_inbox_details(item_list)
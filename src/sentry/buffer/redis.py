@@ -1,8 +1,10 @@
 import pickle
 import threading
+from collections import defaultdict
 from datetime import datetime
 from time import time
 
+import msgpack
 from django.db import models
 from django.utils import timezone
 from django.utils.encoding import force_bytes, force_text
@@ -14,11 +16,18 @@ from sentry.utils import json, metrics
 from sentry.utils.compat import crc32
 from sentry.utils.hashlib import md5_text
 from sentry.utils.imports import import_string
-from sentry.utils.redis import get_cluster_from_options
+from sentry.utils.redis import get_cluster_from_options, load_script
 
 _local_buffers = None
 _local_buffers_lock = threading.Lock()
 
+drain = load_script("buffer/drain.lua")
+
+# Prefix of values written with the compact (msgpack) encoding. This can never
+# be the first byte of a pickle or of the JSON encoding, so the format of a
+# stored value can be determined from its first byte.
+COMPACT_ENCODING_V1 = b"\x01"
+
 
 class PendingBuffer:
     def __init__(self, size):
@@ -51,10 +60,23 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(
+        self,
+        pending_partitions=1,
+        incr_batch_size=2,
+        compact_encoding=False,
+        batch_process=False,
+        **options,
+    ):
         self.cluster, options = get_cluster_from_options("SENTRY_BUFFER_OPTIONS", options)
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
+        # Writing the compact encoding should only be enabled once all workers
+        # processing the buffer are able to read it.
+        self.compact_encoding = compact_encoding
+        # Drain all keys of a batch that live on the same host with a single
+        # script call rather than one pipeline (and lock) per key.
+        self.batch_process = batch_process
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
 
@@ -130,7 +152,7 @@ class RedisBuffer(Buffer):
         return result
 
     def _load_value(self, payload):
-        (type_, value) = payload
+        type_, value = payload
         if type_ == "s":
             return force_text(value)
         elif type_ == "d":
@@ -142,6 +164,25 @@ class RedisBuffer(Buffer):
         else:
             raise TypeError(f"invalid type: {type_}")
 
+    def _encode(self, value):
+        if self.compact_encoding:
+            try:
+                return COMPACT_ENCODING_V1 + msgpack.packb(value, use_bin_type=True, datetime=True)
+            except (TypeError, ValueError, OverflowError):
+                # Values that are not representable (models, query
+                # expressions, naive datetimes, integers above 64 bits) keep
+                # using pickle.
+                pass
+        return pickle.dumps(value)
+
+    def _decode(self, value):
+        if value.startswith(COMPACT_ENCODING_V1):
+            return msgpack.unpackb(
+                value[len(COMPACT_ENCODING_V1) :], raw=False, timestamp=3, strict_map_key=False
+            )
+        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+        return pickle.loads(value)
+
     def incr(self, model, columns, filters, extra=None, signal_only=None):
         """
         Increment the key by doing the following:
@@ -165,7 +206,7 @@ class RedisBuffer(Buffer):
         pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
         # TODO(dcramer): once this goes live in production, we can kill the pickle path
         # (this is to ensure a zero downtime deploy where we can transition event processing)
-        pipe.hsetnx(key, "f", pickle.dumps(filters))
+        pipe.hsetnx(key, "f", self._encode(filters))
         # pipe.hsetnx(key, 'f', json.dumps(self._dump_values(filters)))
         for column, amount in columns.items():
             pipe.hincrby(key, "i+" + column, amount)
@@ -177,7 +218,7 @@ class RedisBuffer(Buffer):
             for column, value in extra.items():
                 # TODO(dcramer): once this goes live in production, we can kill the pickle path
                 # (this is to ensure a zero downtime deploy where we can transition event processing)
-                pipe.hset(key, "e+" + column, pickle.dumps(value))
+                pipe.hset(key, "e+" + column, self._encode(value))
                 # pipe.hset(key, 'e+' + column, json.dumps(self._dump_value(value)))
 
         if signal_only is True:
@@ -243,8 +284,39 @@ class RedisBuffer(Buffer):
         if key is not None:
             batch_keys = [key]
 
+        if self.batch_process:
+            self._process_batch_incr(batch_keys)
+        else:
+            for key in batch_keys:
+                self._process_single_incr(key)
+
+    def _process_batch_incr(self, batch_keys):
+        router = self.cluster.get_router()
+        keys_by_host = defaultdict(list)
         for key in batch_keys:
-            self._process_single_incr(key)
+            keys_by_host[router.get_host_for_key(key)].append(key)
+
+        for host_id, keys in keys_by_host.items():
+            script_keys = []
+            for key in keys:
+                script_keys.extend((key, self._make_pending_key_from_key(key)))
+
+            # The script removes every hash while reading it, so a concurrent
+            # or duplicate task will only see empty values and no lock is
+            # needed.
+            with metrics.timer("buffer.process-batch"):
+                replies = drain(self.cluster.get_local_client(host_id), script_keys, [])
+            metrics.timing("buffer.process-batch.size", len(keys))
+
+            # The drained hashes are gone, so a failing key must not prevent
+            # the rest of the batch from being applied.
+            for key, reply in zip(keys, replies):
+                values = {force_text(k): v for k, v in zip(reply[::2], reply[1::2])}
+                try:
+                    self._process_values(key, values)
+                except Exception:
+                    metrics.incr("buffer.process-batch.failed", skip_internal=False)
+                    self.logger.exception("buffer.process-batch.failed", extra={"redis_key": key})
 
     def _process_single_incr(self, key):
         client = self.cluster.get_routing_client()
@@ -271,37 +343,38 @@ class RedisBuffer(Buffer):
             # back, and really we just want to deal with keys as strings.
             values = {force_text(k): v for k, v in values.items()}
 
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
-                return
-
-            # XXX(py3): Note that ``import_string`` explicitly wants a str in
-            # python2, so we'll decode (for python3) and then translate back to
-            # a byte string (in python2) for import_string.
-            model = import_string(str(values.pop("m").decode("utf-8")))  # NOQA
-
-            if values["f"].startswith(b"{"):
-                filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(values.pop("f"))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"["):
-                        extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(v)
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            super().process(model, incr_values, filters, extra_values, signal_only)
+            self._process_values(key, values)
         finally:
             client.delete(lock_key)
+
+    def _process_values(self, key, values):
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return
+
+        # XXX(py3): Note that ``import_string`` explicitly wants a str in
+        # python2, so we'll decode (for python3) and then translate back to
+        # a byte string (in python2) for import_string.
+        model = import_string(str(values.pop("m").decode("utf-8")))  # NOQA
+
+        if values["f"].startswith(b"{"):
+            filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
+        else:
+            filters = self._decode(values.pop("f"))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"["):
+                    extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
+                else:
+                    extra_values[k[2:]] = self._decode(v)
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        super().process(model, incr_values, filters, extra_values, signal_only)
@@ -1360,6 +1360,20 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS = {}
 
+# Compress nodestore payloads before they are written to the backend.
+# Supported values are ``None`` and ``"zstd"``.
+SENTRY_NODESTORE_COMPRESSION = None
+
+# Directory containing trained zstd dictionaries for nodestore compression,
+# one ``<platform>.dict`` file per platform. Dictionaries must not be removed
+# while payloads compressed with them are still stored.
+SENTRY_NODESTORE_COMPRESSION_DICTIONARIES = None
+
+# Write nodestore payloads in the indexed format, which allows decoding
+# subkeys and top-level keys of a payload individually. Indexed payloads are
+# always readable, regardless of this setting.
+SENTRY_NODESTORE_INDEXED_PAYLOADS = False
+
 # Tag storage backend
 SENTRY_TAGSTORE = os.environ.get("SENTRY_TAGSTORE", "sentry.tagstore.snuba.SnubaTagStorage")
 SENTRY_TAGSTORE_OPTIONS = {}
@@ -1451,6 +1465,10 @@ SENTRY_SOURCE_FETCH_SOCKET_TIMEOUT = 2
 # Maximum content length for source files before we abort fetching
 SENTRY_SOURCE_FETCH_MAX_SIZE = 40 * 1024 * 1024
 
+# Maximum total size of source files and source maps whose parsed views are
+# kept in memory by each processing worker, to be reused across events.
+SENTRY_SOURCEMAP_VIEW_CACHE_SIZE = 128 * 1024 * 1024
+
 # Maximum content length for cache value.  Currently used only to avoid
 # pointless compression of sourcemaps and other release files because we
 # silently fail to cache the compressed result anyway.  Defaults to None which
@@ -1458,6 +1476,12 @@ SENTRY_SOURCE_FETCH_MAX_SIZE = 40 * 1024 * 1024
 # e.g. memcached defaults to 1MB  = 1024 * 1024
 SENTRY_CACHE_MAX_VALUE_SIZE = None
 
+# Keep instances of models that opt in (with ``process_cache_ttl``) in memory
+# of each process, in front of the shared cache. Invalidations are published
+# through Redis pub/sub on the given rb cluster.
+SENTRY_MODEL_PROCESS_CACHE = False
+SENTRY_MODEL_PROCESS_CACHE_CLUSTER = "default"
+
 # Fields which managed users cannot change via Sentry UI. Username and password
 # cannot be changed by managed users. Optionally include 'email' and
 # 'name' in SENTRY_MANAGED_USER_FIELDS.
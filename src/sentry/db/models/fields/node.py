@@ -8,6 +8,7 @@ from django.db.models.signals import post_delete
 
 from sentry import nodestore
 from sentry.db.models.utils import Creator
+from sentry.nodestore.indexed import LazyNodeData
 from sentry.utils.cache import memoize
 from sentry.utils.canonical import CANONICAL_TYPES, CanonicalKeyDict
 from sentry.utils.strings import compress, decompress
@@ -119,7 +120,9 @@ class NodeData(MutableMapping):
             raise NodeIntegrityFailure(
                 f"Node reference for {self.id} is invalid: {ref} != {self.ref}"
             )
-        if self.wrapper is not None:
+        # Lazily decoded payloads are bound as-is. Wrapping them would decode
+        # the entire payload, which is what binding them lazily avoids.
+        if self.wrapper is not None and not isinstance(data, LazyNodeData):
             data = self.wrapper(data)
         self._node_data = data
 
@@ -12,6 +12,7 @@ from django.db.models.signals import class_prepared, post_delete, post_init, pos
 
 from sentry.db.models.manager import M, make_key
 from sentry.db.models.manager.base_query_set import BaseQuerySet
+from sentry.db.models.manager.process_cache import process_cache
 from sentry.db.models.query import create_or_update
 from sentry.utils.cache import cache
 from sentry.utils.compat import zip
@@ -40,6 +41,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         self.cache_fields = kwargs.pop("cache_fields", [])
         self.cache_ttl = kwargs.pop("cache_ttl", 60 * 5)
         self._cache_version: Optional[str] = kwargs.pop("cache_version", None)
+        #: If set, `get_from_cache` also keeps values in memory for this many
+        #: seconds, see `sentry.db.models.manager.process_cache`.
+        self.process_cache_ttl: Optional[int] = kwargs.pop("process_cache_ttl", None)
         self.__local_cache = threading.local()
         super().__init__(*args, **kwargs)
 
@@ -116,6 +120,10 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             return
 
         post_init.connect(self.__post_init, sender=sender, weak=False)
+        if self.process_cache_ttl:
+            # Needs to run before `__post_save` updates the tracked state.
+            post_save.connect(self.__invalidate_process_cache, sender=sender, weak=False)
+            post_delete.connect(self.__invalidate_process_cache, sender=sender, weak=False)
         post_save.connect(self.__post_save, sender=sender, weak=False)
         post_delete.connect(self.__post_delete, sender=sender, weak=False)
 
@@ -201,6 +209,35 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             key=self.__get_lookup_cache_key(**{pk_name: instance.pk}), version=self.cache_version
         )
 
+    def __invalidate_process_cache(self, instance: M, **kwargs: Any) -> None:
+        """
+        Drops all lookups of an instance from the process cache of all processes.
+        """
+        if not process_cache.enabled:
+            return
+
+        pk_name = instance._meta.pk.name
+        cache_keys = {self.__get_lookup_cache_key(**{pk_name: instance.pk})}
+        previous_values = self.__cache.get(instance, {})
+        for key in self.cache_fields:
+            if key in ("pk", pk_name):
+                continue
+            cache_keys.add(
+                self.__get_lookup_cache_key(**{key: self.__value_for_field(instance, key)})
+            )
+            if key in previous_values:
+                cache_keys.add(self.__get_lookup_cache_key(**{key: previous_values[key]}))
+        process_cache.invalidate(cache_keys)
+
+    def __get_from_process_cache(self, cache_key: str) -> Any:
+        if not self.process_cache_ttl or not process_cache.enabled:
+            return None
+        return process_cache.get(cache_key, self.model.__name__)
+
+    def __set_process_cache(self, cache_key: str, value: Any) -> None:
+        if self.process_cache_ttl and process_cache.enabled:
+            process_cache.set(cache_key, value, self.process_cache_ttl)
+
     def __get_lookup_cache_key(self, **kwargs: Any) -> str:
         return make_key(self.model, "modelcache", kwargs)
 
@@ -256,11 +293,15 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 if result is not None:
                     return result
 
-            retval = cache.get(cache_key, version=self.cache_version)
+            retval = self.__get_from_process_cache(cache_key)
+            from_process_cache = retval is not None
+            if retval is None:
+                retval = cache.get(cache_key, version=self.cache_version)
             if retval is None:
                 result = self.get(**kwargs)
                 # Ensure we're pushing it into the cache
                 self.__post_save(instance=result)
+                self.__set_process_cache(cache_key, result)
                 if local_cache is not None:
                     local_cache[cache_key] = result
                 return result
@@ -268,6 +309,8 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             # If we didn't look up by pk we need to hit the reffed
             # key
             if key != pk_name:
+                if not from_process_cache:
+                    self.__set_process_cache(cache_key, retval)
                 result = self.get_from_cache(**{pk_name: retval})
                 if local_cache is not None:
                     local_cache[cache_key] = result
@@ -285,6 +328,8 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 logger.error("Cache response returned invalid value %r", retval)
                 return self.get(**kwargs)
 
+            if not from_process_cache:
+                self.__set_process_cache(cache_key, retval)
             retval._state.db = router.db_for_read(self.model, **kwargs)
 
             # Explicitly typing to satisfy mypy.
@@ -417,6 +462,8 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         pk_name = self.model._meta.pk.name
         cache_key = self.__get_lookup_cache_key(**{pk_name: instance_id})
         cache.delete(cache_key, version=self.cache_version)
+        if self.process_cache_ttl and process_cache.enabled:
+            process_cache.invalidate([cache_key])
 
     def post_save(self, instance: M, **kwargs: Any) -> None:
         """
@@ -0,0 +1,154 @@
+"""
+Process-local tier of the model cache.
+
+``BaseManager.get_from_cache`` reads instances from the shared cache, which
+costs a network round trip and unpickling for every lookup. Managers created
+with ``process_cache_ttl`` additionally keep the cached values in memory for
+up to that many seconds.
+
+Saves and deletes publish the cache keys they invalidate on a Redis channel,
+and every process drops those keys from its local tier. Messages can be lost
+while a process is (re)connecting to the channel, so the TTL bounds how long
+a stale value may be served. The local tier is only used while the process
+is subscribed to the channel.
+
+Processes forked from a process that already used the local tier (such as
+prefork workers) start with an empty local tier and their own listener.
+
+The local tier is disabled unless ``SENTRY_MODEL_PROCESS_CACHE`` is set.
+"""
+import copy
+import logging
+import os
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.db.models import Model
+
+from sentry.utils import json, metrics
+from sentry.utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "sentry.modelcache.invalidate"
+MAX_SIZE = 10000
+
+
+def _copy_value(value: Any) -> Any:
+    # Callers may modify the instances they get back, so every caller gets its
+    # own instance (sharing field values with the cached one).
+    if isinstance(value, Model):
+        value = copy.copy(value)
+        value._state = copy.copy(value._state)
+        value._state.fields_cache = {}
+    return value
+
+
+class ProcessCache:
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._items: LRUCache[str, Any] = LRUCache(self._max_size)
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+        self._subscribed = False
+
+    def _check_pid(self) -> None:
+        # A forked child inherits the entries and subscription state of its
+        # parent, but not the listener thread, and the locks may have been held
+        # by other threads at the time of the fork.
+        if self._pid != os.getpid():
+            self._reset()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.SENTRY_MODEL_PROCESS_CACHE)
+
+    def get(self, cache_key: str, model_name: str) -> Any:
+        self._check_pid()
+        if not self._subscribed:
+            return None
+
+        entry = self._items.get(cache_key)
+        if entry is None or entry[0] < time.monotonic():
+            metrics.incr(
+                "modelcache.process_cache",
+                tags={"model": model_name, "result": "miss"},
+                skip_internal=True,
+            )
+            return None
+
+        metrics.incr(
+            "modelcache.process_cache",
+            tags={"model": model_name, "result": "hit"},
+            skip_internal=True,
+        )
+        return _copy_value(entry[1])
+
+    def set(self, cache_key: str, value: Any, ttl: int) -> None:
+        self._ensure_listener()
+        if self._subscribed:
+            self._items.set(cache_key, (time.monotonic() + ttl, _copy_value(value)))
+
+    def invalidate(self, cache_keys: Iterable[str]) -> None:
+        """
+        Drops keys from the local tier of this and all other processes.
+        """
+        cache_keys = list(cache_keys)
+        self._check_pid()
+        self._delete(cache_keys)
+        try:
+            self._get_client().publish(CHANNEL, json.dumps(cache_keys))
+        except Exception:
+            logger.warning("modelcache.invalidation_failed", exc_info=True)
+
+    def clear(self) -> None:
+        self._check_pid()
+        self._items.clear()
+
+    def _delete(self, cache_keys: Iterable[str]) -> None:
+        for cache_key in cache_keys:
+            self._items.delete(cache_key)
+
+    def _get_client(self):
+        from sentry.utils.redis import clusters
+
+        cluster = clusters.get(settings.SENTRY_MODEL_PROCESS_CACHE_CLUSTER)
+        return cluster.get_local_client_for_key(CHANNEL)
+
+    def _ensure_listener(self) -> None:
+        self._check_pid()
+        if self._listener is not None:
+            return
+
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="sentry.modelcache.listener", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                # Invalidations published before subscribing were missed.
+                self.clear()
+                self._subscribed = True
+                for message in pubsub.listen():
+                    self._delete(json.loads(message["data"]))
+            except Exception:
+                logger.warning("modelcache.listener_failed", exc_info=True)
+
+            self._subscribed = False
+            self.clear()
+            time.sleep(1)
+
+
+process_cache = ProcessCache(MAX_SIZE)
@@ -1,7 +1,11 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from sentry import eventstore, models, nodestore
+from sentry import eventstore, models, nodestore, options
 from sentry.eventstore.models import Event
+from sentry.utils import metrics
+from sentry.utils.cache import cache
 
 from ..base import BaseDeletionTask, BaseRelation, ModelDeletionTask, ModelRelation
 
@@ -41,9 +45,17 @@ _GROUP_RELATED_MODELS = DIRECT_GROUP_RELATED_MODELS + (
 class EventDataDeletionTask(BaseDeletionTask):
     """
     Deletes nodestore data, EventAttachment and UserReports for group
+
+    If the ``deletions.group.event-data-shards`` option is greater than 1, the
+    time range of the group is split into that many windows, which are deleted
+    in parallel. Within a window, the next page of events is fetched from Snuba
+    while the current page is deleted. The progress of every window is
+    checkpointed in the cache, so a retried deletion resumes where it stopped.
     """
 
     DEFAULT_CHUNK_SIZE = 10000
+    CHECKPOINT_TTL = 7 * 24 * 60 * 60
+    CHECKPOINT_DONE = "done"
 
     def __init__(self, manager, group_id, project_id, **kwargs):
         self.group_id = group_id
@@ -52,19 +64,49 @@ class EventDataDeletionTask(BaseDeletionTask):
         super().__init__(manager, **kwargs)
 
     def chunk(self):
-        conditions = []
+        num_shards = options.get("deletions.group.event-data-shards")
+        if num_shards > 1:
+            windows = self.get_windows(num_shards)
+            if windows is not None:
+                return self.chunk_sharded(windows)
+
+        cursor = None
         if self.last_event is not None:
+            cursor = (self.last_event.timestamp, self.last_event.event_id)
+        events = self.get_events(cursor)
+
+        if not events:
+            return False
+
+        self.last_event = events[-1]
+        self.delete_events(events)
+
+        return True
+
+    def get_events(self, cursor=None, start=None, end=None):
+        """
+        Returns the next page of events of the group, after ``cursor`` (a
+        ``(timestamp, event_id)`` tuple) and between ``start`` (inclusive) and
+        ``end`` (exclusive) if given.
+        """
+        conditions = []
+        if start is not None:
+            conditions.append(["timestamp", ">=", start])
+        if end is not None:
+            conditions.append(["timestamp", "<", end])
+        if cursor is not None:
+            timestamp, event_id = cursor
             conditions.extend(
                 [
-                    ["timestamp", "<=", self.last_event.timestamp],
+                    ["timestamp", "<=", timestamp],
                     [
-                        ["timestamp", "<", self.last_event.timestamp],
-                        ["event_id", "<", self.last_event.event_id],
+                        ["timestamp", "<", timestamp],
+                        ["event_id", "<", event_id],
                     ],
                 ]
             )
 
-        events = eventstore.get_unfetched_events(
+        return eventstore.get_unfetched_events(
             filter=eventstore.Filter(
                 conditions=conditions, project_ids=[self.project_id], group_ids=[self.group_id]
             ),
@@ -73,11 +115,7 @@ class EventDataDeletionTask(BaseDeletionTask):
             orderby=["-timestamp", "-event_id"],
         )
 
-        if not events:
-            return False
-
-        self.last_event = events[-1]
-
+    def delete_events(self, events):
         # Remove from nodestore
         node_ids = [Event.generate_node_id(self.project_id, event.event_id) for event in events]
         nodestore.delete_multi(node_ids)
@@ -93,7 +131,94 @@ class EventDataDeletionTask(BaseDeletionTask):
             event_id__in=event_ids, project_id=self.project_id
         ).delete()
 
-        return True
+    def get_checkpoint_key(self, name):
+        return f"deletions:group-event-data:{self.group_id}:{name}"
+
+    def get_windows(self, num_shards):
+        """
+        Splits the time range of the group into ``num_shards`` windows of
+        ``(start, end)`` timestamps. The first and last windows are unbounded,
+        since events may fall outside of the group's first and last seen dates.
+        The windows are checkpointed, so that a resumed deletion uses the same
+        windows. Returns None if the group doesn't exist.
+        """
+        cache_key = self.get_checkpoint_key("windows")
+        windows = cache.get(cache_key)
+        if windows is not None:
+            return windows
+
+        try:
+            first_seen, last_seen = (
+                models.Group.objects.filter(id=self.group_id)
+                .values_list("first_seen", "last_seen")
+                .get()
+            )
+        except models.Group.DoesNotExist:
+            return None
+
+        step = (last_seen - first_seen) / num_shards
+        bounds = (
+            [None]
+            + [
+                (first_seen + step * i).replace(microsecond=0).isoformat()
+                for i in range(1, num_shards)
+            ]
+            + [None]
+        )
+        windows = list(zip(bounds[:-1], bounds[1:]))
+        cache.set(cache_key, windows, self.CHECKPOINT_TTL)
+        return windows
+
+    def chunk_sharded(self, windows):
+        start_time = time.time()
+        # Fetches run in their own pool, so that they can't be blocked by the
+        # windows waiting for them.
+        with ThreadPoolExecutor(max_workers=len(windows)) as executor, ThreadPoolExecutor(
+            max_workers=len(windows)
+        ) as fetch_executor:
+            futures = [
+                executor.submit(self.delete_window, shard, start, end, fetch_executor)
+                for shard, (start, end) in enumerate(windows)
+            ]
+            deleted = sum(future.result() for future in futures)
+
+        duration = time.time() - start_time
+        if deleted and duration > 0:
+            metrics.gauge("deletions.group.event_data.throughput", deleted / duration)
+
+        cache.delete_many(
+            [self.get_checkpoint_key("windows")]
+            + [self.get_checkpoint_key(shard) for shard in range(len(windows))]
+        )
+        return False
+
+    def delete_window(self, shard, start, end, fetch_executor):
+        """
+        Deletes the events of a window, starting from its checkpoint. Returns
+        the number of deleted events.
+        """
+        cache_key = self.get_checkpoint_key(shard)
+        cursor = cache.get(cache_key)
+        if cursor == self.CHECKPOINT_DONE:
+            return 0
+
+        deleted = 0
+        with metrics.timer("deletions.group.event_data.fetch"):
+            events = self.get_events(cursor, start, end)
+        while events:
+            cursor = (events[-1].timestamp, events[-1].event_id)
+            # Fetch the next page while this one is being deleted
+            next_events = fetch_executor.submit(self.get_events, cursor, start, end)
+            with metrics.timer("deletions.group.event_data.delete"):
+                self.delete_events(events)
+            cache.set(cache_key, cursor, self.CHECKPOINT_TTL)
+            deleted += len(events)
+            metrics.incr("deletions.group.event_data.deleted", amount=len(events))
+            with metrics.timer("deletions.group.event_data.fetch_wait"):
+                events = next_events.result()
+
+        cache.set(cache_key, self.CHECKPOINT_DONE, self.CHECKPOINT_TTL)
+        return deleted
 
 
 class GroupDeletionTask(ModelDeletionTask):
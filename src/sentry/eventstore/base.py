@@ -247,7 +247,7 @@ class EventStorage(Service):
         """
         return Event(project_id=project_id, event_id=event_id, group_id=group_id, data=data)
 
-    def bind_nodes(self, object_list, node_name="data"):
+    def bind_nodes(self, object_list, node_name="data", lazy=False):
         """
         For a list of Event objects, and a property name where we might find an
         (unfetched) NodeData on those objects, fetch all the data blobs for
@@ -256,6 +256,11 @@ class EventStorage(Service):
 
         It's not necessary to bind a single Event object since data will be lazily
         fetched on any attempt to access a property.
+
+        With ``lazy=True``, payloads stored in the indexed nodestore format are
+        bound without being decoded, and without renormalization. Only the
+        keys that are accessed are decoded. Use this for callers that only
+        read a few keys of each event.
         """
         with sentry_sdk.start_span(op="eventstore.base.bind_nodes"):
             object_node_list = [
@@ -267,7 +272,7 @@ class EventStorage(Service):
             if not node_ids:
                 return
 
-            node_results = nodestore.get_multi(node_ids)
+            node_results = nodestore.get_multi(node_ids, lazy=lazy)
 
             for item, node in object_node_list:
                 data = node_results.get(node.id) or {}
@@ -1,9 +1,12 @@
 import logging
 import random
+import time
 from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Generator, Mapping, Optional, Sequence
+from typing import Any, Generator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from confluent_kafka import TIMESTAMP_NOT_AVAILABLE
 
 from sentry import options
 from sentry.eventstream.kafka.protocol import (
@@ -22,7 +25,13 @@ Message = Any
 _DURATION_METRIC = "eventstream.duration"
 _CONCURRENCY_METRIC = "eventstream.concurrency"
 _MESSAGES_METRIC = "eventstream.messages"
+_PUBLISH_LATENCY_METRIC = "eventstream.publish_latency"
+_LAG_METRIC = "eventstream.lag"
 _CONCURRENCY_OPTION = "post-process-forwarder:concurrency"
+_BATCH_DISPATCH_OPTION = "post-process-forwarder:batch-dispatch"
+_ADAPTIVE_CONCURRENCY_OPTION = "post-process-forwarder:adaptive-concurrency"
+_TARGET_LATENCY_OPTION = "post-process-forwarder:adaptive-concurrency-target-latency"
+_MAX_LAG_OPTION = "post-process-forwarder:adaptive-concurrency-max-lag"
 _TRANSACTION_FORWARDER_HEADER = "transaction_forwarder"
 
 
@@ -75,29 +84,74 @@ def dispatch_post_process_group_task(
     is_new_group_environment: bool,
     primary_hash: Optional[str],
     skip_consume: bool = False,
+    producer: Optional[Any] = None,
 ) -> None:
     if skip_consume:
         logger.info("post_process.skip.raw_event", extra={"event_id": event_id})
     else:
         cache_key = cache_key_for_event({"project": project_id, "event_id": event_id})
 
-        post_process_group.delay(
-            is_new=is_new,
-            is_regression=is_regression,
-            is_new_group_environment=is_new_group_environment,
-            primary_hash=primary_hash,
-            cache_key=cache_key,
-            group_id=group_id,
+        post_process_group.apply_async(
+            kwargs={
+                "is_new": is_new,
+                "is_regression": is_regression,
+                "is_new_group_environment": is_new_group_environment,
+                "primary_hash": primary_hash,
+                "cache_key": cache_key,
+                "group_id": group_id,
+            },
+            producer=producer,
         )
 
 
-def _get_task_kwargs_and_dispatch(message: Message):
+def _get_task_kwargs_and_dispatch(
+    message: Message, producer: Optional[Any] = None
+) -> Tuple[int, float]:
+    """
+    Dispatches the post process task of a message, and returns the number of tasks
+    published and the time it took to publish them.
+    """
     task_kwargs = _get_task_kwargs(message)
     if not task_kwargs:
-        return None
+        return 0, 0.0
 
     _record_metrics(message.partition(), task_kwargs)
+    if producer is not None:
+        task_kwargs = {**task_kwargs, "producer": producer}
+    start = time.monotonic()
     dispatch_post_process_group_task(**task_kwargs)
+    return 1, time.monotonic() - start
+
+
+def _get_task_kwargs_and_dispatch_many(messages: Sequence[Message]) -> Tuple[int, float]:
+    """
+    Dispatches the post process tasks of multiple messages, publishing all of them
+    with the same producer (and broker connection) instead of acquiring one per task.
+    """
+    dispatched, duration = 0, 0.0
+    with post_process_group.app.producer_or_acquire() as producer:
+        for message in messages:
+            message_dispatched, message_duration = _get_task_kwargs_and_dispatch(
+                message, producer=producer
+            )
+            dispatched += message_dispatched
+            duration += message_duration
+    return dispatched, duration
+
+
+def get_adaptive_concurrency(
+    concurrency: int, max_concurrency: int, publish_latency: float, lag: float
+) -> int:
+    """
+    Returns the number of threads to use for the next batch. Slow publishes mean the
+    broker is saturated, so the number of threads is reduced by a quarter. Otherwise,
+    if the consumer is lagging behind, a thread is added.
+    """
+    if publish_latency > options.get(_TARGET_LATENCY_OPTION):
+        concurrency -= max(1, concurrency // 4)
+    elif lag > options.get(_MAX_LAG_OPTION):
+        concurrency += 1
+    return max(1, min(concurrency, max_concurrency))
 
 
 class PostProcessForwarderWorker(AbstractBatchWorker):
@@ -114,30 +168,73 @@ class PostProcessForwarderWorker(AbstractBatchWorker):
         logger.info(f"Starting post process forwarder with {concurrency} threads")
         metrics.incr(_CONCURRENCY_METRIC, amount=concurrency)
         self.__executor = ThreadPoolExecutor(max_workers=self.__current_concurrency)
+        # Both modes only change between batches, so that all items of a batch are
+        # handled the same way.
+        self.__batch_dispatch = options.get(_BATCH_DISPATCH_OPTION)
+        self.__adaptive_concurrency = options.get(_ADAPTIVE_CONCURRENCY_OPTION)
+        self.__latest_timestamp: Optional[int] = None
 
-    def process_message(self, message: Message) -> Optional[Future]:
+    def process_message(self, message: Message) -> Optional[Union[Future, Message]]:
         """
         Process the message received by the consumer and return the Future associated with the message. The future
         is stored in the batch of batching_kafka_consumer and provided as an argument to flush_batch. If None is
         returned, the batching_kafka_consumer will not add the return value to the batch.
+
+        In batch dispatch mode, the message itself is returned, and the tasks of all messages of the batch are
+        dispatched in chunks in flush_batch.
         """
+        if self.__adaptive_concurrency:
+            timestamp_type, timestamp = message.timestamp()
+            if timestamp_type != TIMESTAMP_NOT_AVAILABLE:
+                self.__latest_timestamp = max(self.__latest_timestamp or 0, timestamp)
+
+        if self.__batch_dispatch:
+            return message
         return self.__executor.submit(_get_task_kwargs_and_dispatch, message)
 
-    def flush_batch(self, batch: Optional[Sequence[Future]]) -> None:
+    def flush_batch(self, batch: Optional[Sequence[Union[Future, Message]]]) -> None:
         """
         For all work which was submitted to the thread pool executor, we need to ensure that if an exception was
         raised, then we raise it in the main thread. This is needed so that processing can be stopped in such
         cases.
         """
+        dispatched, publish_duration = 0, 0.0
         if batch:
-            for future in as_completed(batch):
+            futures = self.__dispatch_batch(batch) if self.__batch_dispatch else batch
+            for future in as_completed(futures):
                 exc = future.exception()
                 if exc is not None:
                     raise exc
+                future_dispatched, future_duration = future.result()
+                dispatched += future_dispatched
+                publish_duration += future_duration
+
+        publish_latency = None
+        if dispatched:
+            publish_latency = publish_duration / dispatched
+            metrics.timing(_PUBLISH_LATENCY_METRIC, publish_latency)
+
+        lag = None
+        if self.__latest_timestamp is not None:
+            lag = max(0.0, time.time() - self.__latest_timestamp / 1000.0)
+            metrics.timing(_LAG_METRIC, lag)
+            self.__latest_timestamp = None
+
+        self.__batch_dispatch = options.get(_BATCH_DISPATCH_OPTION)
+        self.__adaptive_concurrency = options.get(_ADAPTIVE_CONCURRENCY_OPTION)
 
         # Check if the concurrency settings have changed. If yes, then shutdown the existing executor
-        # and create a new one with the new settings
+        # and create a new one with the new settings. With adaptive concurrency, the option is the
+        # maximum number of threads.
         new_concurrency = options.get(_CONCURRENCY_OPTION)
+        if self.__adaptive_concurrency:
+            if publish_latency is not None and lag is not None:
+                new_concurrency = get_adaptive_concurrency(
+                    self.__current_concurrency, new_concurrency, publish_latency, lag
+                )
+            else:
+                new_concurrency = min(self.__current_concurrency, new_concurrency)
+
         if new_concurrency != self.__current_concurrency:
             logger.info(
                 f"Switching post-process-forwarder from {self.__current_concurrency} to {new_concurrency} worker threads"
@@ -147,6 +244,17 @@ class PostProcessForwarderWorker(AbstractBatchWorker):
             self.__executor = ThreadPoolExecutor(max_workers=new_concurrency)
             self.__current_concurrency = new_concurrency
 
+    def __dispatch_batch(self, messages: Sequence[Message]) -> List[Future]:
+        """
+        Splits the messages of a batch into one chunk per thread, and dispatches the
+        tasks of each chunk with a single producer.
+        """
+        chunk_size = -(-len(messages) // self.__current_concurrency)
+        return [
+            self.__executor.submit(_get_task_kwargs_and_dispatch_many, messages[i : i + chunk_size])
+            for i in range(0, len(messages), chunk_size)
+        ]
+
     def shutdown(self) -> None:
         self.__executor.shutdown()
 
@@ -19,6 +19,7 @@ from sentry.grouping.variants import (
     FallbackVariant,
     SaltedComponentVariant,
 )
+from sentry.utils.lru import LRUCache
 from sentry.utils.safe import get_path
 
 HASH_RE = re.compile(r"^[0-9a-f]{32}$")
@@ -171,6 +172,11 @@ def load_default_grouping_config():
     return load_grouping_config(config_dict=None)
 
 
+# Loaded fingerprinting rules by revision of the project's rules. Instances are
+# never mutated, so they and their compiled rules can be shared.
+_fingerprinting_rules_cache = LRUCache(1000)
+
+
 def get_fingerprinting_config_for_project(project):
     from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
 
@@ -182,15 +188,21 @@ def get_fingerprinting_config_for_project(project):
     from sentry.utils.hashlib import md5_text
 
     cache_key = "fingerprinting-rules:" + md5_text(rules).hexdigest()
+    rv = _fingerprinting_rules_cache.get(cache_key)
+    if rv is not None:
+        return rv
+
     rv = cache.get(cache_key)
     if rv is not None:
-        return FingerprintingRules.from_json(rv)
+        rv = FingerprintingRules.from_json(rv)
+    else:
+        try:
+            rv = FingerprintingRules.from_config_string(rules)
+        except InvalidFingerprintingConfig:
+            rv = FingerprintingRules([])
+        cache.set(cache_key, rv.to_json())
 
-    try:
-        rv = FingerprintingRules.from_config_string(rules)
-    except InvalidFingerprintingConfig:
-        rv = FingerprintingRules([])
-    cache.set(cache_key, rv.to_json())
+    _fingerprinting_rules_cache.set(cache_key, rv)
     return rv
 
 
@@ -0,0 +1,127 @@
+"""
+Candidate rule index for enhancement rules.
+
+Evaluating every rule against every frame is O(rules x frames x matchers).
+``RuleIndex`` narrows this down by indexing rules on a single frame matcher
+that every matching frame has to satisfy, so that for each frame only rules
+that can possibly match are evaluated. Rules are still evaluated in their
+original order, since later rules override the effects of earlier ones.
+
+Only matchers on frame attributes that are never changed by actions are
+indexed (family, function and module). ``in_app`` and ``category`` can be
+modified by earlier rules and are therefore always evaluated.
+"""
+from collections import defaultdict
+from typing import (
+    TYPE_CHECKING,
+    AnyStr,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .matchers import FamilyMatch, FrameMatch, FunctionMatch, ModuleMatch
+
+if TYPE_CHECKING:
+    from . import Rule
+
+# Characters that start a wildcard or escape sequence in glob patterns.
+_GLOB_SPECIAL = frozenset("*?[]{}\\")
+_GLOB_SPECIAL_BYTES = frozenset(b"*?[]{}\\")
+
+
+def get_literal_prefix(pattern: AnyStr) -> AnyStr:
+    """Returns the part of a glob pattern before its first wildcard."""
+    special = _GLOB_SPECIAL_BYTES if isinstance(pattern, bytes) else _GLOB_SPECIAL
+    for pos, char in enumerate(pattern):
+        if char in special:
+            return pattern[:pos]
+    return pattern
+
+
+class PrefixIndex(Generic[AnyStr]):
+    """
+    Maps literal prefixes to rule positions. Looking up a value returns the
+    rules of all prefixes the value starts with. Prefixes and values are
+    either all ``bytes`` or all ``str``.
+    """
+
+    def __init__(self) -> None:
+        self._by_length: Dict[int, Dict[AnyStr, List[int]]] = defaultdict(lambda: defaultdict(list))
+
+    def __bool__(self) -> bool:
+        return bool(self._by_length)
+
+    def add(self, prefix: AnyStr, position: int) -> None:
+        self._by_length[len(prefix)][prefix].append(position)
+
+    def lookup(self, value: Optional[AnyStr]) -> Iterator[int]:
+        if not value:
+            return
+        for length, prefixes in self._by_length.items():
+            positions = prefixes.get(value[:length])
+            if positions:
+                yield from positions
+
+
+class RuleIndex:
+    def __init__(self, rules: Sequence["Rule"]) -> None:
+        self.rules = rules
+        self._unindexed: List[int] = []
+        self._by_family: Dict[bytes, List[int]] = defaultdict(list)
+        self._by_field = {"function": PrefixIndex(), "module": PrefixIndex()}
+
+        for position, rule in enumerate(rules):
+            self._add_rule(position, rule)
+
+    def _add_rule(self, position: int, rule: "Rule") -> None:
+        best: Optional[Tuple[str, bytes]] = None
+        family_flags: Optional[Set[bytes]] = None
+
+        for matcher in rule._other_matchers:
+            if not isinstance(matcher, FrameMatch) or matcher.negated:
+                # Negated matchers, as well as caller and callee matchers,
+                # don't constrain the matched frame itself.
+                continue
+            if isinstance(matcher, (FunctionMatch, ModuleMatch)):
+                prefix = get_literal_prefix(matcher._encoded_pattern)
+                if prefix and (best is None or len(prefix) > len(best[1])):
+                    best = (matcher.key, prefix)
+            elif isinstance(matcher, FamilyMatch) and b"all" not in matcher._flags:
+                family_flags = matcher._flags
+
+        if best is not None:
+            self._by_field[best[0]].add(best[1], position)
+        elif family_flags is not None:
+            for flag in family_flags:
+                self._by_family[flag].append(position)
+        else:
+            self._unindexed.append(position)
+
+    def iter_candidates(
+        self, match_frames: Sequence[dict]
+    ) -> Iterator[Tuple["Rule", Optional[Sequence[int]]]]:
+        """
+        Yields ``(rule, frame_indices)`` for every rule that may match one of
+        the frames, in rule order. ``frame_indices`` is ``None`` if the rule
+        has to be checked against all frames.
+        """
+        candidates: Dict[int, Optional[List[int]]] = defaultdict(list)
+        for idx, frame in enumerate(match_frames):
+            positions: Set[int] = set(self._by_family.get(frame["family"], ()))
+            for field, index in self._by_field.items():
+                if index:
+                    positions.update(index.lookup(frame[field]))
+            for position in positions:
+                candidates[position].append(idx)  # type: ignore
+
+        for position in self._unindexed:
+            candidates[position] = None
+
+        for position in sorted(candidates):
+            yield self.rules[position], candidates[position]
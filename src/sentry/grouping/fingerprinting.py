@@ -1,8 +1,11 @@
 import inspect
+from collections import defaultdict
 
+from django.utils.functional import cached_property
 from parsimonious.exceptions import ParseError
 from parsimonious.grammar import Grammar, NodeVisitor
 
+from sentry.grouping.enhancer.index import PrefixIndex, get_literal_prefix
 from sentry.grouping.utils import get_rule_bool
 from sentry.stacktraces.platform import get_behavior_family_for_platform
 from sentry.utils.glob import glob_match
@@ -187,14 +190,14 @@ class FingerprintingRules:
     def iter_rules(self):
         return iter(self.rules)
 
+    @cached_property
+    def compiled(self):
+        return CompiledRules(self.rules)
+
     def get_fingerprint_values_for_event(self, event):
         if not self.rules:
             return
-        access = EventAccess(event)
-        for rule in self.iter_rules():
-            new_values = rule.get_fingerprint_values_for_event_access(access)
-            if new_values is not None:
-                return (rule,) + new_values
+        return self.compiled.get_fingerprint_values_for_event_access(EventAccess(event))
 
     @classmethod
     def _from_config_structure(cls, data):
@@ -412,6 +415,98 @@ class Rule:
         ).rstrip()
 
 
+# Matchers on these keys compare the whole value against a glob pattern, so
+# they can only match values starting with the literal prefix of the pattern.
+_PREFIX_INDEXED_KEYS = ("type", "value", "module", "function", "logger", "level")
+_CASE_INSENSITIVE_KEYS = ("value", "level")
+
+
+class CompiledRules:
+    """
+    Evaluates all fingerprinting rules against an event in a single pass.
+
+    Identical matchers are shared between rules and every matcher is only
+    evaluated once against each value of the event. Rules are indexed by the
+    literal prefix of one of their matchers, so that only rules that can
+    possibly match the values of an event are evaluated. The first matching
+    rule in the original order wins.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.matchers = []
+        # For every rule, its matcher ids grouped by match group
+        self.rule_groups = []
+        self._unindexed = []
+        self._indexes = defaultdict(PrefixIndex)
+
+        matcher_ids = {}
+        for position, rule in enumerate(rules):
+            by_match_group = {}
+            for matcher in rule.matchers:
+                key = (matcher.key, matcher.pattern, matcher.negated)
+                matcher_id = matcher_ids.get(key)
+                if matcher_id is None:
+                    matcher_id = matcher_ids[key] = len(self.matchers)
+                    self.matchers.append(matcher)
+                by_match_group.setdefault(matcher.match_group, []).append(matcher_id)
+            self.rule_groups.append(list(by_match_group.items()))
+            self._index_rule(position, rule)
+
+    def _index_rule(self, position, rule):
+        best = None
+        for matcher in rule.matchers:
+            if matcher.negated:
+                continue
+            if matcher.key not in _PREFIX_INDEXED_KEYS and not matcher.key.startswith("tags."):
+                continue
+            prefix = get_literal_prefix(matcher.pattern)
+            if prefix and (best is None or len(prefix) > len(best[1])):
+                best = (matcher, prefix)
+
+        if best is None:
+            self._unindexed.append(position)
+            return
+
+        matcher, prefix = best
+        if matcher.key in _CASE_INSENSITIVE_KEYS:
+            prefix = prefix.lower()
+        self._indexes[(matcher.match_group, matcher.key)].add(prefix, position)
+
+    def _iter_candidates(self, access):
+        positions = set(self._unindexed)
+        for (match_group, key), index in self._indexes.items():
+            for values in access.get_values(match_group):
+                value = values.get(key)
+                if not isinstance(value, str):
+                    continue
+                if key in _CASE_INSENSITIVE_KEYS:
+                    value = value.lower()
+                positions.update(index.lookup(value))
+        return sorted(positions)
+
+    def get_fingerprint_values_for_event_access(self, access):
+        results = {}
+
+        def matches(matcher_id, idx, values):
+            key = (matcher_id, idx)
+            rv = results.get(key)
+            if rv is None:
+                rv = results[key] = self.matchers[matcher_id].matches(values)
+            return rv
+
+        for position in self._iter_candidates(access):
+            for match_group, matcher_ids in self.rule_groups[position]:
+                for idx, values in enumerate(access.get_values(match_group)):
+                    if all(matches(matcher_id, idx, values) for matcher_id in matcher_ids):
+                        break
+                else:
+                    break
+            else:
+                rule = self.rules[position]
+                return rule, rule.fingerprint, rule.attributes
+
+
 class FingerprintingVisitor(NodeVisitor):
     visit_comment = visit_empty = lambda *a: None
     unwrapped_exceptions = (InvalidFingerprintingConfig,)
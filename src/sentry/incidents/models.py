@@ -85,6 +85,55 @@ class IncidentManager(BaseManager):
 
         return incident
 
+    def get_active_incidents(self, alert_rules_and_projects):
+        """
+        Fetches the active incidents of multiple (alert rule, project) pairs, like
+        `get_active_incident`, with a single query for all pairs that aren't cached.
+        :return: A dict of (alert rule id, project id) to the active `Incident`, or None
+        """
+        cache_keys = {
+            self._build_active_incident_cache_key(alert_rule.id, project.id): (
+                alert_rule.id,
+                project.id,
+            )
+            for alert_rule, project in alert_rules_and_projects
+        }
+        cached = cache.get_many(list(cache_keys))
+
+        incidents = {}
+        missing = set()
+        for cache_key, key in cache_keys.items():
+            incident = cached.get(cache_key)
+            if incident is None:
+                missing.add(key)
+            else:
+                incidents[key] = incident or None
+
+        if missing:
+            incident_projects = (
+                IncidentProject.objects.filter(
+                    incident__type=IncidentType.ALERT_TRIGGERED.value,
+                    incident__alert_rule_id__in={alert_rule_id for alert_rule_id, _ in missing},
+                    project_id__in={project_id for _, project_id in missing},
+                )
+                .exclude(incident__status=IncidentStatus.CLOSED.value)
+                .select_related("incident")
+                .order_by("-incident__date_added")
+            )
+            for incident_project in incident_projects:
+                key = (incident_project.incident.alert_rule_id, incident_project.project_id)
+                if key in missing and key not in incidents:
+                    incidents[key] = incident_project.incident
+
+            to_cache = {}
+            for key in missing:
+                # Set this to False so that we can have a negative cache as well.
+                to_cache[self._build_active_incident_cache_key(*key)] = incidents.get(key, False)
+                incidents.setdefault(key, None)
+            cache.set_many(to_cache)
+
+        return incidents
+
     @classmethod
     def clear_active_incident_cache(cls, instance, **kwargs):
         for project in instance.projects.all():
@@ -316,6 +365,44 @@ class AlertRuleManager(BaseManager):
 
         return alert_rule
 
+    def get_for_subscriptions(self, subscriptions):
+        """
+        Fetches the AlertRules associated with multiple Subscriptions, like
+        `get_for_subscription`, with a single query for all Subscriptions that
+        aren't cached. Subscriptions without an AlertRule are left out.
+        :return: A dict of subscription id to AlertRule
+        """
+        cache_keys = {
+            self.__build_subscription_cache_key(subscription.id): subscription
+            for subscription in subscriptions
+        }
+        cached = cache.get_many(list(cache_keys))
+
+        alert_rules = {
+            cache_keys[cache_key].id: alert_rule for cache_key, alert_rule in cached.items()
+        }
+        missing = [
+            subscription
+            for cache_key, subscription in cache_keys.items()
+            if cache_key not in cached
+        ]
+        if missing:
+            alert_rules_by_snuba_query = {
+                alert_rule.snuba_query_id: alert_rule
+                for alert_rule in AlertRule.objects.filter(
+                    snuba_query_id__in={subscription.snuba_query_id for subscription in missing}
+                )
+            }
+            to_cache = {}
+            for subscription in missing:
+                alert_rule = alert_rules_by_snuba_query.get(subscription.snuba_query_id)
+                if alert_rule is not None:
+                    alert_rules[subscription.id] = alert_rule
+                    to_cache[self.__build_subscription_cache_key(subscription.id)] = alert_rule
+            cache.set_many(to_cache, 3600)
+
+        return alert_rules
+
     @classmethod
     def clear_subscription_cache(cls, instance, **kwargs):
         cache.delete(cls.__build_subscription_cache_key(instance.id))
@@ -466,6 +553,39 @@ class AlertRuleTriggerManager(BaseManager):
             cache.set(cache_key, triggers, 3600)
         return triggers
 
+    def get_for_alert_rules(self, alert_rules):
+        """
+        Fetches the AlertRuleTriggers associated with multiple AlertRules, like
+        `get_for_alert_rule`, with a single query for all AlertRules that aren't cached.
+        :return: A dict of alert rule id to a list of AlertRuleTriggers
+        """
+        cache_keys = {
+            self._build_trigger_cache_key(alert_rule.id): alert_rule.id
+            for alert_rule in alert_rules
+        }
+        cached = cache.get_many(list(cache_keys))
+
+        triggers = {cache_keys[cache_key]: value for cache_key, value in cached.items()}
+        missing = [
+            alert_rule_id
+            for cache_key, alert_rule_id in cache_keys.items()
+            if cache_key not in cached
+        ]
+        if missing:
+            for alert_rule_id in missing:
+                triggers[alert_rule_id] = []
+            for trigger in AlertRuleTrigger.objects.filter(alert_rule_id__in=missing):
+                triggers[trigger.alert_rule_id].append(trigger)
+            cache.set_many(
+                {
+                    self._build_trigger_cache_key(alert_rule_id): triggers[alert_rule_id]
+                    for alert_rule_id in missing
+                },
+                3600,
+            )
+
+        return triggers
+
     @classmethod
     def clear_trigger_cache(cls, instance, **kwargs):
         cache.delete(cls._build_trigger_cache_key(instance.alert_rule_id))
@@ -34,9 +34,11 @@ from sentry.snuba.dataset import Dataset
 from sentry.snuba.models import QueryDatasets
 from sentry.snuba.tasks import build_snuba_filter, get_entity_subscription_for_dataset
 from sentry.utils import metrics, redis
+from sentry.utils.cache import cache
 from sentry.utils.compat import zip
 from sentry.utils.dates import to_datetime, to_timestamp
-from sentry.utils.snuba import raw_query
+from sentry.utils.hashlib import hash_values
+from sentry.utils.snuba import SnubaQueryParams, bulk_raw_query
 
 logger = logging.getLogger(__name__)
 REDIS_TTL = int(timedelta(days=7).total_seconds())
@@ -51,6 +53,9 @@ ALERT_RULE_TRIGGER_STAT_KEYS = ("alert_triggered", "resolve_triggered")
 # ToDo(ahmed): This is still experimental. If we decide that it makes sense to keep this
 #  functionality, then maybe we should move this to constants
 CRASH_RATE_ALERT_MINIMUM_THRESHOLD: Optional[int] = None
+# How long the results of comparison queries are cached, so that they can be reused by
+# other evaluations of the same comparison window.
+COMPARISON_VALUE_CACHE_TTL = int(timedelta(minutes=10).total_seconds())
 
 
 class SubscriptionProcessor:
@@ -67,21 +72,41 @@ class SubscriptionProcessor:
         AlertRuleThresholdType.BELOW: (operator.lt, operator.gt),
     }
 
-    def __init__(self, subscription):
+    def __init__(
+        self,
+        subscription,
+        alert_rule=None,
+        triggers=None,
+        alert_rule_stats=None,
+        stats_pipeline=None,
+    ):
+        """
+        The alert rule, its triggers and the alert rule stats are fetched unless they're
+        passed in (see `process_updates`). When `stats_pipeline` is passed, updated stats
+        are written to that pipeline, and the caller executes it.
+        """
         self.subscription = subscription
-        try:
-            self.alert_rule = AlertRule.objects.get_for_subscription(subscription)
-        except AlertRule.DoesNotExist:
-            return
+        self.stats_pipeline = stats_pipeline
+        if alert_rule is None:
+            try:
+                alert_rule = AlertRule.objects.get_for_subscription(subscription)
+            except AlertRule.DoesNotExist:
+                return
+        self.alert_rule = alert_rule
 
-        self.triggers = AlertRuleTrigger.objects.get_for_alert_rule(self.alert_rule)
-        self.triggers.sort(key=lambda trigger: trigger.alert_threshold)
+        if triggers is None:
+            triggers = AlertRuleTrigger.objects.get_for_alert_rule(self.alert_rule)
+        self.triggers = sorted(triggers, key=lambda trigger: trigger.alert_threshold)
 
+        if alert_rule_stats is None:
+            alert_rule_stats = get_alert_rule_stats(
+                self.alert_rule, self.subscription, self.triggers
+            )
         (
             self.last_update,
             self.trigger_alert_counts,
             self.trigger_resolve_counts,
-        ) = get_alert_rule_stats(self.alert_rule, self.subscription, self.triggers)
+        ) = alert_rule_stats
         self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
         self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
 
@@ -170,47 +195,27 @@ class SubscriptionProcessor:
 
     def get_comparison_aggregation_value(self, subscription_update, aggregation_value):
         # For comparison alerts run a query over the comparison period and use it to calculate the
-        # % change.
-        delta = timedelta(seconds=self.alert_rule.comparison_delta)
-        end = subscription_update["timestamp"] - delta
-        snuba_query = self.subscription.snuba_query
-        start = end - timedelta(seconds=snuba_query.time_window)
-
-        entity_subscription = get_entity_subscription_for_dataset(
-            dataset=QueryDatasets(snuba_query.dataset),
-            aggregate=snuba_query.aggregate,
-            time_window=snuba_query.time_window,
-            extra_fields={
-                "org_id": self.subscription.project.organization,
-                "event_types": snuba_query.event_types,
-            },
+        # % change. The result may already have been fetched by `prefetch_comparison_values`.
+        comparison_delta = self.alert_rule.comparison_delta
+        cache_key = build_comparison_cache_key(
+            self.subscription, comparison_delta, subscription_update["timestamp"]
         )
-        try:
-            snuba_filter = build_snuba_filter(
-                entity_subscription,
-                snuba_query.query,
-                snuba_query.environment,
-                params={
-                    "project_id": [self.subscription.project_id],
-                    "start": start,
-                    "end": end,
-                },
-            )
-            results = raw_query(
-                aggregations=snuba_filter.aggregations,
-                start=snuba_filter.start,
-                end=snuba_filter.end,
-                conditions=snuba_filter.conditions,
-                filter_keys=snuba_filter.filter_keys,
-                having=snuba_filter.having,
-                dataset=Dataset(snuba_query.dataset),
-                limit=1,
-                referrer="subscription_processor.comparison_query",
-            )
-            comparison_aggregate = list(results["data"][0].values())[0]
-        except Exception:
-            logger.exception("Failed to run comparison query")
-            return
+        cached_value = cache.get(cache_key)
+        if cached_value is not None:
+            comparison_aggregate = cached_value[0]
+        else:
+            try:
+                query_params = build_comparison_query_params(
+                    self.subscription, comparison_delta, subscription_update["timestamp"]
+                )
+                results = bulk_raw_query(
+                    [query_params], referrer="subscription_processor.comparison_query"
+                )[0]
+                comparison_aggregate = list(results["data"][0].values())[0]
+            except Exception:
+                logger.exception("Failed to run comparison query")
+                return
+            cache.set(cache_key, [comparison_aggregate], COMPARISON_VALUE_CACHE_TTL)
 
         if not comparison_aggregate:
             metrics.incr("incidents.alert_rules.skipping_update_comparison_value_invalid")
@@ -625,8 +630,200 @@ class SubscriptionProcessor:
             self.last_update,
             updated_trigger_alert_counts,
             updated_trigger_resolve_counts,
+            pipeline=self.stats_pipeline,
+        )
+        # The processor can be used for further updates, which only need to write the
+        # stats that change from here.
+        self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
+        self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
+
+
+def process_updates(updates):
+    """
+    Processes a batch of subscription updates. This is equivalent to processing each
+    update with a `SubscriptionProcessor`, but the alert rules, triggers, active
+    incidents and alert rule stats of all subscriptions are fetched in bulk, and the
+    updated stats are written in a single pipeline once all updates are processed, or
+    processing an update fails.
+    :param updates: A list of (subscription update, `QuerySubscription`) tuples
+    """
+    subscriptions = {subscription.id: subscription for _, subscription in updates}
+    alert_rules = AlertRule.objects.get_for_subscriptions(subscriptions.values())
+    triggers = AlertRuleTrigger.objects.get_for_alert_rules(alert_rules.values())
+    # Subscriptions without an alert rule are left to `SubscriptionProcessor`.
+    alert_rule_subscriptions = [
+        (subscription, alert_rules[subscription.id])
+        for subscription in subscriptions.values()
+        if subscription.id in alert_rules
+    ]
+    active_incidents = Incident.objects.get_active_incidents(
+        [
+            (alert_rule, subscription.project)
+            for subscription, alert_rule in alert_rule_subscriptions
+        ]
+    )
+    alert_rule_stats = get_alert_rule_stats_many(
+        [
+            (
+                alert_rule,
+                subscription,
+                sorted(triggers[alert_rule.id], key=lambda trigger: trigger.alert_threshold),
+            )
+            for subscription, alert_rule in alert_rule_subscriptions
+        ]
+    )
+
+    stats_pipeline = get_redis_client().pipeline()
+    processors = {}
+    for (subscription, alert_rule), stats in zip(alert_rule_subscriptions, alert_rule_stats):
+        processor = SubscriptionProcessor(
+            subscription,
+            alert_rule=alert_rule,
+            triggers=triggers[alert_rule.id],
+            alert_rule_stats=stats,
+            stats_pipeline=stats_pipeline,
+        )
+        processor.active_incident = active_incidents[(alert_rule.id, subscription.project_id)]
+        processors[subscription.id] = processor
+
+    # Updates of the same subscription are processed in order by the same processor,
+    # which keeps track of the state changed by previous updates.
+    try:
+        for subscription_update, subscription in updates:
+            processor = processors.get(subscription.id)
+            if processor is None:
+                processor = processors[subscription.id] = SubscriptionProcessor(
+                    subscription, stats_pipeline=stats_pipeline
+                )
+            processor.process_update(subscription_update)
+    finally:
+        # Incidents of the updates processed so far have already been changed, so
+        # their stats have to be written even if a later update fails.
+        stats_pipeline.execute()
+
+
+def build_comparison_cache_key(subscription, comparison_delta, timestamp):
+    """
+    Builds the key that the result of a comparison query is cached at. The result
+    depends on the subscription, the end of the comparison window and the query.
+    """
+    snuba_query = subscription.snuba_query
+    end = timestamp - timedelta(seconds=comparison_delta)
+    query_hash = hash_values(
+        [
+            snuba_query.dataset,
+            snuba_query.query,
+            snuba_query.aggregate,
+            snuba_query.time_window,
+            snuba_query.environment_id,
+        ]
+    )
+    return f"incidents:comparison:{subscription.id}:{int(to_timestamp(end))}:{query_hash}"
+
+
+def build_comparison_query_params(subscription, comparison_delta, timestamp):
+    """
+    Builds the Snuba query for the aggregate over the comparison window of a
+    subscription update.
+    """
+    end = timestamp - timedelta(seconds=comparison_delta)
+    snuba_query = subscription.snuba_query
+    start = end - timedelta(seconds=snuba_query.time_window)
+
+    entity_subscription = get_entity_subscription_for_dataset(
+        dataset=QueryDatasets(snuba_query.dataset),
+        aggregate=snuba_query.aggregate,
+        time_window=snuba_query.time_window,
+        extra_fields={
+            "org_id": subscription.project.organization,
+            "event_types": snuba_query.event_types,
+        },
+    )
+    snuba_filter = build_snuba_filter(
+        entity_subscription,
+        snuba_query.query,
+        snuba_query.environment,
+        params={
+            "project_id": [subscription.project_id],
+            "start": start,
+            "end": end,
+        },
+    )
+    return SnubaQueryParams(
+        aggregations=snuba_filter.aggregations,
+        start=snuba_filter.start,
+        end=snuba_filter.end,
+        conditions=snuba_filter.conditions,
+        filter_keys=snuba_filter.filter_keys,
+        having=snuba_filter.having,
+        dataset=Dataset(snuba_query.dataset),
+        limit=1,
+    )
+
+
+def prefetch_comparison_values(updates):
+    """
+    Runs the comparison queries for a batch of subscription updates together, and
+    caches their results for `SubscriptionProcessor.get_comparison_aggregation_value`.
+    :param updates: A list of (subscription update, `QuerySubscription`) tuples
+    """
+    queries = {}
+    for subscription_update, subscription in updates:
+        if subscription.snuba_query.dataset in (
+            QueryDatasets.SESSIONS.value,
+            QueryDatasets.METRICS.value,
+        ):
+            continue
+        try:
+            alert_rule = AlertRule.objects.get_for_subscription(subscription)
+        except AlertRule.DoesNotExist:
+            continue
+        if not alert_rule.comparison_delta:
+            continue
+
+        cache_key = build_comparison_cache_key(
+            subscription, alert_rule.comparison_delta, subscription_update["timestamp"]
+        )
+        queries[cache_key] = (
+            subscription,
+            alert_rule.comparison_delta,
+            subscription_update["timestamp"],
         )
 
+    if not queries:
+        return
+
+    cached_values = cache.get_many(list(queries))
+    cache_keys = []
+    query_params = []
+    for cache_key, query_args in queries.items():
+        if cache_key in cached_values:
+            continue
+        try:
+            query_params.append(build_comparison_query_params(*query_args))
+        except Exception:
+            logger.exception("Failed to build comparison query")
+            continue
+        cache_keys.append(cache_key)
+
+    metrics.incr("incidents.alert_rules.comparison_prefetch.cached", len(cached_values))
+    if not query_params:
+        return
+
+    # Updates that didn't get a value here run their own query.
+    try:
+        results = bulk_raw_query(query_params, referrer="subscription_processor.comparison_query")
+    except Exception:
+        logger.exception("Failed to run comparison queries")
+        return
+
+    comparison_values = {}
+    for cache_key, result in zip(cache_keys, results):
+        if result["data"]:
+            comparison_values[cache_key] = [list(result["data"][0].values())[0]]
+    cache.set_many(comparison_values, COMPARISON_VALUE_CACHE_TTL)
+    metrics.incr("incidents.alert_rules.comparison_prefetch.queried", len(cache_keys))
+
 
 def build_alert_rule_stat_keys(alert_rule, subscription):
     """
@@ -682,6 +879,28 @@ def get_alert_rule_stats(alert_rule, subscription, triggers):
     alert_rule_keys = build_alert_rule_stat_keys(alert_rule, subscription)
     trigger_keys = build_trigger_stat_keys(alert_rule, subscription, triggers)
     results = get_redis_client().mget(alert_rule_keys + trigger_keys)
+    return parse_alert_rule_stats(triggers, results)
+
+
+def get_alert_rule_stats_many(items):
+    """
+    Fetches stats about multiple alert rules, like `get_alert_rule_stats`, in a single
+    pipeline.
+    :param items: A list of (alert rule, subscription, triggers) tuples
+    :return: A list of stats tuples, in the order of `items`
+    """
+    pipeline = get_redis_client().pipeline()
+    for alert_rule, subscription, triggers in items:
+        alert_rule_keys = build_alert_rule_stat_keys(alert_rule, subscription)
+        trigger_keys = build_trigger_stat_keys(alert_rule, subscription, triggers)
+        pipeline.mget(alert_rule_keys + trigger_keys)
+    results = pipeline.execute()
+    return [
+        parse_alert_rule_stats(triggers, result) for (_, _, triggers), result in zip(items, results)
+    ]
+
+
+def parse_alert_rule_stats(triggers, results):
     results = tuple(0 if result is None else int(result) for result in results)
     last_update = to_datetime(results[0])
     trigger_results = results[1:]
@@ -696,11 +915,16 @@ def get_alert_rule_stats(alert_rule, subscription, triggers):
     return last_update, trigger_alert_counts, trigger_resolve_counts
 
 
-def update_alert_rule_stats(alert_rule, subscription, last_update, alert_counts, resolve_counts):
+def update_alert_rule_stats(
+    alert_rule, subscription, last_update, alert_counts, resolve_counts, pipeline=None
+):
     """
     Updates stats about the alert rule, subscription and triggers if they've changed.
+    If a pipeline is passed, the updates are added to it instead of being executed.
     """
-    pipeline = get_redis_client().pipeline()
+    execute = pipeline is None
+    if execute:
+        pipeline = get_redis_client().pipeline()
 
     counts_with_stat_keys = zip(ALERT_RULE_TRIGGER_STAT_KEYS, (alert_counts, resolve_counts))
     for stat_key, trigger_counts in counts_with_stat_keys:
@@ -715,7 +939,8 @@ def update_alert_rule_stats(alert_rule, subscription, last_update, alert_counts,
 
     last_update_key = build_alert_rule_stat_keys(alert_rule, subscription)[0]
     pipeline.set(last_update_key, int(to_timestamp(last_update)), ex=REDIS_TTL)
-    pipeline.execute()
+    if execute:
+        pipeline.execute()
 
 
 def get_redis_client():
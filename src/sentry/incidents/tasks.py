@@ -17,7 +17,11 @@ from sentry.incidents.models import (
     IncidentStatusMethod,
 )
 from sentry.models import Project
-from sentry.snuba.query_subscription_consumer import register_subscriber
+from sentry.snuba.query_subscription_consumer import (
+    register_batch_preparer,
+    register_batch_subscriber,
+    register_subscriber,
+)
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
 from sentry.utils.email import MessageBuilder
@@ -148,6 +152,33 @@ def handle_snuba_query_update(subscription_update, subscription):
         SubscriptionProcessor(subscription).process_update(subscription_update)
 
 
+@register_batch_subscriber(INCIDENTS_SNUBA_SUBSCRIPTION_TYPE)
+def handle_snuba_query_updates(updates):
+    """
+    Handles a batch of subscription updates for `QuerySubscription`s, like
+    `handle_snuba_query_update`.
+    :param updates: A list of (subscription update, `QuerySubscription`) tuples
+    """
+    from sentry.incidents.subscription_processor import process_updates
+
+    # noinspection SpellCheckingInspection
+    with metrics.timer("incidents.subscription_procesor.process_updates"):
+        process_updates(updates)
+
+
+@register_batch_preparer(INCIDENTS_SNUBA_SUBSCRIPTION_TYPE)
+def prepare_snuba_query_updates(updates):
+    """
+    Prepares a batch of updates for `QuerySubscription`s before they are handled by
+    `handle_snuba_query_updates`.
+    :param updates: A list of (subscription update, `QuerySubscription`) tuples
+    """
+    from sentry.incidents.subscription_processor import prefetch_comparison_values
+
+    with metrics.timer("incidents.subscription_procesor.prefetch_comparison_values"):
+        prefetch_comparison_values(updates)
+
+
 @instrumented_task(
     name="sentry.incidents.tasks.handle_trigger_action",
     queue="incidents",
@@ -2,7 +2,7 @@ import functools
 import logging
 import random
 import time
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
 from typing import (
     Any,
     Callable,
@@ -57,8 +57,17 @@ Message = Any
 
 
 class IngestConsumerWorker(AbstractBatchWorker):
-    def __init__(self, process_event_executor: Optional[ThreadPoolExecutor] = None) -> None:
+    def __init__(
+        self,
+        process_event_executor: Optional[ThreadPoolExecutor] = None,
+        process_pool_executor: Optional[Executor] = None,
+        process_pool_size: int = 1,
+    ) -> None:
         self.__process_event_executor = process_event_executor
+        # When a process pool is provided, batches are sharded by project and
+        # processed on multiple cores instead of on the consumer's main thread.
+        self.__process_pool_executor = process_pool_executor
+        self.__process_pool_size = process_pool_size
         if self.__process_event_executor is None:
             self.__process_event = process_event
         else:
@@ -73,6 +82,8 @@ class IngestConsumerWorker(AbstractBatchWorker):
     def flush_batch(self, batch):
         mark_scope_as_unsafe()
         with metrics.timer("ingest_consumer.flush_batch"):
+            if self.__process_pool_executor is not None:
+                return self._flush_batch_sharded(batch)
             return self._flush_batch(batch)
 
     def _flush_batch(self, batch: Sequence[Message]):
@@ -148,9 +159,122 @@ class IngestConsumerWorker(AbstractBatchWorker):
                     (time.monotonic() - other_messages_flush_start) / len(other_messages),
                 )
 
+    def _flush_batch_sharded(self, batch: Sequence[Message]) -> None:
+        """
+        Process a batch on the process pool. Attachment chunks for the entire
+        batch are stored before any other message is processed, since events
+        and attachments read them back from the attachment cache. Messages are
+        sharded by project so that per-project ordering within a batch is
+        preserved. This only returns once every shard has completed, so
+        offsets are never committed for messages that are still in flight.
+        """
+        attachment_chunks = []
+        other_messages = []
+
+        with metrics.timer("ingest_consumer.prepare_messages"):
+            for message in batch:
+                message_type = message["type"]
+                if message_type == "attachment_chunk":
+                    attachment_chunks.append(message)
+                elif message_type in ("event", "attachment", "user_report"):
+                    other_messages.append(message)
+                else:
+                    raise ValueError(f"Unknown message type: {message_type}")
+                metrics.incr(
+                    "ingest_consumer.flush.messages_seen", tags={"message_type": message_type}
+                )
+
+        if attachment_chunks:
+            with metrics.timer("ingest_consumer.process_attachment_chunk_batch"):
+                self._run_shards(attachment_chunks)
+
+        if other_messages:
+            with metrics.timer("ingest_consumer.process_other_messages_batch"):
+                self._run_shards(other_messages)
+
+    def _run_shards(self, messages: Sequence[Message]) -> None:
+        assert self.__process_pool_executor is not None
+
+        futures = {
+            self.__process_pool_executor.submit(process_message_shard, shard): index
+            for index, shard in enumerate(shard_messages(messages, self.__process_pool_size))
+        }
+
+        # Wait for every shard, even if one of them fails, so that no worker
+        # is still processing messages once the exception propagates.
+        error = None
+        for future in as_completed(futures):
+            try:
+                duration, message_count = future.result()
+            except Exception as e:
+                error = e
+                continue
+
+            tags = {"shard": str(futures[future])}
+            metrics.timing("ingest_consumer.process_shard", duration, tags=tags)
+            metrics.timing("ingest_consumer.process_shard.messages", message_count, tags=tags)
+
+        if error is not None:
+            raise error
+
     def shutdown(self):
         if self.__process_event_executor is not None:
             self.__process_event_executor.shutdown()
+        if self.__process_pool_executor is not None:
+            self.__process_pool_executor.shutdown()
+
+
+def shard_messages(messages: Sequence[Message], num_shards: int) -> Sequence[Sequence[Message]]:
+    """
+    Split messages into at most ``num_shards`` non-empty shards, keeping all
+    messages of a project in the same shard and in their original order.
+    """
+    shards: MutableMapping[int, MutableSequence[Message]] = {}
+    for message in messages:
+        shard = int(message["project_id"]) % max(num_shards, 1)
+        shards.setdefault(shard, []).append(message)
+    return [shards[shard] for shard in sorted(shards)]
+
+
+def initialize_process_pool_worker() -> None:
+    """
+    Initializer for process pool workers. Database connections inherited from
+    the parent process must not be shared across processes.
+    """
+    from django.db import connections
+
+    connections.close_all()
+    mark_scope_as_unsafe()
+
+
+def process_message_shard(messages: Sequence[Message]) -> Tuple[float, int]:
+    """
+    Process a shard of messages sequentially inside a process pool worker.
+    Returns the time spent processing and the number of messages processed.
+    """
+    start = time.monotonic()
+
+    projects = {
+        p.id: p
+        for p in Project.objects.get_many_from_cache(
+            {message["project_id"] for message in messages}
+        )
+    }
+
+    for message in messages:
+        message_type = message["type"]
+        if message_type == "event":
+            process_event(message, projects)
+        elif message_type == "attachment_chunk":
+            process_attachment_chunk(message, projects=projects)
+        elif message_type == "attachment":
+            process_individual_attachment(message, projects)
+        elif message_type == "user_report":
+            process_userreport(message, projects)
+        else:
+            raise ValueError(f"Unknown message type: {message_type}")
+
+    return time.monotonic() - start, len(messages)
 
 
 def trace_func(**span_kwargs):
@@ -422,14 +546,32 @@ def process_userreport(message, projects) -> None:
 
 
 def get_ingest_consumer(
-    consumer_types, once=False, executor: Optional[ThreadPoolExecutor] = None, **options
+    consumer_types,
+    once=False,
+    executor: Optional[ThreadPoolExecutor] = None,
+    processes: Optional[int] = None,
+    **options,
 ):
     """
     Handles events coming via a kafka queue.
 
     The events should have already been processed (normalized... ) upstream (by Relay).
+
+    If ``processes`` is given, batches are sharded by project and processed
+    on a pool of that many worker processes.
     """
     topic_names = {ConsumerType.get_topic_name(consumer_type) for consumer_type in consumer_types}
-    return create_batching_kafka_consumer(
-        topic_names=topic_names, worker=IngestConsumerWorker(executor), **options
-    )
+
+    if processes is not None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        worker = IngestConsumerWorker(
+            process_pool_executor=ProcessPoolExecutor(
+                processes, initializer=initialize_process_pool_worker
+            ),
+            process_pool_size=processes,
+        )
+    else:
+        worker = IngestConsumerWorker(executor)
+
+    return create_batching_kafka_consumer(topic_names=topic_names, worker=worker, **options)
@@ -3,9 +3,12 @@ import errno
 import logging
 import re
 import sys
+import threading
 import time
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from hashlib import sha1
 from io import BytesIO
 from os.path import splitext
 from typing import IO, Optional, Tuple
@@ -13,6 +16,7 @@ from urllib.parse import urlsplit
 
 import sentry_sdk
 from django.conf import settings
+from django.db import connections
 from django.utils import timezone
 from django.utils.encoding import force_bytes, force_text
 from requests.utils import get_encoding_from_headers
@@ -32,11 +36,12 @@ from sentry.utils.cache import cache
 from sentry.utils.files import compress_file
 from sentry.utils.hashlib import md5_text
 from sentry.utils.http import is_valid_origin
+from sentry.utils.lru import LRUCache
 from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path
 from sentry.utils.urls import non_standard_url_join
 
-from .cache import SourceCache, SourceMapCache
+from .cache import SourceCache, SourceMapCache, make_source_view
 
 __all__ = ["JavaScriptStacktraceProcessor"]
 
@@ -75,9 +80,46 @@ MAX_RESOURCE_FETCHES = 100
 
 CACHE_MAX_VALUE_SIZE = settings.SENTRY_CACHE_MAX_VALUE_SIZE
 
+# Parsed source maps and source views shared by all events processed by this
+# worker. Cache keys contain a hash of the file contents, so an artifact that
+# is replaced in a release is never served from here.
+VIEW_CACHE_MAX_ITEMS = 10000
+_view_cache = LRUCache(VIEW_CACHE_MAX_ITEMS, max_weight=settings.SENTRY_SOURCEMAP_VIEW_CACHE_SIZE)
+
+# Parsed artifact indexes are kept in memory for a few seconds, so that the
+# frames of an event (and of concurrent events of the same release) do not
+# decode the index again. The shared cache keeps them for up to a minute.
+ARTIFACT_INDEX_LOCAL_TTL = 10
+ARTIFACT_INDEX_MAX_LOOKUPS = 10000
+_artifact_index_cache = LRUCache(100)
+
+# Sources of all events processed by this worker are fetched on a shared pool,
+# sized by the ``processing.javascript.fetch-concurrency`` option.
+_fetch_pool = None
+_fetch_pool_size = 0
+_fetch_pool_lock = threading.Lock()
+
 logger = logging.getLogger(__name__)
 
 
+def get_fetch_pool():
+    """
+    Returns the thread pool used to fetch sources and source maps. The pool is
+    replaced when the ``processing.javascript.fetch-concurrency`` option
+    changes. Threads of a replaced pool exit once it is no longer in use.
+    """
+    global _fetch_pool, _fetch_pool_size
+
+    size = options.get("processing.javascript.fetch-concurrency")
+    with _fetch_pool_lock:
+        if _fetch_pool is None or _fetch_pool_size != size:
+            _fetch_pool = ThreadPoolExecutor(
+                max_workers=size, thread_name_prefix="javascript-fetch"
+            )
+            _fetch_pool_size = size
+        return _fetch_pool
+
+
 class UnparseableSourcemap(http.BadSource):
     error_type = EventError.JS_INVALID_SOURCEMAP
 
@@ -395,12 +437,42 @@ def get_from_archive(url: str, archive: ReleaseArchive) -> Tuple[bytes, dict]:
     raise KeyError(f"Not found in archive: '{url}'")
 
 
+class ArtifactIndex:
+    """
+    A parsed artifact index. Resolved lookups of URLs are memoized, so every
+    URL is only normalized once per index revision.
+    """
+
+    def __init__(self, index):
+        self.files = index.get("files", {})
+        self._entries = LRUCache(ARTIFACT_INDEX_MAX_LOOKUPS)
+
+    def get_entry(self, url) -> Optional[dict]:
+        if url in self._entries:
+            return self._entries.get(url)
+
+        entry = None
+        for candidate in ReleaseFile.normalize(url):
+            entry = self.files.get(candidate)
+            if entry:
+                break
+        self._entries.set(url, entry)
+        return entry
+
+
 @metrics.wraps("sourcemaps.load_artifact_index")
-def get_artifact_index(release, dist):
+def get_artifact_index(release, dist) -> Optional[ArtifactIndex]:
     dist_name = dist and dist.name or None
 
     ident = ReleaseFile.get_ident(ARTIFACT_INDEX_FILENAME, dist_name)
     cache_key = f"artifact-index:v1:{release.id}:{ident}"
+
+    local_result = _artifact_index_cache.get(cache_key)
+    if local_result is not None and local_result[0] > time.monotonic():
+        metrics.incr("sourcemaps.artifact_index_cache.hit", skip_internal=True)
+        return local_result[1]
+    metrics.incr("sourcemaps.artifact_index_cache.miss", skip_internal=True)
+
     result = cache.get(cache_key)
     if result == -1:
         index = None
@@ -412,7 +484,9 @@ def get_artifact_index(release, dist):
         # Only cache for a short time to keep the manifest up-to-date
         cache.set(cache_key, cache_value, timeout=60)
 
-    return index
+    rv = None if index is None else ArtifactIndex(index)
+    _artifact_index_cache.set(cache_key, (time.monotonic() + ARTIFACT_INDEX_LOCAL_TTL, rv))
+    return rv
 
 
 def get_index_entry(release, dist, url) -> Optional[dict]:
@@ -423,10 +497,7 @@ def get_index_entry(release, dist, url) -> Optional[dict]:
         return None
 
     if index:
-        for candidate in ReleaseFile.normalize(url):
-            entry = index.get("files", {}).get(candidate)
-            if entry:
-                return entry
+        return index.get_entry(url)
 
     return None
 
@@ -740,13 +811,46 @@ def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=T
         )
         body = result.body
     try:
-        return SourceMapView.from_json_bytes(body)
+        return get_cached_view(
+            "sourcemap",
+            "<base64>" if is_data_uri(url) else url,
+            release,
+            dist,
+            body,
+            SourceMapView.from_json_bytes,
+        )
     except Exception as exc:
         # This is in debug because the product shows an error already.
         logger.debug(str(exc), exc_info=True)
         raise UnparseableSourcemap({"url": http.expose_url(url)})
 
 
+def get_cached_view(view_type, url, release, dist, body, parse, encoding=None):
+    """
+    Returns ``parse(body)`` from the worker-wide view cache, keyed by release,
+    dist, URL and a checksum of ``body``.
+    """
+    cache_key = (
+        view_type,
+        release.id if release else None,
+        dist.id if dist else None,
+        url,
+        encoding,
+        sha1(body).hexdigest(),
+    )
+    view = _view_cache.get(cache_key)
+    if view is not None:
+        metrics.incr("sourcemaps.view_cache.hit", tags={"type": view_type}, skip_internal=True)
+        return view
+
+    metrics.incr("sourcemaps.view_cache.miss", tags={"type": view_type}, skip_internal=True)
+    with metrics.timer("sourcemaps.view_cache.parse", tags={"type": view_type}):
+        view = parse(body)
+    _view_cache.set(cache_key, view, weight=len(body))
+    metrics.gauge("sourcemaps.view_cache.size", _view_cache.weight)
+    return view
+
+
 def is_data_uri(url):
     return url[:BASE64_PREAMBLE_LENGTH] == BASE64_SOURCEMAP_PREAMBLE
 
@@ -1119,17 +1223,69 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         Look for and (if found) cache a source file and its associated source
         map (if any).
         """
+        self.cache_sources([filename])
 
-        sourcemaps = self.sourcemaps
-        cache = self.cache
-
-        self.fetch_count += 1
+    def cache_sources(self, filenames, executor=None):
+        """
+        Look for and (if found) cache source files and their associated source
+        maps (if any).
 
-        if self.fetch_count > self.max_fetches:
-            cache.add_error(filename, {"type": EventError.JS_TOO_MANY_REMOTE_SOURCES})
-            return
+        If an ``executor`` is given, the source files and then their source maps
+        are fetched concurrently. Results are added to the caches in the order
+        of ``filenames`` either way, so the cached sources and reported errors
+        are the same as when fetching one file after another.
+        """
+        to_fetch = []
+        for filename in filenames:
+            self.fetch_count += 1
+            if self.fetch_count > self.max_fetches:
+                self.cache.add_error(filename, {"type": EventError.JS_TOO_MANY_REMOTE_SOURCES})
+            else:
+                to_fetch.append(filename)
 
         # TODO: respect cache-control/max-age headers to some extent
+        sources = self._fetch_all(self._fetch_source, to_fetch, executor)
+
+        sourcemap_urls = {}
+        for filename, result in sources.items():
+            if not isinstance(result, http.BadSource):
+                sourcemap_url = discover_sourcemap(result)
+                if sourcemap_url:
+                    sourcemap_urls[filename] = sourcemap_url
+
+        pending_sourcemaps = [
+            url for url in dict.fromkeys(sourcemap_urls.values()) if url not in self.sourcemaps
+        ]
+        sourcemap_views = self._fetch_all(self._fetch_sourcemap, pending_sourcemaps, executor)
+
+        for filename in to_fetch:
+            self._add_source(
+                filename, sources[filename], sourcemap_urls.get(filename), sourcemap_views
+            )
+
+    def _fetch_all(self, fetch, urls, executor):
+        if executor is None or len(urls) < 2:
+            return {url: fetch(url) for url in urls}
+
+        # Spans of worker threads should be attached to the current transaction.
+        hub = sentry_sdk.Hub.current
+
+        def fetch_with_hub(url):
+            try:
+                with sentry_sdk.Hub(hub):
+                    return fetch(url)
+            finally:
+                # Fetching may look up release files, which opens a database
+                # connection for the pool thread.
+                connections.close_all()
+
+        return dict(zip(urls, executor.map(fetch_with_hub, urls)))
+
+    def _fetch_source(self, filename):
+        """
+        Fetch a source file, returning the ``BadSource`` error instead of
+        raising it.
+        """
         logger.debug("Attempting to cache source %r", filename)
         try:
             # this both looks in the database and tries to scrape the internet
@@ -1137,7 +1293,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 op="JavaScriptStacktraceProcessor.cache_source.fetch_file"
             ) as span:
                 span.set_data("filename", filename)
-                result = fetch_file(
+                return fetch_file(
                     filename,
                     project=self.project,
                     release=self.release,
@@ -1145,20 +1301,55 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                     allow_scraping=self.allow_scraping,
                 )
         except http.BadSource as exc:
+            return exc
+
+    def _fetch_sourcemap(self, sourcemap_url):
+        """
+        Fetch a source map, returning the ``BadSource`` error instead of
+        raising it.
+        """
+        try:
+            with sentry_sdk.start_span(
+                op="JavaScriptStacktraceProcessor.cache_source.fetch_sourcemap"
+            ) as span:
+                span.set_data("sourcemap_url", sourcemap_url)
+                return fetch_sourcemap(
+                    sourcemap_url,
+                    project=self.project,
+                    release=self.release,
+                    dist=self.dist,
+                    allow_scraping=self.allow_scraping,
+                )
+        except http.BadSource as exc:
+            return exc
+
+    def _add_source(self, filename, result, sourcemap_url, sourcemap_views):
+        sourcemaps = self.sourcemaps
+        cache = self.cache
+
+        if isinstance(result, http.BadSource):
             # most people don't upload release artifacts for their third-party libraries,
             # so ignore missing node_modules files
-            if exc.data["type"] == EventError.JS_MISSING_SOURCE and "node_modules" in filename:
+            if result.data["type"] == EventError.JS_MISSING_SOURCE and "node_modules" in filename:
                 pass
             else:
-                cache.add_error(filename, exc.data)
+                cache.add_error(filename, result.data)
 
             # either way, there's no more for us to do here, since we don't have
             # a valid file to cache
             return
-        cache.add(filename, result.body, result.encoding)
+        source_view = get_cached_view(
+            "source",
+            result.url,
+            self.release,
+            self.dist,
+            result.body,
+            lambda body: make_source_view(body, result.encoding),
+            encoding=result.encoding,
+        )
+        cache.add(filename, source_view)
         cache.alias(result.url, filename)
 
-        sourcemap_url = discover_sourcemap(result)
         if not sourcemap_url:
             return
 
@@ -1169,27 +1360,15 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         if sourcemap_url in sourcemaps:
             return
 
-        # pull down sourcemap
-        try:
-            with sentry_sdk.start_span(
-                op="JavaScriptStacktraceProcessor.cache_source.fetch_sourcemap"
-            ) as span:
-                span.set_data("sourcemap_url", sourcemap_url)
-                sourcemap_view = fetch_sourcemap(
-                    sourcemap_url,
-                    project=self.project,
-                    release=self.release,
-                    dist=self.dist,
-                    allow_scraping=self.allow_scraping,
-                )
-        except http.BadSource as exc:
+        sourcemap_view = sourcemap_views[sourcemap_url]
+        if isinstance(sourcemap_view, http.BadSource):
             # we don't perform the same check here as above, because if someone has
             # uploaded a node_modules file, which has a sourceMappingURL, they
             # presumably would like it mapped (and would like to know why it's not
             # working, if that's the case). If they're not looking for it to be
             # mapped, then they shouldn't be uploading the source file in the
             # first place.
-            cache.add_error(filename, exc.data)
+            cache.add_error(filename, sourcemap_view.data)
             return
 
         sourcemaps.add(sourcemap_url, sourcemap_view)
@@ -1205,7 +1384,9 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         Fetch all sources that we know are required (being referenced directly
         in frames).
         """
-        pending_file_list = set()
+        # Deduplicate while keeping the frame order, so that the same sources
+        # are fetched when hitting the fetch limit.
+        pending_file_list = {}
         for f in frames:
             # We can't even attempt to fetch source if abs_path is None
             if f.get("abs_path") is None:
@@ -1219,14 +1400,18 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # we cannot fetch any other files than those uploaded by user
             if self.data.get("platform") == "node" and not f.get("abs_path").startswith("app:"):
                 continue
-            pending_file_list.add(f["abs_path"])
+            pending_file_list[f["abs_path"]] = None
 
-        for idx, filename in enumerate(pending_file_list):
-            with sentry_sdk.start_span(
-                op="JavaScriptStacktraceProcessor.populate_source_cache.cache_source"
-            ) as span:
-                span.set_data("filename", filename)
-                self.cache_source(filename=filename)
+        concurrency = min(options.get("processing.javascript.fetch-concurrency"), self.max_fetches)
+        with sentry_sdk.start_span(
+            op="JavaScriptStacktraceProcessor.populate_source_cache.cache_sources"
+        ) as span:
+            span.set_data("num_files", len(pending_file_list))
+            span.set_data("concurrency", concurrency)
+            if concurrency > 1 and len(pending_file_list) > 1:
+                self.cache_sources(pending_file_list, executor=get_fetch_pool())
+            else:
+                self.cache_sources(pending_file_list)
 
     def close(self):
         StacktraceProcessor.close(self)
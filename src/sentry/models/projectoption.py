@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence
 
 from django.db import models
 
@@ -69,6 +69,42 @@ class ProjectOptionManager(OptionManager["Project"]):
         values: Mapping[str, Value] = self._option_cache.get(cache_key, {})
         return values
 
+    def get_all_values_bulk(
+        self, projects: Sequence["Project"]
+    ) -> Mapping[int, Mapping[str, Value]]:
+        """
+        Loads the options of many projects at once and primes the local cache
+        with them, so that subsequent ``get_all_values`` calls for these
+        projects don't hit the cache or database.
+        """
+        result = {}
+        missing = {}
+        for project in projects:
+            cache_key = self._make_key(project.id)
+            if cache_key in self._option_cache:
+                result[project.id] = self._option_cache[cache_key]
+            else:
+                missing[cache_key] = project.id
+
+        if missing:
+            for cache_key, values in cache.get_many(missing.keys()).items():
+                if values is not None:
+                    self._option_cache[cache_key] = result[missing.pop(cache_key)] = values
+
+        if missing:
+            loaded: Dict[int, Dict[str, Value]] = {
+                project_id: {} for project_id in missing.values()
+            }
+            for option in self.filter(project__in=list(loaded)):
+                loaded[option.project_id][option.key] = option.value
+
+            to_cache = {self._make_key(project_id): values for project_id, values in loaded.items()}
+            cache.set_many(to_cache)
+            self._option_cache.update(to_cache)
+            result.update(loaded)
+
+        return result
+
     def reload_cache(self, project_id: int, update_reason: str) -> Mapping[str, Value]:
         if update_reason != "projectoption.get_all_values":
             schedule_update_config_cache(
@@ -1,8 +1,11 @@
 from threading import local
 
 import sentry_sdk
+from django.conf import settings
 from django.core.cache import InvalidCacheBackendError, caches
 
+from sentry.nodestore.compression import NodeCompressor, load_dictionaries
+from sentry.nodestore.indexed import INDEXED_HEADER, decode_indexed, encode_indexed
 from sentry.utils import json
 from sentry.utils.cache import memoize
 from sentry.utils.services import Service
@@ -56,6 +59,18 @@ class NodeStorage(local, Service):
 
     This is used in reprocessing to store a snapshot of the event from multiple
     stages of the pipeline.
+
+    If ``SENTRY_NODESTORE_COMPRESSION`` is set to ``"zstd"``, the encoded
+    bytestream is additionally zstd-compressed before it is handed to the
+    backend, using the trained per-platform dictionaries found in
+    ``SENTRY_NODESTORE_COMPRESSION_DICTIONARIES`` (see ``sentry nodestore
+    train-dictionaries``). Compressed payloads are always readable, regardless
+    of that setting.
+
+    If ``SENTRY_NODESTORE_INDEXED_PAYLOADS`` is enabled, values are written in
+    the indexed format (see ``sentry.nodestore.indexed``) instead, which allows
+    reading a subkey, or with ``lazy=True`` individual top-level keys, without
+    decoding the entire value.
     """
 
     __all__ = (
@@ -88,10 +103,13 @@ class NodeStorage(local, Service):
         for id in id_list:
             self.delete(id)
 
-    def _decode(self, value, subkey):
+    def _decode(self, value, subkey, lazy=False):
         if value is None:
             return None
 
+        if value.startswith(INDEXED_HEADER):
+            return decode_indexed(value, subkey, lazy=lazy)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -119,10 +137,13 @@ class NodeStorage(local, Service):
         """
         raise NotImplementedError
 
-    def get(self, id, subkey=None):
+    def get(self, id, subkey=None, lazy=False):
         """
         >>> nodestore.get('key1')
         {"message": "hello world"}
+
+        With ``lazy=True``, values stored in the indexed format are returned
+        as a mapping that only decodes the top-level keys which are accessed.
         """
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
@@ -135,8 +156,8 @@ class NodeStorage(local, Service):
 
             span.set_tag("subkey", str(subkey))
             bytes_data = self._get_bytes(id)
-            rv = self._decode(bytes_data, subkey=subkey)
-            if subkey is None:
+            rv = self._decode(self._decompress(bytes_data), subkey=subkey, lazy=lazy)
+            if subkey is None and not lazy:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
 
@@ -157,7 +178,7 @@ class NodeStorage(local, Service):
         """
         return {id: self._get_bytes(id) for id in id_list}
 
-    def get_multi(self, id_list, subkey=None):
+    def get_multi(self, id_list, subkey=None, lazy=False):
         """
         >>> nodestore.get_multi(['key1', 'key2')
         {
@@ -180,11 +201,12 @@ class NodeStorage(local, Service):
                 uncached_ids = id_list
 
             items = {
-                id: self._decode(value, subkey=subkey)
+                id: self._decode(self._decompress(value), subkey=subkey, lazy=lazy)
                 for id, value in self._get_bytes_multi(uncached_ids).items()
             }
             if subkey is None:
-                self._set_cache_items(items)
+                if not lazy:
+                    self._set_cache_items(items)
                 items.update(cache_items)
 
             span.set_tag("result", "from_service")
@@ -208,6 +230,14 @@ class NodeStorage(local, Service):
 
         return b"\n".join(lines)
 
+    def _compress(self, value, platform=None):
+        if settings.SENTRY_NODESTORE_COMPRESSION == "zstd":
+            return self.compressor.compress(value, platform=platform)
+        return value
+
+    def _decompress(self, value):
+        return self.compressor.decompress(value)
+
     def _set_bytes(self, id, data, ttl=None):
         """
         >>> nodestore.set('key1', b"{'foo': 'bar'}")
@@ -241,7 +271,12 @@ class NodeStorage(local, Service):
             span.set_tag("node_id", id)
             span.set_data("subkeys_count", len(data))
             cache_item = data.get(None)
-            bytes_data = self._encode(data)
+            platform = cache_item.get("platform") if isinstance(cache_item, dict) else None
+            if settings.SENTRY_NODESTORE_INDEXED_PAYLOADS:
+                bytes_data = encode_indexed(data)
+            else:
+                bytes_data = self._encode(data)
+            bytes_data = self._compress(bytes_data, platform=platform)
             self._set_bytes(id, bytes_data, ttl=ttl)
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(id, cache_item)
@@ -277,6 +312,12 @@ class NodeStorage(local, Service):
         if self.cache:
             self.cache.delete_many([id for id in id_list])
 
+    @memoize
+    def compressor(self):
+        return NodeCompressor(
+            dictionaries=load_dictionaries(settings.SENTRY_NODESTORE_COMPRESSION_DICTIONARIES)
+        )
+
     @memoize
     def cache(self):
         try:
@@ -0,0 +1,110 @@
+import logging
+import os
+from typing import Mapping, MutableMapping, Optional
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+#: Payloads starting with this byte are a zstd frame. The frame header
+#: contains the id of the dictionary the payload was compressed with, if any.
+#: Uncompressed payloads start with ``{`` (JSON) or a pickle opcode, so they
+#: are never mistaken for a compressed payload.
+ZSTD_HEADER = b"\x01"
+
+#: Filename suffix of trained dictionaries in the dictionary directory.
+DICTIONARY_SUFFIX = ".dict"
+
+#: Name of the dictionary used for platforms without a dedicated dictionary.
+DEFAULT_DICTIONARY = "default"
+
+
+def load_dictionaries(path: Optional[str]) -> Mapping[str, zstandard.ZstdCompressionDict]:
+    """
+    Load all trained dictionaries from ``path``, keyed by the platform they
+    were trained for (the filename without the ``.dict`` suffix).
+    """
+    dictionaries: MutableMapping[str, zstandard.ZstdCompressionDict] = {}
+    if not path or not os.path.isdir(path):
+        return dictionaries
+
+    for filename in sorted(os.listdir(path)):
+        if not filename.endswith(DICTIONARY_SUFFIX):
+            continue
+        with open(os.path.join(path, filename), "rb") as f:
+            dictionaries[filename[: -len(DICTIONARY_SUFFIX)]] = zstandard.ZstdCompressionDict(
+                f.read()
+            )
+
+    return dictionaries
+
+
+def train_dictionary(samples, size: int) -> bytes:
+    """
+    Train a zstd dictionary of at most ``size`` bytes from encoded nodestore
+    payloads.
+    """
+    return zstandard.train_dictionary(size, list(samples)).as_bytes()
+
+
+class NodeCompressor:
+    """
+    Compresses encoded nodestore payloads with zstd, optionally using
+    per-platform trained dictionaries.
+
+    Dictionaries are only ever added: a payload written with a dictionary
+    can only be read back as long as that dictionary is still present in the
+    dictionary directory.
+
+    Instances are not thread-safe. ``NodeStorage`` is thread-local and keeps
+    one compressor per thread.
+    """
+
+    def __init__(
+        self,
+        dictionaries: Optional[Mapping[str, zstandard.ZstdCompressionDict]] = None,
+        level: int = 3,
+    ) -> None:
+        self.dictionaries = dictionaries or {}
+        self.level = level
+        self._dictionaries_by_id = {d.dict_id(): d for d in self.dictionaries.values()}
+        self._compressors: MutableMapping[Optional[str], zstandard.ZstdCompressor] = {}
+        self._decompressors: MutableMapping[int, zstandard.ZstdDecompressor] = {}
+
+    def _get_compressor(self, platform: Optional[str]) -> zstandard.ZstdCompressor:
+        if platform not in self.dictionaries:
+            platform = DEFAULT_DICTIONARY if DEFAULT_DICTIONARY in self.dictionaries else None
+
+        compressor = self._compressors.get(platform)
+        if compressor is None:
+            compressor = self._compressors[platform] = zstandard.ZstdCompressor(
+                level=self.level,
+                dict_data=self.dictionaries[platform] if platform is not None else None,
+                write_dict_id=True,
+            )
+        return compressor
+
+    def _get_decompressor(self, dict_id: int) -> zstandard.ZstdDecompressor:
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            if dict_id and dict_id not in self._dictionaries_by_id:
+                raise ValueError(f"nodestore payload requires unknown dictionary {dict_id}")
+            decompressor = self._decompressors[dict_id] = zstandard.ZstdDecompressor(
+                dict_data=self._dictionaries_by_id.get(dict_id)
+            )
+        return decompressor
+
+    def compress(self, value: bytes, platform: Optional[str] = None) -> bytes:
+        return ZSTD_HEADER + self._get_compressor(platform).compress(value)
+
+    def decompress(self, value: Optional[bytes]) -> Optional[bytes]:
+        """
+        Decompress a payload written by ``compress``. Any other payload is
+        returned unchanged.
+        """
+        if value is None or not value.startswith(ZSTD_HEADER):
+            return value
+
+        frame = value[len(ZSTD_HEADER) :]
+        dict_id = zstandard.get_frame_parameters(frame).dict_id
+        return self._get_decompressor(dict_id).decompress(frame)
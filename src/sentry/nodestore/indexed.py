@@ -0,0 +1,184 @@
+"""
+Indexed nodestore payload format.
+
+The regular nodestore encoding is a newline-separated list of JSON documents
+that has to be scanned and decoded up to the requested subkey. The indexed
+format instead starts with an offset table that records where every subkey
+and every top-level key of a subkey's payload is located, so that individual
+values can be sliced out and decoded on demand (see ``LazyNodeData``):
+
+    \\x02 <table length: uint32 LE> <table: JSON> <body>
+
+Every subkey's payload is stored as a regular JSON document, so reading an
+entire payload still takes a single ``json.loads``. The table maps each
+subkey (``""`` for the default payload) to the ``[offset, length]`` of that
+document. For object payloads, a third item maps each top-level key to the
+``[offset, length]`` of its value within the document. The offsets of
+documents are relative to the start of the body.
+"""
+import struct
+from collections.abc import MutableMapping
+
+from sentry.utils import json
+
+INDEXED_HEADER = b"\x02"
+
+_table_length = struct.Struct("<I")
+
+# Mirrors the encoder used for the regular nodestore encoding.
+json_dumps = json.JSONEncoder(
+    separators=(",", ":"),
+    sort_keys=True,
+    skipkeys=False,
+    ensure_ascii=True,
+    check_circular=True,
+    allow_nan=True,
+    indent=None,
+    encoding="utf-8",
+    default=None,
+).encode
+
+json_loads = json._default_decoder.decode
+
+
+def _subkey_name(subkey):
+    if subkey is None:
+        return ""
+    # Those keys should be statically known identifiers in the app, such as
+    # "unprocessed_event". There is really no reason to allow anything but
+    # ASCII here.
+    subkey.encode("ascii")
+    return subkey
+
+
+def encode_indexed(data):
+    """
+    Encode a ``{subkey: value}`` mapping (with the default payload under the
+    ``None`` subkey) into the indexed format.
+    """
+    table = {}
+    chunks = []
+    offset = 0
+
+    def append(chunk):
+        nonlocal offset
+        chunks.append(chunk)
+        offset += len(chunk)
+
+    for subkey, value in data.items():
+        start = offset
+        if isinstance(value, dict):
+            # The keys are written in the same order as by ``json_dumps``, so
+            # that the document is identical to the one of the regular encoding.
+            keys = {}
+            append(b"{")
+            for i, key in enumerate(sorted(value)):
+                append((b"," if i else b"") + json_dumps(key).encode("utf8") + b":")
+                chunk = json_dumps(value[key]).encode("utf8")
+                keys[key] = [offset - start, len(chunk)]
+                append(chunk)
+            append(b"}")
+            table[_subkey_name(subkey)] = [start, offset - start, keys]
+        else:
+            append(json_dumps(value).encode("utf8"))
+            table[_subkey_name(subkey)] = [start, offset - start]
+
+    encoded_table = json_dumps(table).encode("utf8")
+    return b"".join(
+        [INDEXED_HEADER, _table_length.pack(len(encoded_table)), encoded_table] + chunks
+    )
+
+
+def decode_indexed(value, subkey=None, lazy=False):
+    """
+    Decode the payload stored under ``subkey``. Returns ``None`` if there is
+    no such subkey. If ``lazy`` is set, object payloads are returned as a
+    ``LazyNodeData`` that only decodes the keys that are accessed.
+    """
+    header_size = len(INDEXED_HEADER) + _table_length.size
+    (table_length,) = _table_length.unpack_from(value, len(INDEXED_HEADER))
+    body_start = header_size + table_length
+    table = json_loads(value[header_size:body_start])
+
+    entry = table.get(_subkey_name(subkey))
+    if entry is None:
+        return None
+
+    # Slicing a view does not copy the payload.
+    offset, length, *keys = entry
+    document = memoryview(value)[body_start + offset : body_start + offset + length]
+    if lazy and keys:
+        return LazyNodeData(document, keys[0])
+    return _loads(document)
+
+
+def _loads(view):
+    return json_loads(str(view, "utf8"))
+
+
+class LazyNodeData(MutableMapping):
+    """
+    A mapping over an object payload in the indexed format that decodes each
+    top-level value on first access. Values that are set or deleted are kept
+    in memory and shadow the encoded payload.
+    """
+
+    def __init__(self, document, offsets):
+        self._document = document
+        self._offsets = offsets
+        self._values = {}
+        self._deleted = set()
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        if key in self._deleted or key not in self._offsets:
+            raise KeyError(key)
+
+        offset, length = self._offsets[key]
+        value = self._values[key] = _loads(self._document[offset : offset + length])
+        return value
+
+    def __setitem__(self, key, value):
+        self._values[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._values.pop(key, None)
+        if key in self._offsets:
+            self._deleted.add(key)
+
+    def __contains__(self, key):
+        return key in self._values or (key in self._offsets and key not in self._deleted)
+
+    def __iter__(self):
+        for key in self._offsets:
+            if key not in self._deleted:
+                yield key
+        for key in self._values:
+            if key not in self._offsets:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: keys={list(self)!r}>"
+
+    def __reduce__(self):
+        # Views of the payload cannot be pickled.
+        return dict, (self.to_dict(),)
+
+    def copy(self):
+        return self.to_dict()
+
+    def to_dict(self):
+        """
+        Decode all remaining values and return a regular dictionary.
+        """
+        return {key: self[key] for key in self}
@@ -355,17 +355,47 @@ register("processing.release-archive-min-files", default=10)
 # Try to read release artifacts from zip archives
 register("processing.use-release-archives-sample-rate", default=0.0)  # unused
 
+# Number of threads used to fetch JavaScript sources and source maps. The
+# threads are shared by all events processed by a worker. A value of 1
+# fetches the sources of an event one after another.
+register("processing.javascript.fetch-concurrency", default=1)
+
 # All Relay options (statically authenticated Relays can be registered here)
 register("relay.static_auth", default={}, flags=FLAG_NOSTORE)
 
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=False)
 
+# Number of time windows the event data of a deleted group is split into, which
+# are deleted in parallel. 1 deletes the event data serially.
+register("deletions.group.event-data-shards", default=1)
+
 # Post process forwarder options
 # Gets data from Kafka headers
 register("post-process-forwarder:kafka-headers", default=False)
 # Number of threads to use for post processing
 register("post-process-forwarder:concurrency", default=1)
+# Publish the post process tasks of a batch in chunks, one chunk per thread,
+# with one broker connection per chunk
+register("post-process-forwarder:batch-dispatch", default=False)
+# Adjust the number of threads to the publish latency and the consumer lag, up
+# to `post-process-forwarder:concurrency` threads
+register("post-process-forwarder:adaptive-concurrency", default=False)
+# Mean time (in seconds) to publish a task above which the number of threads is reduced
+register("post-process-forwarder:adaptive-concurrency-target-latency", default=0.05)
+# Consumer lag (in seconds) above which the number of threads is increased
+register("post-process-forwarder:adaptive-concurrency-max-lag", default=5.0)
+
+# Wait for identical cached Snuba queries running in other processes instead
+# of querying Snuba again. Identical queries within a process always wait.
+register("snuba.query-cache.coalesce-across-processes", default=False)
+
+# How paginators count hits: "exact", "cached" (exact counts cached for a short
+# time) or "estimate" (Postgres planner estimates above the hits limit).
+register("api.paginator.count-hits-strategy", default="exact")
+
+# Run the independent Snuba queries of the group stream serializer concurrently.
+register("serializers.group-stream.concurrent-queries", default=False)
 
 # Subscription queries sampling rate
 register("subscriptions-query.sample-rate", default=0.01)
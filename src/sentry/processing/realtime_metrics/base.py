@@ -1,7 +1,7 @@
 import collections
 import dataclasses
 import enum
-from typing import ClassVar, DefaultDict, Iterable, List, Set, Union
+from typing import ClassVar, DefaultDict, Iterable, List, Mapping, Sequence, Set, Union
 
 from sentry.utils.services import Service
 
@@ -140,6 +140,8 @@ class RealtimeMetricsStore(Service):  # type: ignore
         "projects",
         "get_counts_for_project",
         "get_durations_for_project",
+        "get_counts_for_projects",
+        "get_durations_for_projects",
         "get_lpq_projects",
         "add_project_to_lpq",
         "remove_projects_from_lpq",
@@ -197,6 +199,30 @@ class RealtimeMetricsStore(Service):  # type: ignore
         """
         raise NotImplementedError
 
+    def get_counts_for_projects(
+        self, project_ids: Sequence[int], timestamp: int
+    ) -> Mapping[int, BucketedCounts]:
+        """
+        Returns the bucketed counts of `get_counts_for_project` for many projects at once, keyed
+        by project ID.
+        """
+        return {
+            project_id: self.get_counts_for_project(project_id, timestamp)
+            for project_id in project_ids
+        }
+
+    def get_durations_for_projects(
+        self, project_ids: Sequence[int], timestamp: int
+    ) -> Mapping[int, BucketedDurationsHistograms]:
+        """
+        Returns the bucketed histograms of `get_durations_for_project` for many projects at once,
+        keyed by project ID.
+        """
+        return {
+            project_id: self.get_durations_for_project(project_id, timestamp)
+            for project_id in project_ids
+        }
+
     def get_lpq_projects(self) -> Set[int]:
         """
         Fetches the list of projects that are currently using the low priority queue.
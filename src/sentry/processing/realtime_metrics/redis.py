@@ -1,6 +1,6 @@
 import logging
 from itertools import chain
-from typing import Iterable, Sequence, Set
+from typing import Iterable, Mapping, Sequence, Set
 
 from sentry.exceptions import InvalidConfiguration
 from sentry.utils import redis
@@ -154,6 +154,14 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
                 already_seen.add(project_id)
                 yield project_id
 
+    def _buckets(self, timestamp: int, bucket_size: int, time_window: int) -> range:
+        now_bucket = timestamp - timestamp % bucket_size
+
+        first_bucket = timestamp - time_window
+        first_bucket = first_bucket - first_bucket % bucket_size
+
+        return range(first_bucket, now_bucket + bucket_size, bucket_size)
+
     def get_counts_for_project(self, project_id: int, timestamp: int) -> base.BucketedCounts:
         """Returns a sorted list of bucketed timestamps paired with the count of symbolicator requests
         made during that time for some given project.
@@ -164,18 +172,39 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
         This may throw an exception if there is some sort of issue fetching counts from the redis
         store.
         """
-        bucket_size = self._counter_bucket_size
-        now_bucket = timestamp - timestamp % bucket_size
+        return self.get_counts_for_projects([project_id], timestamp)[project_id]
 
-        first_bucket = timestamp - self._counter_time_window
-        first_bucket = first_bucket - first_bucket % bucket_size
+    def get_counts_for_projects(
+        self, project_ids: Sequence[int], timestamp: int
+    ) -> Mapping[int, base.BucketedCounts]:
+        """Returns the bucketed counts of `get_counts_for_project` for many projects at once,
+        keyed by project ID. All counts are fetched in a single pipeline.
 
-        buckets = range(first_bucket, now_bucket + bucket_size, bucket_size)
-        keys = [f"{self._counter_key_prefix()}:{project_id}:{ts}" for ts in buckets]
-        counts = self.cluster.mget(keys)
-        return base.BucketedCounts(
-            timestamp=buckets[0], width=bucket_size, counts=[int(c) if c else 0 for c in counts]
-        )
+        This may throw an exception if there is some sort of issue fetching counts from the redis
+        store.
+        """
+        bucket_size = self._counter_bucket_size
+        buckets = self._buckets(timestamp, bucket_size, self._counter_time_window)
+
+        # The bucket keys of a project hash to different slots, and cluster pipelines don't
+        # support MGET, so every key is read with its own GET.
+        with self.cluster.pipeline(transaction=False) as pipeline:
+            for project_id in project_ids:
+                for ts in buckets:
+                    pipeline.get(f"{self._counter_key_prefix()}:{project_id}:{ts}")
+            results = pipeline.execute()
+
+        num_buckets = len(buckets)
+        return {
+            project_id: base.BucketedCounts(
+                timestamp=buckets[0],
+                width=bucket_size,
+                counts=[
+                    int(c) if c else 0 for c in results[i * num_buckets : (i + 1) * num_buckets]
+                ],
+            )
+            for i, project_id in enumerate(project_ids)
+        }
 
     def get_durations_for_project(
         self, project_id: int, timestamp: int
@@ -198,31 +227,42 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
         This may throw an exception if there is some sort of issue fetching durations from the redis
         store.
         """
-        bucket_size = self._duration_bucket_size
-        now_bucket = timestamp - timestamp % bucket_size
+        return self.get_durations_for_projects([project_id], timestamp)[project_id]
 
-        first_bucket = timestamp - self._duration_time_window
-        first_bucket = first_bucket - first_bucket % bucket_size
+    def get_durations_for_projects(
+        self, project_ids: Sequence[int], timestamp: int
+    ) -> Mapping[int, base.BucketedDurationsHistograms]:
+        """Returns the bucketed histograms of `get_durations_for_project` for many projects at
+        once, keyed by project ID. All histograms are fetched in a single pipeline.
 
-        buckets = range(first_bucket, now_bucket + bucket_size, bucket_size)
+        This may throw an exception if there is some sort of issue fetching durations from the redis
+        store.
+        """
+        bucket_size = self._duration_bucket_size
+        buckets = self._buckets(timestamp, bucket_size, self._duration_time_window)
 
-        with self.cluster.pipeline() as pipeline:
-            for ts in buckets:
-                pipeline.hgetall(f"{self._duration_key_prefix()}:{project_id}:{ts}")
-            histograms = pipeline.execute()
-
-        all_histograms = []
-        for ts, histogram_redis in zip(buckets, histograms):
-            histogram = base.DurationsHistogram(bucket_size=10)
-            for duration, count in histogram_redis.items():
-                histogram.incr(int(duration), int(count))
-            all_histograms.append(histogram)
-
-        return base.BucketedDurationsHistograms(
-            timestamp=first_bucket,
-            width=bucket_size,
-            histograms=all_histograms,
-        )
+        with self.cluster.pipeline(transaction=False) as pipeline:
+            for project_id in project_ids:
+                for ts in buckets:
+                    pipeline.hgetall(f"{self._duration_key_prefix()}:{project_id}:{ts}")
+            results = iter(pipeline.execute())
+
+        rv = {}
+        for project_id in project_ids:
+            all_histograms = []
+            for _ts, histogram_redis in zip(buckets, results):
+                histogram = base.DurationsHistogram(bucket_size=10)
+                for duration, count in histogram_redis.items():
+                    histogram.incr(int(duration), int(count))
+                all_histograms.append(histogram)
+
+            rv[project_id] = base.BucketedDurationsHistograms(
+                timestamp=buckets[0],
+                width=bucket_size,
+                histograms=all_histograms,
+            )
+
+        return rv
 
     def get_lpq_projects(self) -> Set[int]:
         """
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
-from typing import Any, List, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from django.utils.functional import cached_property
 from pytz import utc
 from sentry_sdk import Hub, capture_exception
 
@@ -16,7 +17,7 @@ from sentry.ingest.inbound_filters import (
     get_filter_key,
 )
 from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
-from sentry.models import Project, ProjectKeyStatus
+from sentry.models import Organization, Project, ProjectKey, ProjectKeyStatus, ProjectOption
 from sentry.relay.utils import to_camel_case_name
 from sentry.utils.http import get_origins
 from sentry.utils.sdk import configure_scope
@@ -27,12 +28,43 @@ EXPOSABLE_FEATURES = [
 ]
 
 
-def get_exposed_features(project: Project) -> List[str]:
+class _OrganizationContext:
+    """
+    Organization-level settings shared by the configs of all projects of an
+    organization. Every setting is computed once, on first use.
+    """
+
+    def __init__(self, organization: Organization) -> None:
+        self.organization = organization
+        self._features: Dict[str, bool] = {}
+
+    def has_feature(self, name: str) -> bool:
+        rv = self._features.get(name)
+        if rv is None:
+            rv = self._features[name] = features.has(name, self.organization)
+        return rv
+
+    @cached_property
+    def trusted_relays(self) -> List[str]:
+        return [
+            r["public_key"] for r in self.organization.get_option("sentry:trusted-relays", []) if r
+        ]
+
+    @cached_property
+    def event_retention(self) -> Optional[int]:
+        return quotas.get_event_retention(self.organization)
+
+
+def get_exposed_features(
+    project: Project, context: Optional[_OrganizationContext] = None
+) -> List[str]:
+    if context is None:
+        context = _OrganizationContext(project.organization)
 
     active_features = []
     for feature in EXPOSABLE_FEATURES:
         if feature.startswith("organizations:"):
-            if features.has(feature, project.organization):
+            if context.has_feature(feature):
                 active_features.append(feature)
 
         elif feature.startswith("projects:"):
@@ -122,6 +154,79 @@ def get_project_config(project, full_config=True, project_keys=None):
 
     :return: a ProjectConfig object for the given project
     """
+    return _get_project_config(
+        project, _OrganizationContext(project.organization), full_config, project_keys
+    )
+
+
+def get_project_configs(
+    projects: Sequence[Project],
+    project_keys: Mapping[int, Sequence[ProjectKey]],
+    full_config: bool = True,
+) -> Tuple[Dict[int, "ProjectConfig"], Dict[str, "ProjectConfig"]]:
+    """
+    Constructs the configs of many projects of the same organization at once.
+
+    Organization-level settings are computed only once and the options of all
+    projects are loaded in bulk. The config of every active project key is
+    derived from the config of its project, and is equal to the result of
+    ``get_project_config(project, project_keys=[key])``.
+
+    :param projects: Projects of a single organization.
+    :param project_keys: Pre-fetched project keys by project id.
+    :param full_config: See `get_project_config`.
+
+    :return: a tuple of the project configs by project id and the project
+        key configs by public key.
+    """
+    project_configs: Dict[int, ProjectConfig] = {}
+    key_configs: Dict[str, ProjectConfig] = {}
+    if not projects:
+        return project_configs, key_configs
+
+    organization = projects[0].organization
+    assert all(project.organization_id == organization.id for project in projects)
+    for project in projects:
+        # Share the organization instance, and with it its option cache.
+        project.organization = organization
+
+    ProjectOption.objects.get_all_values_bulk(projects)
+    context = _OrganizationContext(organization)
+
+    for project in projects:
+        keys = project_keys.get(project.id) or []
+        project_config = _get_project_config(project, context, full_config, keys)
+        project_configs[project.id] = project_config
+
+        for key in keys:
+            if key.status != ProjectKeyStatus.ACTIVE:
+                continue
+            key_configs[key.public_key] = _get_project_key_config(
+                project, project_config, key, full_config
+            )
+
+    return project_configs, key_configs
+
+
+def _get_project_key_config(project, project_config, project_key, full_config):
+    """
+    Derives the config that ``get_project_config`` returns for a single
+    project key from the config of its project.
+    """
+    cfg = project_config.to_dict()
+    if cfg.get("disabled"):
+        return ProjectConfig(project, **cfg)
+
+    cfg["publicKeys"] = [
+        key for key in cfg["publicKeys"] if key["publicKey"] == project_key.public_key
+    ]
+    if full_config:
+        cfg["config"] = dict(cfg["config"], quotas=get_quotas(project, keys=[project_key]))
+
+    return ProjectConfig(project, **cfg)
+
+
+def _get_project_config(project, context, full_config=True, project_keys=None):
     with configure_scope() as scope:
         scope.set_tag("project", project.id)
 
@@ -141,22 +246,15 @@ def get_project_config(project, full_config=True, project_keys=None):
             "publicKeys": public_keys,
             "config": {
                 "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
+                "trustedRelays": list(context.trusted_relays),
                 "piiConfig": get_pii_config(project),
                 "datascrubbingSettings": get_datascrubbing_settings(project),
-                "features": get_exposed_features(project),
+                "features": get_exposed_features(project, context),
             },
             "organizationId": project.organization_id,
             "projectId": project.id,  # XXX: Unused by Relay, required by Python store
         }
-    allow_dynamic_sampling = features.has(
-        "organizations:filters-and-sampling",
-        project.organization,
-    )
+    allow_dynamic_sampling = context.has_feature("organizations:filters-and-sampling")
     if allow_dynamic_sampling:
         dynamic_sampling = project.get_option("sentry:dynamic_sampling")
         if dynamic_sampling is not None:
@@ -166,9 +264,9 @@ def get_project_config(project, full_config=True, project_keys=None):
         # This is all we need for external Relay processors
         return ProjectConfig(project, **cfg)
 
-    if features.has("organizations:performance-ops-breakdown", project.organization):
+    if context.has_feature("organizations:performance-ops-breakdown"):
         cfg["config"]["breakdownsV2"] = project.get_option("sentry:breakdowns")
-    if features.has("organizations:transaction-metrics-extraction", project.organization):
+    if context.has_feature("organizations:transaction-metrics-extraction"):
         cfg["config"]["transactionMetrics"] = get_transaction_metrics_settings(
             project, cfg["config"].get("breakdownsV2")
         )
@@ -179,7 +277,7 @@ def get_project_config(project, full_config=True, project_keys=None):
     with Hub.current.start_span(op="get_grouping_config_dict_for_project"):
         cfg["config"]["groupingConfig"] = get_grouping_config_dict_for_project(project)
     with Hub.current.start_span(op="get_event_retention"):
-        cfg["config"]["eventRetention"] = quotas.get_event_retention(project.organization)
+        cfg["config"]["eventRetention"] = context.event_retention
     with Hub.current.start_span(op="get_all_quotas"):
         cfg["config"]["quotas"] = get_quotas(project, keys=project_keys)
 
@@ -35,6 +35,8 @@ comparison_types = {
     COMPARISON_TYPE_COUNT: COMPARISON_TYPE_COUNT,
     COMPARISON_TYPE_PERCENT: COMPARISON_TYPE_PERCENT,
 }
+# How long frequency query results are shared between events of the same group.
+QUERY_BATCH_CACHE_TTL = 10
 
 
 class EventFrequencyForm(forms.Form):
@@ -84,6 +86,7 @@ class BaseEventFrequencyCondition(EventCondition):
 
     def __init__(self, *args, **kwargs):
         self.tsdb = kwargs.pop("tsdb", tsdb)
+        self.query_batch = kwargs.pop("query_batch", None)
         self.form_fields = {
             "value": {"type": "number", "placeholder": 100},
             "interval": {
@@ -128,19 +131,42 @@ class BaseEventFrequencyCondition(EventCondition):
         """ """
         raise NotImplementedError  # subclass must implement
 
+    def get_query_windows(self):
+        """
+        Returns the ``(duration, offset)`` windows, relative to now, that
+        ``get_rate`` queries.
+        """
+        interval = self.get_option("interval")
+        if interval not in self.intervals:
+            return []
+
+        _, duration = self.intervals[interval]
+        windows = [(duration, timedelta())]
+        if self.get_option("comparisonType", COMPARISON_TYPE_COUNT) == COMPARISON_TYPE_PERCENT:
+            comparison_interval = comparison_intervals.get(self.get_option("comparisonInterval"))
+            if comparison_interval is not None:
+                windows.append((duration, comparison_interval[1]))
+        return windows
+
+    def query_window(self, event, end, duration, offset, environment_id):
+        if self.query_batch is not None:
+            return self.query_batch.query(self, duration, offset, environment_id)
+
+        window_end = end - offset
+        return self.query(event, window_end - duration, window_end, environment_id=environment_id)
+
     def get_rate(self, event, interval, environment_id):
         _, duration = self.intervals[interval]
-        end = timezone.now()
-        result = self.query(event, end - duration, end, environment_id=environment_id)
+        end = self.query_batch.now if self.query_batch is not None else timezone.now()
+        result = self.query_window(event, end, duration, timedelta(), environment_id)
         comparison_type = self.get_option("comparisonType", COMPARISON_TYPE_COUNT)
         if comparison_type == COMPARISON_TYPE_PERCENT:
             comparison_interval = comparison_intervals[self.get_option("comparisonInterval")][1]
-            comparison_end = end - comparison_interval
-            # TODO: Figure out if there's a way we can do this less frequently. All queries are
-            # automatically cached for 10s. We could consider trying to cache this and the main
-            # query for 20s to reduce the load.
-            comparison_result = self.query(
-                event, comparison_end - duration, comparison_end, environment_id=environment_id
+            # When evaluated by the `RuleProcessor`, this query is shared
+            # with all other conditions of the event and cached per group,
+            # see `EventFrequencyQueryBatch`.
+            comparison_result = self.query_window(
+                event, end, duration, comparison_interval, environment_id
             )
             result = (
                 int(max(0, ((result / comparison_result) * 100) - 100))
@@ -294,3 +320,63 @@ class EventFrequencyPercentCondition(BaseEventFrequencyCondition):
             return 100 * round(issue_count / avg_sessions_in_interval, 4)
 
         return 0
+
+
+class EventFrequencyQueryBatch:
+    """
+    Shares the queries of all event frequency conditions that are evaluated
+    for an event.
+
+    Conditions of the same type that query the same window and environment
+    share a single query. All windows are relative to the same point in time,
+    and results are cached per group for ``cache_ttl`` seconds, so that
+    events of the same group arriving in quick succession don't repeat them.
+    """
+
+    def __init__(self, event, cache_ttl=QUERY_BATCH_CACHE_TTL):
+        self.event = event
+        self.cache_ttl = cache_ttl
+        self.now = timezone.now()
+        self._results = {}
+
+    def _get_key(self, condition, duration, offset, environment_id):
+        return "r.c.efq:{}:{}:{}:{}:{}".format(
+            type(condition).__name__,
+            self.event.group_id,
+            environment_id,
+            int(duration.total_seconds()),
+            int(offset.total_seconds()),
+        )
+
+    def prefetch(self, conditions):
+        """
+        Loads cached results for all windows the given conditions query with
+        a single cache lookup.
+        """
+        keys = {
+            self._get_key(condition, duration, offset, condition.rule.environment_id)
+            for condition in conditions
+            for duration, offset in condition.get_query_windows()
+        }
+        keys.difference_update(self._results)
+        if not keys:
+            return
+
+        cached = cache.get_many(keys)
+        self._results.update(cached)
+        metrics.incr("rules.conditions.query_batch.cache_hit", amount=len(cached))
+        metrics.incr("rules.conditions.query_batch.cache_miss", amount=len(keys) - len(cached))
+
+    def query(self, condition, duration, offset, environment_id):
+        key = self._get_key(condition, duration, offset, environment_id)
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+
+        end = self.now - offset
+        result = self._results[key] = condition.query(
+            self.event, end - duration, end, environment_id=environment_id
+        )
+        cache.set(key, result, self.cache_ttl)
+        return result
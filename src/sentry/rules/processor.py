@@ -10,6 +10,10 @@ from django.utils import timezone
 from sentry import analytics
 from sentry.models import GroupRuleStatus, Rule
 from sentry.rules import EventState, rules
+from sentry.rules.conditions.event_frequency import (
+    BaseEventFrequencyCondition,
+    EventFrequencyQueryBatch,
+)
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import safe_execute
 
@@ -31,6 +35,7 @@ class RuleProcessor:
         self.has_reappeared = has_reappeared
 
         self.grouped_futures = {}
+        self.frequency_query_batch = None
 
     def get_rules(self):
         """
@@ -107,9 +112,39 @@ class RuleProcessor:
             self.logger.warning("Unregistered condition %r", condition["id"])
             return
 
-        condition_inst = condition_cls(self.project, data=condition, rule=rule)
+        condition_inst = self.get_condition_instance(condition_cls, condition, rule)
         return safe_execute(condition_inst.passes, self.event, state, _with_transaction=False)
 
+    def get_condition_instance(self, condition_cls, condition, rule):
+        if self.frequency_query_batch is not None and issubclass(
+            condition_cls, BaseEventFrequencyCondition
+        ):
+            return condition_cls(
+                self.project,
+                data=condition,
+                rule=rule,
+                query_batch=self.frequency_query_batch,
+            )
+        return condition_cls(self.project, data=condition, rule=rule)
+
+    def prefetch_frequency_queries(self, rule_list: Sequence[Rule]) -> None:
+        """
+        Collects the event frequency conditions of all rules, so that their
+        queries can be shared and cached results are loaded at once.
+        """
+        self.frequency_query_batch = EventFrequencyQueryBatch(self.event)
+        conditions = []
+        for rule in rule_list:
+            for condition in rule.data.get("conditions", ()):
+                condition_cls = rules.get(condition["id"])
+                if condition_cls is not None and issubclass(
+                    condition_cls, BaseEventFrequencyCondition
+                ):
+                    conditions.append(self.get_condition_instance(condition_cls, condition, rule))
+
+        if conditions:
+            safe_execute(self.frequency_query_batch.prefetch, conditions, _with_transaction=False)
+
     def get_rule_type(self, condition):
         rule_cls = rules.get(condition["id"])
         if rule_cls is None:
@@ -241,6 +276,7 @@ class RuleProcessor:
         self.grouped_futures.clear()
         rules = self.get_rules()
         rule_statuses = self.bulk_get_rule_status(rules)
+        self.prefetch_frequency_queries(rules)
         for rule in rules:
             self.apply_rule(rule, rule_statuses[rule.id])
         return self.grouped_futures.values()
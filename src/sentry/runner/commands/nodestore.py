@@ -0,0 +1,104 @@
+import os
+from collections import defaultdict
+from datetime import timedelta
+
+import click
+
+from sentry.runner.decorators import configuration
+
+
+@click.group()
+def nodestore():
+    """Tools for interacting with nodestore."""
+
+
+@nodestore.command("train-dictionaries")
+@click.option(
+    "--project",
+    "project_ids",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Project to sample events from. Can be passed multiple times.",
+)
+@click.option("--days", default=1, show_default=True, help="Sample events from the last N days.")
+@click.option(
+    "--samples", default=5000, show_default=True, help="Maximum number of events to sample."
+)
+@click.option(
+    "--min-samples",
+    default=100,
+    show_default=True,
+    help="Minimum number of sampled events required to train a dictionary for a platform.",
+)
+@click.option("--size", default=112640, show_default=True, help="Maximum dictionary size in bytes.")
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    help="Directory to write dictionaries to. Defaults to SENTRY_NODESTORE_COMPRESSION_DICTIONARIES.",
+)
+@configuration
+def train_dictionaries(project_ids, days, samples, min_samples, size, output):
+    """
+    Train zstd dictionaries for nodestore compression.
+
+    Samples stored events, groups them by platform and trains one dictionary
+    per platform plus a "default" dictionary over all samples. Existing
+    dictionaries are never overwritten, since stored payloads may depend on
+    them.
+    """
+    from django.conf import settings
+    from django.utils import timezone
+
+    from sentry import eventstore, nodestore
+    from sentry.eventstore.models import Event
+    from sentry.nodestore.compression import DEFAULT_DICTIONARY, DICTIONARY_SUFFIX, train_dictionary
+    from sentry.utils import json
+    from sentry.utils.iterators import chunked
+
+    output = output or settings.SENTRY_NODESTORE_COMPRESSION_DICTIONARIES
+    if not output:
+        raise click.ClickException(
+            "Need to specify --output or set SENTRY_NODESTORE_COMPRESSION_DICTIONARIES"
+        )
+    os.makedirs(output, exist_ok=True)
+
+    end = timezone.now()
+    events = eventstore.get_unfetched_events(
+        snuba_filter=eventstore.Filter(
+            project_ids=list(project_ids), start=end - timedelta(days=days), end=end
+        ),
+        limit=samples,
+        referrer="runner.nodestore.train_dictionaries",
+    )
+    node_ids = [Event.generate_node_id(event.project_id, event.event_id) for event in events]
+
+    samples_by_platform = defaultdict(list)
+    with click.progressbar(length=len(node_ids), label="Sampling nodestore") as bar:
+        for chunk in chunked(node_ids, 100):
+            for payload in nodestore._get_bytes_multi(chunk).values():
+                payload = nodestore._decompress(payload)
+                if not payload or not payload.startswith(b"{"):
+                    continue
+                platform = json.loads(payload.split(b"\n", 1)[0]).get("platform") or "other"
+                samples_by_platform[platform].append(payload)
+            bar.update(len(chunk))
+
+    samples_by_platform[DEFAULT_DICTIONARY] = [
+        payload for payloads in samples_by_platform.values() for payload in payloads
+    ]
+
+    for platform, payloads in sorted(samples_by_platform.items()):
+        path = os.path.join(output, f"{platform}{DICTIONARY_SUFFIX}")
+        if len(payloads) < min_samples:
+            click.echo(f"Skipping {platform}: only {len(payloads)} samples")
+            continue
+        if os.path.exists(path):
+            click.echo(f"Skipping {platform}: {path} already exists")
+            continue
+
+        dictionary = train_dictionary(payloads, size)
+        with open(path, "wb") as f:
+            f.write(dictionary)
+        click.echo(f"Trained {platform} from {len(payloads)} samples: {path}")
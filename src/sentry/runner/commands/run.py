@@ -385,6 +385,12 @@ def post_process_forwarder(**options):
     type=click.Choice(["earliest", "latest"]),
     help="Force subscriptions to start from a particular offset",
 )
+@click.option(
+    "--processing-batch-size",
+    default=1,
+    type=int,
+    help="How many messages to consume and process together. Subscription handlers can prepare data for a whole batch at once.",
+)
 @log_options()
 @configuration
 def query_subscription_consumer(**options):
@@ -397,6 +403,7 @@ def query_subscription_consumer(**options):
         commit_batch_timeout_ms=options["commit_batch_timeout_ms"],
         initial_offset_reset=options["initial_offset_reset"],
         force_offset_reset=options["force_offset_reset"],
+        processing_batch_size=options["processing_batch_size"],
     )
 
     def handler(signum, frame):
@@ -492,6 +499,12 @@ def batching_kafka_options(group):
     default=None,
     help="Thread pool size (only utilitized for message types that support concurrent processing)",
 )
+@click.option(
+    "--processes",
+    type=int,
+    default=None,
+    help="Process pool size. Batches are sharded by project and processed on multiple cores.",
+)
 @configuration
 def ingest_consumer(consumer_types, all_consumer_types, **options):
     """
@@ -515,6 +528,8 @@ def ingest_consumer(consumer_types, all_consumer_types, **options):
         raise click.ClickException("Need to specify --all-consumer-types or --consumer-type")
 
     concurrency = options.pop("concurrency", None)
+    if concurrency is not None and options.get("processes") is not None:
+        raise click.ClickException("Cannot specify --concurrency and --processes at the same time")
     if concurrency is not None:
         executor = ThreadPoolExecutor(concurrency)
     else:
@@ -0,0 +1,14 @@
+-- Atomically drains a batch of buffer hashes that live on the same host.
+-- KEYS: (buffer key, pending key) pairs
+-- Returns the ``HGETALL`` reply of every buffer key, in order.
+local results = {}
+
+for i = 1, #KEYS, 2 do
+    local key = KEYS[i]
+    local pending_key = KEYS[i + 1]
+    results[#results + 1] = redis.call('HGETALL', key)
+    redis.call('ZREM', pending_key, key)
+    redis.call('DEL', key)
+end
+
+return results
@@ -0,0 +1,42 @@
+-- Reads counters from a batch of hashes that live on the same host, summing
+-- the values of a field across all hashes that belong to the same bucket.
+-- KEYS: counter hash keys
+-- ARGV: for every hash key, the bucket it belongs to, the number of fields to
+-- read from it, followed by the fields
+-- Returns a flat list of (bucket, field, total) triples for all fields that
+-- have a value in at least one hash of the bucket.
+local buckets = {}
+local totals = {}
+local cursor = 1
+
+for _, key in ipairs(KEYS) do
+    local bucket = ARGV[cursor]
+    local count = tonumber(ARGV[cursor + 1])
+    local fields = {unpack(ARGV, cursor + 2, cursor + 1 + count)}
+    cursor = cursor + 2 + count
+
+    local bucket_totals = totals[bucket]
+    if bucket_totals == nil then
+        bucket_totals = {}
+        totals[bucket] = bucket_totals
+        buckets[#buckets + 1] = bucket
+    end
+
+    local values = redis.call('HMGET', key, unpack(fields))
+    for i, value in ipairs(values) do
+        if value then
+            bucket_totals[fields[i]] = (bucket_totals[fields[i]] or 0) + tonumber(value)
+        end
+    end
+end
+
+local results = {}
+for _, bucket in ipairs(buckets) do
+    for field, total in pairs(totals[bucket]) do
+        results[#results + 1] = bucket
+        results[#results + 1] = field
+        results[#results + 1] = total
+    end
+end
+
+return results
@@ -36,27 +36,38 @@ class MetricsIndexerWorker(AbstractBatchWorker):  # type: ignore
 
     def process_message(self, message: Any) -> MutableMapping[str, Any]:
         parsed_message: MutableMapping[str, Any] = json.loads(message.value(), use_rapid_json=True)
+        parsed_message.setdefault("tags", {})
+        return parsed_message
 
-        metric_name = parsed_message["name"]
-        tags = parsed_message.get("tags", {})
-
-        strings = {
-            metric_name,
-            *tags.keys(),
-            *tags.values(),
-        }
+    def _resolve_batch(
+        self, batch: Sequence[MutableMapping[str, Any]]
+    ) -> Sequence[MutableMapping[str, Any]]:
+        """
+        Translate metric names and tags of all messages in the batch with a
+        single, deduplicated ``bulk_record`` call.
+        """
+        strings = set()
+        for message in batch:
+            strings.add(message["name"])
+            strings.update(message["tags"].keys())
+            strings.update(message["tags"].values())
 
+        metrics.timing("metrics_consumer.bulk_record.strings", len(strings))
         with metrics.timer("metrics_consumer.bulk_record"):
             mapping = indexer.bulk_record(list(strings))  # type: ignore
 
-        new_tags = {mapping[k]: mapping[v] for k, v in tags.items()}
-
-        parsed_message["tags"] = new_tags
-        parsed_message["metric_id"] = mapping[metric_name]
-        parsed_message["retention_days"] = 90
-        return parsed_message
+        translated = []
+        for message in batch:
+            new_message = dict(message)
+            new_message["tags"] = {mapping[k]: mapping[v] for k, v in message["tags"].items()}
+            new_message["metric_id"] = mapping[message["name"]]
+            new_message["retention_days"] = 90
+            translated.append(new_message)
+        return translated
 
     def flush_batch(self, batch: Sequence[MutableMapping[str, Any]]) -> None:
+        batch = self._resolve_batch(batch)
+
         # produce the translated message to snuba-metrics topic
         for message in batch:
             self.__producer.produce(
@@ -1,6 +1,8 @@
 from typing import Any, List, Mapping, MutableMapping, Optional, Sequence, Set
 
 from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer
+from sentry.utils import metrics
+from sentry.utils.lru import LRUCache
 from sentry.utils.services import Service
 
 
@@ -8,10 +10,19 @@ class PGStringIndexer(Service):  # type: ignore
     """
     Provides integer IDs for metric names, tag keys and tag values
     and the corresponding reverse lookup.
+
+    ``bulk_record`` keeps a bounded in-process cache of string to ID mappings
+    in front of the shared cache. The mapping of a string never changes once
+    it has been created, so entries never need to be invalidated.
     """
 
     __all__ = ("record", "resolve", "reverse_resolve", "bulk_record")
 
+    def __init__(self, local_cache_size: int = 100000) -> None:
+        self._local_cache: Optional[LRUCache[str, int]] = (
+            LRUCache(local_cache_size) if local_cache_size else None
+        )
+
     def _bulk_record(self, unmapped_strings: Set[str]) -> Any:
         records = [MetricsKeyIndexer(string=string) for string in unmapped_strings]
         # We use `ignore_conflicts=True` here to avoid race conditions where metric indexer
@@ -26,19 +37,37 @@ class PGStringIndexer(Service):  # type: ignore
         return MetricsKeyIndexer.objects.get_many_from_cache(list(unmapped_strings), key="string")
 
     def bulk_record(self, strings: List[str]) -> Mapping[str, int]:
+        mapped_result: MutableMapping[str, int] = {}
+        if self._local_cache is not None:
+            mapped_result.update(self._local_cache.get_many(strings))
+            unique_strings = set(strings)
+            metrics.incr("sentry_metrics.indexer.local_cache.hit", amount=len(mapped_result))
+            metrics.incr(
+                "sentry_metrics.indexer.local_cache.miss",
+                amount=len(unique_strings) - len(mapped_result),
+            )
+            strings = list(unique_strings.difference(mapped_result.keys()))
+
+        if not strings:
+            return mapped_result
 
         cache_results: Sequence[Any] = MetricsKeyIndexer.objects.get_many_from_cache(
             strings, key="string"
         )
 
-        mapped_result: MutableMapping[str, int] = {r.string: r.id for r in cache_results}
+        fetched: MutableMapping[str, int] = {r.string: r.id for r in cache_results}
+
+        unmapped = set(strings).difference(fetched.keys())
+        if unmapped:
+            new_mapped = self._bulk_record(unmapped)
 
-        unmapped = set(strings).difference(mapped_result.keys())
-        new_mapped = self._bulk_record(unmapped)
+            for new in new_mapped:
+                fetched[new.string] = new.id
 
-        for new in new_mapped:
-            mapped_result[new.string] = new.id
+        if self._local_cache is not None:
+            self._local_cache.set_many(fetched)
 
+        mapped_result.update(fetched)
         return mapped_result
 
     def record(self, string: str) -> int:
@@ -16,7 +16,7 @@ from sentry.similarity.features import (
     get_application_chunks,
 )
 from sentry.similarity.featuresv2 import GroupingBasedFeatureSet
-from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.similarity.signatures import get_signature_builder
 from sentry.utils import redis
 from sentry.utils.compat import map
 from sentry.utils.datastructures import BidirectionalMapping
@@ -72,7 +72,7 @@ def _make_index_backend(cluster, namespace="sim:1"):
 
     return MetricsWrapper(
         RedisScriptMinHashIndexBackend(
-            cluster, namespace, MinHashSignatureBuilder(16, 0xFFFF), 8, 60 * 60 * 24 * 30, 3, 5000
+            cluster, namespace, get_signature_builder(16, 0xFFFF), 8, 60 * 60 * 24 * 30, 3, 5000
         ),
         scope_tag_name=None,
     )
@@ -32,12 +32,19 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
         self.retention = retention
         self.candidate_set_limit = candidate_set_limit
 
-    def _build_signature_arguments(self, features):
-        if not features:
+    def _build_signatures(self, feature_sets):
+        # Sign all non-empty feature sets in one batch.
+        signatures = iter(
+            self.signature_builder.sign_many([features for features in feature_sets if features])
+        )
+        return [next(signatures) if features else None for features in feature_sets]
+
+    def _build_signature_arguments(self, signature):
+        if signature is None:
             return [0] * self.bands
 
         arguments = []
-        for bucket in band(self.bands, self.signature_builder(features)):
+        for bucket in band(self.bands, signature):
             arguments.extend([1, ",".join(map("{}".format, bucket)), 1])
         return arguments
 
@@ -90,9 +97,10 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             limit if limit is not None else -1,
         ]
 
-        for idx, threshold, features in items:
+        signatures = self._build_signatures([features for _, _, features in items])
+        for (idx, threshold, _), signature in zip(items, signatures):
             arguments.extend([idx, threshold])
-            arguments.extend(self._build_signature_arguments(features))
+            arguments.extend(self._build_signature_arguments(signature))
 
         return self._as_search_result(self.__index(scope, arguments))
 
@@ -137,9 +145,10 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             key,
         ]
 
-        for idx, features in items:
+        signatures = self._build_signatures([features for _, features in items])
+        for (idx, _), signature in zip(items, signatures):
             arguments.append(idx)
-            arguments.extend(self._build_signature_arguments(features))
+            arguments.extend(self._build_signature_arguments(signature))
 
         return self.__index(scope, arguments)
 
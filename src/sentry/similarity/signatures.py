@@ -1,4 +1,5 @@
 import mmh3
+import numpy as np
 
 from sentry.utils.compat import map
 
@@ -15,3 +16,97 @@ class MinHashSignatureBuilder:
             ),
             range(self.columns),
         )
+
+    def sign_many(self, feature_sets):
+        """
+        Returns the signatures of multiple feature sets.
+        """
+        return [self(features) for features in feature_sets]
+
+
+# Constants of the 32-bit x86 variant of MurmurHash3, as used by ``mmh3.hash``.
+_C1 = 0xCC9E2D51
+_C2 = 0x1B873593
+
+
+def _rotl32(x, r):
+    return (x << np.uint32(r)) | (x >> np.uint32(32 - r))
+
+
+class NumpyMinHashSignatureBuilder(MinHashSignatureBuilder):
+    """
+    Builds the same signatures as ``MinHashSignatureBuilder``, but computes
+    MurmurHash3 for all features and columns at once with NumPy.
+
+    The per-column hashes use the column as the seed. Since the seed only
+    enters the hash state, the mixed input blocks are computed once per
+    feature and shared by all columns.
+    """
+
+    def __init__(self, columns, rows):
+        super().__init__(columns, rows)
+        self._seeds = np.arange(columns, dtype=np.uint32)
+
+    def __call__(self, features):
+        return self.sign_many([features])[0]
+
+    def sign_many(self, feature_sets):
+        encoded = []
+        offsets = []
+        for features in feature_sets:
+            offsets.append(len(encoded))
+            encoded.extend(
+                feature.encode("utf8") if isinstance(feature, str) else feature
+                for feature in features
+            )
+            if len(encoded) == offsets[-1]:
+                raise ValueError("cannot sign an empty feature set")
+
+        if not offsets:
+            return []
+
+        values = self._hash(encoded).view(np.int32).astype(np.int64) % self.rows
+        signatures = np.minimum.reduceat(values, offsets, axis=0)
+        return [[int(value) for value in signature] for signature in signatures]
+
+    def _hash(self, features):
+        """
+        Returns a ``(features, columns)`` array of ``mmh3.hash(feature, column)``
+        as unsigned integers.
+        """
+        lengths = np.array([len(feature) for feature in features], dtype=np.int64)
+        num_blocks = lengths // 4
+
+        # Pad every feature with at least one zero block, so that the (zero
+        # padded) tail of each feature is a block of its own.
+        width = (int(lengths.max()) // 4 + 1) * 4
+        padded = b"".join(feature.ljust(width, b"\x00") for feature in features)
+        blocks = np.frombuffer(padded, dtype="<u4").reshape(len(features), width // 4)
+        blocks = blocks.astype(np.uint32)
+
+        blocks *= np.uint32(_C1)
+        blocks = _rotl32(blocks, 15)
+        blocks *= np.uint32(_C2)
+
+        h = np.broadcast_to(self._seeds, (len(features), self.columns)).copy()
+        for idx in range(int(num_blocks.max())):
+            mixed = _rotl32(h ^ blocks[:, idx, None], 13) * np.uint32(5) + np.uint32(0xE6546B64)
+            h = np.where((idx < num_blocks)[:, None], mixed, h)
+
+        tails = blocks[np.arange(len(features)), num_blocks]
+        h ^= np.where(lengths % 4 > 0, tails, np.uint32(0))[:, None]
+
+        h ^= lengths.astype(np.uint32)[:, None]
+        h ^= h >> np.uint32(16)
+        h *= np.uint32(0x85EBCA6B)
+        h ^= h >> np.uint32(13)
+        h *= np.uint32(0xC2B2AE35)
+        h ^= h >> np.uint32(16)
+        return h
+
+
+def get_signature_builder(columns, rows):
+    """
+    Returns the builder of MinHash signatures used for similarity features.
+    """
+    return NumpyMinHashSignatureBuilder(columns, rows)
@@ -1,8 +1,9 @@
 import logging
 import re
 import time
+from collections import defaultdict
 from random import random
-from typing import Any, Callable, Dict, Iterable, List, Optional, cast
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, cast
 
 import jsonschema
 import pytz
@@ -23,8 +24,12 @@ from sentry.utils.batching_kafka_consumer import wait_for_topics
 logger = logging.getLogger(__name__)
 
 TQuerySubscriptionCallable = Callable[[Dict[str, Any], QuerySubscription], None]
+TQuerySubscriptionUpdate = Tuple[Dict[str, Any], QuerySubscription]
+TQuerySubscriptionBatchCallable = Callable[[List[TQuerySubscriptionUpdate]], None]
 
 subscriber_registry: Dict[str, TQuerySubscriptionCallable] = {}
+batch_preparer_registry: Dict[str, TQuerySubscriptionBatchCallable] = {}
+batch_subscriber_registry: Dict[str, TQuerySubscriptionBatchCallable] = {}
 
 
 def register_subscriber(
@@ -39,6 +44,43 @@ def register_subscriber(
     return inner
 
 
+def register_batch_preparer(
+    subscriber_key: str,
+) -> Callable[[TQuerySubscriptionBatchCallable], TQuerySubscriptionBatchCallable]:
+    """
+    Registers a function that is called with all (update, subscription) pairs of a
+    batch of messages for a subscription type, before the updates are passed to the
+    subscriber one at a time. This allows preparing data for the whole batch at once.
+    """
+
+    def inner(func: TQuerySubscriptionBatchCallable) -> TQuerySubscriptionBatchCallable:
+        if subscriber_key in batch_preparer_registry:
+            raise Exception("Batch preparer already registered for %s" % subscriber_key)
+        batch_preparer_registry[subscriber_key] = func
+        return func
+
+    return inner
+
+
+def register_batch_subscriber(
+    subscriber_key: str,
+) -> Callable[[TQuerySubscriptionBatchCallable], TQuerySubscriptionBatchCallable]:
+    """
+    Registers a function that handles all (update, subscription) pairs of a batch of
+    messages for a subscription type at once. In batch mode, it is called instead of
+    passing the updates to the subscriber one at a time. The subscriber registered with
+    `register_subscriber` is still required, and handles updates outside of batch mode.
+    """
+
+    def inner(func: TQuerySubscriptionBatchCallable) -> TQuerySubscriptionBatchCallable:
+        if subscriber_key in batch_subscriber_registry:
+            raise Exception("Batch subscriber already registered for %s" % subscriber_key)
+        batch_subscriber_registry[subscriber_key] = func
+        return func
+
+    return inner
+
+
 class InvalidMessageError(Exception):
     pass
 
@@ -52,6 +94,9 @@ class QuerySubscriptionConsumer:
     A Kafka consumer that processes query subscription update messages. Each message has
     a related subscription id and the latest values related to the subscribed query.
     These values are passed along to a callback associated with the subscription.
+
+    When `processing_batch_size` is greater than 1, messages are consumed and handled
+    in batches of up to that size, see `handle_messages`.
     """
 
     topic_to_dataset: Dict[str, QueryDatasets] = {
@@ -69,6 +114,7 @@ class QuerySubscriptionConsumer:
         commit_batch_timeout_ms: int = 5000,
         initial_offset_reset: str = "earliest",
         force_offset_reset: Optional[str] = None,
+        processing_batch_size: int = 1,
     ):
         self.group_id = group_id
         if not topic:
@@ -78,6 +124,7 @@ class QuerySubscriptionConsumer:
         self.topic = topic
         cluster_name: str = settings.KAFKA_TOPICS[topic]["cluster"]
         self.commit_batch_size = commit_batch_size
+        self.processing_batch_size = processing_batch_size
 
         # Adding time based commit behaviour
         self.commit_batch_timeout_ms: int = commit_batch_timeout_ms
@@ -173,27 +220,40 @@ class QuerySubscriptionConsumer:
 
         i = 0
         while not self.__shutdown_requested:
-            message = self.consumer.poll(0.1)
-            if message is None:
+            if self.processing_batch_size > 1:
+                messages = self.consumer.consume(self.processing_batch_size, 0.1)
+            else:
+                message = self.consumer.poll(0.1)
+                messages = [message] if message is not None else []
+            if not messages:
                 continue
 
-            error = message.error()
-            if error is not None:
-                raise KafkaException(error)
-
-            i = i + 1
-
-            with sentry_sdk.start_transaction(
-                op="handle_message",
-                name="query_subscription_consumer_process_message",
-                sampled=random() <= options.get("subscriptions-query.sample-rate"),
-            ), metrics.timer("snuba_query_subscriber.handle_message"):
-                self.handle_message(message)
+            for message in messages:
+                error = message.error()
+                if error is not None:
+                    raise KafkaException(error)
+
+            if self.processing_batch_size > 1:
+                with sentry_sdk.start_transaction(
+                    op="handle_messages",
+                    name="query_subscription_consumer_process_messages",
+                    sampled=random() <= options.get("subscriptions-query.sample-rate"),
+                ), metrics.timer("snuba_query_subscriber.handle_messages"):
+                    self.handle_messages(messages)
+            else:
+                with sentry_sdk.start_transaction(
+                    op="handle_message",
+                    name="query_subscription_consumer_process_message",
+                    sampled=random() <= options.get("subscriptions-query.sample-rate"),
+                ), metrics.timer("snuba_query_subscriber.handle_message"):
+                    self.handle_message(messages[0])
 
             # Track latest completed message here, for use in `shutdown` handler.
-            self.offsets[message.partition()] = message.offset() + 1
+            for message in messages:
+                self.offsets[message.partition()] = message.offset() + 1
 
-            batch_by_size: bool = i % self.commit_batch_size == 0
+            previous_i, i = i, i + len(messages)
+            batch_by_size: bool = i // self.commit_batch_size > previous_i // self.commit_batch_size
             batch_by_time: bool = (
                 self.__batch_deadline is not None and time.time() > self.__batch_deadline
             )
@@ -241,101 +301,216 @@ class QuerySubscriptionConsumer:
         :param message:
         :return:
         """
-        # set a commit time deadline only after the first message for this batch is seen
-        if not self.__batch_deadline:
-            self.__batch_deadline = self.commit_batch_timeout_ms / 1000.0 + time.time()
+        self._start_batch()
 
-        with sentry_sdk.push_scope() as scope:
-            try:
-                with metrics.timer("snuba_query_subscriber.parse_message_value"):
-                    contents = self.parse_message_value(message.value())
-            except InvalidMessageError:
-                # If the message is in an invalid format, just log the error
-                # and continue
-                logger.exception(
-                    "Subscription update could not be parsed",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
+        with sentry_sdk.push_scope():
+            update = self._get_subscription_update(message)
+            if update is not None:
+                self._handle_subscription_update(message, *update)
+
+    def handle_messages(self, messages: List[Message]) -> None:
+        """
+        Handles a batch of messages. The subscriptions of all messages are fetched at
+        once. The updates of each subscription type are passed to the batch preparer
+        registered for the type (if any), and then to the batch subscriber registered
+        for the type, or to the callbacks of their subscriptions one at a time, like in
+        `handle_message`.
+        :param messages:
+        :return:
+        """
+        self._start_batch()
+
+        parsed_messages: List[Tuple[Message, Dict[str, Any]]] = []
+        for message in messages:
+            with sentry_sdk.push_scope():
+                contents = self._parse_message(message)
+            if contents is not None:
+                parsed_messages.append((message, contents))
+
+        with metrics.timer("snuba_query_subscriber.fetch_subscriptions"):
+            subscriptions = {
+                subscription.subscription_id: subscription
+                for subscription in QuerySubscription.objects.filter(
+                    subscription_id__in={
+                        contents["subscription_id"] for _, contents in parsed_messages
+                    }
+                ).select_related("snuba_query", "project__organization")
+            }
+
+        updates: List[Tuple[Message, Dict[str, Any], QuerySubscription]] = []
+        for message, contents in parsed_messages:
+            with sentry_sdk.push_scope():
+                subscription = self._check_subscription(
+                    message, contents, subscriptions.get(contents["subscription_id"])
                 )
-                return
-            scope.set_tag("query_subscription_id", contents["subscription_id"])
+            if subscription is not None:
+                updates.append((message, contents, subscription))
 
+        updates_by_type: Dict[str, List[TQuerySubscriptionUpdate]] = defaultdict(list)
+        for _, contents, subscription in updates:
+            updates_by_type[subscription.type].append((contents, subscription))
+
+        for subscription_type, type_updates in updates_by_type.items():
+            batch_preparer = batch_preparer_registry.get(subscription_type)
+            if batch_preparer is None:
+                continue
+            # The updates can still be processed without the prepared data, so errors
+            # don't fail the batch.
             try:
-                with metrics.timer("snuba_query_subscriber.fetch_subscription"):
-                    subscription: QuerySubscription = QuerySubscription.objects.get_from_cache(
-                        subscription_id=contents["subscription_id"]
-                    )
-                    if subscription.status != QuerySubscription.Status.ACTIVE.value:
-                        metrics.incr("snuba_query_subscriber.subscription_inactive")
-                        return
-            except QuerySubscription.DoesNotExist:
-                metrics.incr("snuba_query_subscriber.subscription_doesnt_exist")
-                logger.error(
-                    "Received subscription update, but subscription does not exist",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
+                with metrics.timer(
+                    "snuba_query_subscriber.prepare_batch", instance=subscription_type
+                ):
+                    batch_preparer(type_updates)
+            except Exception:
+                logger.exception(
+                    "Failed to prepare batch of subscription updates",
+                    extra={"subscription_type": subscription_type},
                 )
-                try:
-                    if "entity" in contents:
-                        entity_key = contents["entity"]
-                    else:
-                        # XXX(ahmed): Remove this logic. This was kept here as backwards compat
-                        # for subscription updates with schema version `2`. However schema version 3
-                        # sends the "entity" in the payload
-                        entity_regex = r"^(MATCH|match)[ ]*\(([^)]+)\)"
-                        entity_match = re.match(entity_regex, contents["request"]["query"])
-                        if not entity_match:
-                            raise InvalidMessageError(
-                                "Unable to fetch entity from query in message"
-                            )
-                        entity_key = entity_match.group(2)
-                    _delete_from_snuba(
-                        self.topic_to_dataset[message.topic()],
-                        contents["subscription_id"],
-                        EntityKey(entity_key),
-                    )
-                except InvalidMessageError as e:
-                    logger.exception(e)
-                except Exception:
-                    logger.exception("Failed to delete unused subscription from snuba.")
-                return
-
-            if subscription.type not in subscriber_registry:
-                metrics.incr("snuba_query_subscriber.subscription_type_not_registered")
-                logger.error(
-                    "Received subscription update, but no subscription handler registered",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
+
+        for subscription_type, type_updates in updates_by_type.items():
+            batch_subscriber = batch_subscriber_registry.get(subscription_type)
+            if batch_subscriber is None:
+                continue
+            with sentry_sdk.start_span(op="process_messages") as span, metrics.timer(
+                "snuba_query_subscriber.batch_callback.duration", instance=subscription_type
+            ):
+                span.set_data("subscription_type", subscription_type)
+                span.set_data("batch_size", len(type_updates))
+                batch_subscriber(type_updates)
+
+        for message, contents, subscription in updates:
+            if subscription.type in batch_subscriber_registry:
+                continue
+            with sentry_sdk.push_scope():
+                self._handle_subscription_update(message, contents, subscription)
+
+    def _start_batch(self) -> None:
+        # set a commit time deadline only after the first message for this batch is seen
+        if not self.__batch_deadline:
+            self.__batch_deadline = self.commit_batch_timeout_ms / 1000.0 + time.time()
+
+    def _get_subscription_update(self, message: Message) -> Optional[TQuerySubscriptionUpdate]:
+        """
+        Parses the value from Kafka and fetches the subscription it is for. Returns
+        None if the message is invalid, or the subscription can't be handled.
+        """
+        contents = self._parse_message(message)
+        if contents is None:
+            return None
+
+        subscription: Optional[QuerySubscription]
+        try:
+            with metrics.timer("snuba_query_subscriber.fetch_subscription"):
+                subscription = QuerySubscription.objects.get_from_cache(
+                    subscription_id=contents["subscription_id"]
                 )
-                return
+        except QuerySubscription.DoesNotExist:
+            subscription = None
+
+        subscription = self._check_subscription(message, contents, subscription)
+        if subscription is None:
+            return None
+        return contents, subscription
+
+    def _parse_message(self, message: Message) -> Optional[Dict[str, Any]]:
+        try:
+            with metrics.timer("snuba_query_subscriber.parse_message_value"):
+                contents = self.parse_message_value(message.value())
+        except InvalidMessageError:
+            # If the message is in an invalid format, just log the error
+            # and continue
+            logger.exception(
+                "Subscription update could not be parsed",
+                extra={
+                    "offset": message.offset(),
+                    "partition": message.partition(),
+                    "value": message.value(),
+                },
+            )
+            return None
+        return contents
 
-            sentry_sdk.set_tag("project_id", subscription.project_id)
-            sentry_sdk.set_tag("query_subscription_id", contents["subscription_id"])
+    def _check_subscription(
+        self, message: Message, contents: Dict[str, Any], subscription: Optional[QuerySubscription]
+    ) -> Optional[QuerySubscription]:
+        """
+        Returns the subscription if the update can be passed to its callback. Otherwise
+        records why, and deletes subscriptions that don't exist anymore from Snuba.
+        """
+        sentry_sdk.set_tag("query_subscription_id", contents["subscription_id"])
 
-            callback = subscriber_registry[subscription.type]
-            with sentry_sdk.start_span(op="process_message") as span, metrics.timer(
-                "snuba_query_subscriber.callback.duration", instance=subscription.type
-            ):
-                span.set_data("payload", contents)
-                span.set_data("subscription_dataset", subscription.snuba_query.dataset)
-                span.set_data("subscription_query", subscription.snuba_query.query)
-                span.set_data("subscription_aggregation", subscription.snuba_query.aggregate)
-                span.set_data("subscription_time_window", subscription.snuba_query.time_window)
-                span.set_data("subscription_resolution", subscription.snuba_query.resolution)
-                span.set_data("message_offset", message.offset())
-                span.set_data("message_partition", message.partition())
-                span.set_data("message_value", message.value())
-
-                callback(contents, subscription)
+        if subscription is None:
+            metrics.incr("snuba_query_subscriber.subscription_doesnt_exist")
+            logger.error(
+                "Received subscription update, but subscription does not exist",
+                extra={
+                    "offset": message.offset(),
+                    "partition": message.partition(),
+                    "value": message.value(),
+                },
+            )
+            try:
+                if "entity" in contents:
+                    entity_key = contents["entity"]
+                else:
+                    # XXX(ahmed): Remove this logic. This was kept here as backwards compat
+                    # for subscription updates with schema version `2`. However schema version 3
+                    # sends the "entity" in the payload
+                    entity_regex = r"^(MATCH|match)[ ]*\(([^)]+)\)"
+                    entity_match = re.match(entity_regex, contents["request"]["query"])
+                    if not entity_match:
+                        raise InvalidMessageError("Unable to fetch entity from query in message")
+                    entity_key = entity_match.group(2)
+                _delete_from_snuba(
+                    self.topic_to_dataset[message.topic()],
+                    contents["subscription_id"],
+                    EntityKey(entity_key),
+                )
+            except InvalidMessageError as e:
+                logger.exception(e)
+            except Exception:
+                logger.exception("Failed to delete unused subscription from snuba.")
+            return None
+
+        if subscription.status != QuerySubscription.Status.ACTIVE.value:
+            metrics.incr("snuba_query_subscriber.subscription_inactive")
+            return None
+
+        if subscription.type not in subscriber_registry:
+            metrics.incr("snuba_query_subscriber.subscription_type_not_registered")
+            logger.error(
+                "Received subscription update, but no subscription handler registered",
+                extra={
+                    "offset": message.offset(),
+                    "partition": message.partition(),
+                    "value": message.value(),
+                },
+            )
+            return None
+
+        return subscription
+
+    def _handle_subscription_update(
+        self, message: Message, contents: Dict[str, Any], subscription: QuerySubscription
+    ) -> None:
+        sentry_sdk.set_tag("project_id", subscription.project_id)
+        sentry_sdk.set_tag("query_subscription_id", contents["subscription_id"])
+
+        callback = subscriber_registry[subscription.type]
+        with sentry_sdk.start_span(op="process_message") as span, metrics.timer(
+            "snuba_query_subscriber.callback.duration", instance=subscription.type
+        ):
+            span.set_data("payload", contents)
+            span.set_data("subscription_dataset", subscription.snuba_query.dataset)
+            span.set_data("subscription_query", subscription.snuba_query.query)
+            span.set_data("subscription_aggregation", subscription.snuba_query.aggregate)
+            span.set_data("subscription_time_window", subscription.snuba_query.time_window)
+            span.set_data("subscription_resolution", subscription.snuba_query.resolution)
+            span.set_data("message_offset", message.offset())
+            span.set_data("message_partition", message.partition())
+            span.set_data("message_value", message.value())
+
+            callback(contents, subscription)
 
     def parse_message_value(self, value: str) -> Dict[str, Any]:
         """
@@ -4,13 +4,13 @@ on symbolication metrics stored in Redis.
 
 This has three major tasks, executed in the following general order:
 1. Scan for new suspect projects in Redis that need to be checked for LPQ eligibility. Triggers 2 and 3.
-2. Determine a project's eligibility for the LPQ based on their recorded metrics.
+2. Determine the eligibility of a chunk of projects for the LPQ based on their recorded metrics.
 3. Remove some specified project from the LPQ.
 """
 
 import logging
 import time
-from typing import Literal
+from typing import Literal, Sequence
 
 import sentry_sdk
 
@@ -24,9 +24,13 @@ from sentry.processing.realtime_metrics.base import (
 )
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
+from sentry.utils.iterators import chunked
 
 logger = logging.getLogger(__name__)
 
+# Number of projects whose LPQ eligibility is evaluated in a single task.
+ELIGIBILITY_CHUNK_SIZE = 200
+
 
 @instrumented_task(  # type: ignore
     name="sentry.tasks.low_priority_symbolication.scan_for_suspect_projects",
@@ -46,12 +50,12 @@ def _scan_for_suspect_projects() -> None:
     suspect_projects = set()
     now = int(time.time())
 
-    for project_id in realtime_metrics.projects():
-        suspect_projects.add(project_id)
-        update_lpq_eligibility.delay(project_id=project_id, cutoff=now)
+    for project_ids in chunked(realtime_metrics.projects(), ELIGIBILITY_CHUNK_SIZE):
+        suspect_projects.update(project_ids)
+        update_lpq_eligibility_for_projects.delay(project_ids=project_ids, cutoff=now)
 
     # Prune projects we definitely know shouldn't be in the queue any more.
-    # `update_lpq_eligibility` should handle removing suspect projects from the list if it turns
+    # `update_lpq_eligibility_for_projects` should handle removing suspect projects from the list if it turns
     # out they need to be evicted.
     current_lpq_projects = realtime_metrics.get_lpq_projects() or set()
     expired_projects = current_lpq_projects.difference(suspect_projects)
@@ -83,26 +87,47 @@ def update_lpq_eligibility(project_id: int, cutoff: int) -> None:
 
 
 def _update_lpq_eligibility(project_id: int, cutoff: int) -> None:
-    # TODO: It may be a good idea to figure out how to debounce especially if this is
-    # executing more than 10s after cutoff.
+    _update_lpq_eligibility_for_projects([project_id], cutoff)
+
+
+@instrumented_task(  # type: ignore
+    name="sentry.tasks.low_priority_symbolication.update_lpq_eligibility_for_projects",
+    queue="symbolications.compute_low_priority_projects",
+    ignore_result=True,
+    soft_time_limit=10,
+)
+def update_lpq_eligibility_for_projects(project_ids: Sequence[int], cutoff: int) -> None:
+    """
+    Determines for a chunk of projects whether they belong in the low priority queue and removes
+    or assigns them accordingly. The metrics of all projects are fetched at once.
+
+    See `update_lpq_eligibility` for the meaning of `cutoff`.
+    """
+    _update_lpq_eligibility_for_projects(project_ids, cutoff)
 
-    event_counts = realtime_metrics.get_counts_for_project(project_id, cutoff)
-    durations = realtime_metrics.get_durations_for_project(project_id, cutoff)
 
-    excessive_rate = excessive_event_rate(project_id, event_counts)
-    excessive_duration = excessive_event_duration(project_id, durations)
+def _update_lpq_eligibility_for_projects(project_ids: Sequence[int], cutoff: int) -> None:
+    # TODO: It may be a good idea to figure out how to debounce especially if this is
+    # executing more than 10s after cutoff.
 
-    if excessive_rate or excessive_duration:
-        was_added = realtime_metrics.add_project_to_lpq(project_id)
-        if was_added:
-            reason = "rate" if excessive_rate else "duration"
-            if excessive_rate and excessive_duration:
-                reason = "rate-duration"
-            _report_change(project_id=project_id, change="added", reason=reason)
-    else:
-        was_removed = realtime_metrics.remove_projects_from_lpq({project_id})
-        if was_removed:
-            _report_change(project_id=project_id, change="removed", reason="ineligible")
+    all_event_counts = realtime_metrics.get_counts_for_projects(project_ids, cutoff)
+    all_durations = realtime_metrics.get_durations_for_projects(project_ids, cutoff)
+
+    for project_id in project_ids:
+        excessive_rate = excessive_event_rate(project_id, all_event_counts[project_id])
+        excessive_duration = excessive_event_duration(project_id, all_durations[project_id])
+
+        if excessive_rate or excessive_duration:
+            was_added = realtime_metrics.add_project_to_lpq(project_id)
+            if was_added:
+                reason = "rate" if excessive_rate else "duration"
+                if excessive_rate and excessive_duration:
+                    reason = "rate-duration"
+                _report_change(project_id=project_id, change="added", reason=reason)
+        else:
+            was_removed = realtime_metrics.remove_projects_from_lpq({project_id})
+            if was_removed:
+                _report_change(project_id=project_id, change="removed", reason="ineligible")
 
 
 def excessive_event_rate(project_id: int, event_counts: BucketedCounts) -> bool:
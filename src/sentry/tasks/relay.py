@@ -1,4 +1,5 @@
 import logging
+from itertools import chain
 
 import sentry_sdk
 from django.conf import settings
@@ -26,9 +27,9 @@ def update_config_cache(generate, organization_id=None, project_id=None, update_
         invalidated.
     """
 
-    from sentry.models import Project, ProjectKey, ProjectKeyStatus
+    from sentry.models import Project, ProjectKey
     from sentry.relay import projectconfig_cache
-    from sentry.relay.config import get_project_config
+    from sentry.relay.config import get_project_configs
 
     if project_id:
         set_current_event_project(project_id)
@@ -54,29 +55,19 @@ def update_config_cache(generate, organization_id=None, project_id=None, update_
     elif organization_id:
         # XXX(markus): I feel like we should be able to cache this but I don't
         # want to add another method to src/sentry/db/models/manager.py
-        projects = Project.objects.filter(organization_id=organization_id)
+        projects = list(Project.objects.filter(organization_id=organization_id))
 
     project_keys = {}
     for key in ProjectKey.objects.filter(project_id__in=[project.id for project in projects]):
         project_keys.setdefault(key.project_id, []).append(key)
 
     if generate:
+        project_configs, key_configs = get_project_configs(
+            projects, project_keys=project_keys, full_config=True
+        )
         config_cache = {}
-        for project in projects:
-            project_config = get_project_config(
-                project, project_keys=project_keys.get(project.id, []), full_config=True
-            )
-            config_cache[project.id] = project_config.to_dict()
-
-            for key in project_keys.get(project.id) or ():
-                # XXX(markus): This is currently the cleanest way to get only
-                # state for a single projectkey (considering quotas and
-                # everything)
-                if key.status != ProjectKeyStatus.ACTIVE:
-                    continue
-
-                project_config = get_project_config(project, project_keys=[key], full_config=True)
-                config_cache[key.public_key] = project_config.to_dict()
+        for cache_key, project_config in chain(project_configs.items(), key_configs.items()):
+            config_cache[cache_key] = project_config.to_dict()
 
         projectconfig_cache.set_many(config_cache)
     else:
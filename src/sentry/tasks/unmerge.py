@@ -489,7 +489,11 @@ def unmerge(*posargs, **kwargs):
         batch_size=args.batch_size,
         state=last_event,
         referrer="unmerge",
+        fetch_events=False,
     )
+    # Unmerging only reads a few keys of each event, such as its hashes, tags and
+    # the interfaces used for similarity features.
+    eventstore.bind_nodes(events, lazy=True)
 
     # If there are no more events to process, we're done with the migration.
     if not events:
@@ -23,6 +23,11 @@ SketchParameters = namedtuple("SketchParameters", "depth width capacity")
 
 CountMinScript = SentryScript(None, resource_string("sentry", "scripts/tsdb/cmsketch.lua"))
 
+RangeScript = SentryScript(None, resource_string("sentry", "scripts/tsdb/range.lua"))
+
+# Maximum number of counter hashes read by a single call of ``RangeScript``.
+RANGE_SCRIPT_BATCH_SIZE = 1000
+
 
 class SuppressionWrapper:
     """\
@@ -78,6 +83,12 @@ class RedisTSDB(BaseTSDB):
             ...
         }
 
+    Ranges of simple counters are read with a script that fetches all
+    requested fields of every hash on a host at once. When
+    ``enable_range_downsampling`` is set, ranges requested with a rollup that
+    isn't stored are read from the largest stored rollup that evenly divides
+    it, and the script sums the stored buckets into the requested ones.
+
     Distinct counters are stored using HyperLogLog, which provides a
     cardinality estimate with a standard error of 0.8%. The data layout looks
     something like this::
@@ -112,6 +123,7 @@ class RedisTSDB(BaseTSDB):
         self.prefix = prefix
         self.vnodes = vnodes
         self.enable_frequency_sketches = options.pop("enable_frequency_sketches", False)
+        self.enable_range_downsampling = options.pop("enable_range_downsampling", False)
         super().__init__(**options)
 
     def validate(self):
@@ -279,27 +291,58 @@ class RedisTSDB(BaseTSDB):
         self.validate_arguments([model], [environment_id])
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
-        series = map(to_datetime, series)
+        stored_rollup = self.get_stored_rollup(rollup)
+        offsets = range(0, rollup, stored_rollup) if stored_rollup != rollup else [0]
 
-        results = []
-        cluster, _ = self.get_cluster(environment_id)
-        with cluster.map() as client:
-            for key in keys:
-                for timestamp in series:
+        # (hash key) -> [bucket, {field: key}]
+        hashes = {}
+        fields = {}
+        for key in keys:
+            for epoch in series:
+                for offset in offsets:
                     hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id
-                    )
-                    results.append(
-                        (to_timestamp(timestamp), key, client.hget(hash_key, hash_field))
+                        model, stored_rollup, to_datetime(epoch + offset), key, environment_id
                     )
+                    hashes.setdefault(hash_key, [epoch, {}])[1][hash_field] = key
+                    fields[force_bytes(hash_field)] = key
+
+        cluster, _ = self.get_cluster(environment_id)
+        router = cluster.get_router()
+        hashes_by_host = defaultdict(list)
+        for hash_key in hashes:
+            hashes_by_host[router.get_host_for_key(hash_key)].append(hash_key)
 
-        results_by_key = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
+        # Every batch is routed by its first hash key, which places it on the
+        # host that stores all hashes of the batch.
+        commands = {}
+        for hash_keys in hashes_by_host.values():
+            for i in range(0, len(hash_keys), RANGE_SCRIPT_BATCH_SIZE):
+                batch = hash_keys[i : i + RANGE_SCRIPT_BATCH_SIZE]
+                arguments = []
+                for hash_key in batch:
+                    epoch, hash_fields = hashes[hash_key]
+                    arguments.extend((epoch, len(hash_fields)))
+                    arguments.extend(hash_fields)
+                commands[batch[0]] = [(RangeScript, batch, arguments)]
+
+        results_by_key = {key: dict.fromkeys(series, 0) for key in keys}
+        for responses in cluster.execute_commands(commands).values():
+            values = responses[0].value
+            for epoch, field, count in zip(values[::3], values[1::3], values[2::3]):
+                results_by_key[fields[field]][int(epoch)] += int(count)
+
+        return {key: sorted(points.items()) for key, points in results_by_key.items()}
+
+    def get_stored_rollup(self, rollup):
+        """
+        Returns the rollup that the counters of a range with the given rollup
+        are read from.
+        """
+        if rollup in self.rollups or not self.enable_range_downsampling:
+            return rollup
 
-        for key, points in results_by_key.items():
-            results_by_key[key] = sorted(points.items())
-        return dict(results_by_key)
+        divisors = [stored for stored in self.rollups if rollup % stored == 0]
+        return max(divisors) if divisors else rollup
 
     def merge(self, model, destination, sources, timestamp=None, environment_ids=None):
         environment_ids = (set(environment_ids) if environment_ids is not None else set()).union(
@@ -66,12 +66,14 @@ class StringCursor(Cursor):
 
 
 class CursorResult(Sequence):
-    def __init__(self, results, next, prev, hits=None, max_hits=None):
+    def __init__(self, results, next, prev, hits=None, max_hits=None, hits_exact=None):
         self.results = results
         self.next = next
         self.prev = prev
         self.hits = hits
         self.max_hits = max_hits
+        # Whether ``hits`` is an exact count. ``None`` if unknown.
+        self.hits_exact = hits_exact
 
     def __len__(self):
         return len(self.results)
@@ -215,7 +217,15 @@ def _build_prev_values(cursor, results, key, limit, is_desc):
 
 
 def build_cursor(
-    results, key, limit=100, is_desc=False, cursor=None, hits=None, max_hits=None, on_results=None
+    results,
+    key,
+    limit=100,
+    is_desc=False,
+    cursor=None,
+    hits=None,
+    max_hits=None,
+    on_results=None,
+    hits_exact=None,
 ):
     if cursor is None:
         cursor = Cursor(0, 0, 0)
@@ -247,5 +257,10 @@ def build_cursor(
         results = on_results(results)
 
     return CursorResult(
-        results=results, next=next_cursor, prev=prev_cursor, hits=hits, max_hits=max_hits
+        results=results,
+        next=next_cursor,
+        prev=prev_cursor,
+        hits=hits,
+        max_hits=max_hits,
+        hits_exact=hits_exact,
     )
@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A thread-safe, in-process cache that holds at most ``max_size`` items and
+    evicts the least recently used item when full.
+
+    If ``max_weight`` is given, items can be given a weight when set (such as
+    their size in bytes), and items are also evicted once the total weight
+    exceeds ``max_weight``. Items heavier than ``max_weight`` are not cached.
+
+    This is meant to sit in front of shared caches for values that are hot
+    and effectively immutable. Values are not copied: callers must not mutate
+    them.
+    """
+
+    def __init__(self, max_size: int, max_weight: Optional[int] = None) -> None:
+        assert max_size > 0
+        assert max_weight is None or max_weight > 0
+        self.max_size = max_size
+        self.max_weight = max_weight
+        self._items: "OrderedDict[K, V]" = OrderedDict()
+        self._weights: Dict[K, int] = {}
+        self._total_weight = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._items
+
+    @property
+    def weight(self) -> int:
+        """The total weight of all cached items."""
+        return self._total_weight
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return default
+            return self._items[key]
+
+    def get_many(self, keys: Iterable[K]) -> Mapping[K, V]:
+        rv: MutableMapping[K, V] = {}
+        with self._lock:
+            for key in keys:
+                try:
+                    self._items.move_to_end(key)
+                except KeyError:
+                    continue
+                rv[key] = self._items[key]
+        return rv
+
+    def set(self, key: K, value: V, weight: int = 1) -> None:
+        with self._lock:
+            self._pop(key)
+            if self.max_weight is not None and weight > self.max_weight:
+                return
+
+            self._items[key] = value
+            self._weights[key] = weight
+            self._total_weight += weight
+            while len(self._items) > self.max_size or (
+                self.max_weight is not None and self._total_weight > self.max_weight
+            ):
+                self._pop(next(iter(self._items)))
+
+    def set_many(self, items: Mapping[K, V]) -> None:
+        for key, value in items.items():
+            self.set(key, value)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._weights.clear()
+            self._total_weight = 0
+
+    def _pop(self, key: K) -> None:
+        if key in self._weights:
+            del self._items[key]
+            self._total_weight -= self._weights.pop(key)
@@ -3,9 +3,11 @@ import logging
 import os
 import random
 import re
+import threading
 import time
 from collections import OrderedDict, namedtuple
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta
@@ -14,9 +16,11 @@ from operator import itemgetter
 from typing import Any, Callable, List, Mapping, MutableMapping, Optional, Sequence, Tuple, Union
 from urllib.parse import urlparse
 
+import msgpack
 import pytz
 import sentry_sdk
 import urllib3
+import zstandard
 from dateutil.parser import parse as parse_datetime
 from django.conf import settings
 from django.core.cache import cache
@@ -24,6 +28,7 @@ from sentry_sdk import Hub
 from snuba_sdk.legacy import json_to_snql
 from snuba_sdk.query import Query
 
+from sentry import options
 from sentry.models import (
     Environment,
     Group,
@@ -40,6 +45,8 @@ from sentry.snuba.events import Columns
 from sentry.utils import json, metrics
 from sentry.utils.compat import map
 from sentry.utils.dates import outside_retention_with_modified_start, to_timestamp
+from sentry.utils.locking import UnableToAcquireLock
+from sentry.utils.locking.lock import Lock
 
 logger = logging.getLogger(__name__)
 
@@ -332,6 +339,11 @@ _snuba_pool = connection_from_url(
 )
 _query_thread_pool = ThreadPoolExecutor(max_workers=10)
 
+# How long a process may hold the lock of a cached query while running it,
+# and how long other processes wait for its result when coalescing queries
+# across processes.
+QUERY_CACHE_LOCK_DURATION = 10
+
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
 
@@ -695,8 +707,59 @@ def get_cache_key(query: SnubaQuery) -> str:
     else:
         hashable = json.dumps(query, sort_keys=True)
 
-    # sqc - Snuba Query Cache
-    return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
+    # sqc - Snuba Query Cache, v2 - zstd compressed msgpack
+    return f"sqc:v2:{sha1(hashable.encode('utf-8')).hexdigest()}"
+
+
+def _encode_cached_result(result: Mapping[str, Any]) -> Optional[bytes]:
+    try:
+        return zstandard.ZstdCompressor().compress(msgpack.packb(result, use_bin_type=True))
+    except (TypeError, ValueError, OverflowError):
+        # Values that msgpack can't represent (such as integers above 64
+        # bits) are not cached.
+        return None
+
+
+def _decode_cached_result(value: bytes) -> Mapping[str, Any]:
+    return msgpack.unpackb(
+        zstandard.ZstdDecompressor().decompress(value), raw=False, strict_map_key=False
+    )
+
+
+class _InflightQueries:
+    """
+    Tracks the cache keys of queries that are currently sent to Snuba by this
+    process, so that identical concurrent queries can wait for their result
+    instead of querying again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._queries: MutableMapping[str, Future] = {}
+
+    def claim(self, cache_key: str) -> Tuple[bool, Future]:
+        """
+        Returns ``(True, future)`` if the caller has to run the query and
+        resolve it, or ``(False, future)`` with the future of the running query.
+        """
+        with self._lock:
+            future = self._queries.get(cache_key)
+            if future is not None:
+                return False, future
+            future = self._queries[cache_key] = Future()
+            return True, future
+
+    def resolve(self, cache_key: str, result: Optional[bytes]) -> None:
+        """
+        Resolves a claimed query with its encoded result. A result of ``None``
+        marks it as failed.
+        """
+        with self._lock:
+            future = self._queries.pop(cache_key)
+        future.set_result(result)
+
+
+_inflight_queries = _InflightQueries()
 
 
 def bulk_raw_query(
@@ -726,31 +789,180 @@ def _apply_cache_and_build_results(
         cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
         cache_data = cache.get_many(cache_keys)
         to_query: List[Tuple[int, SnubaQueryBody, Optional[str]]] = []
+        metric_tags = {"referrer": referrer} if referrer else None
         for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
             cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": referrer} if referrer else None
             if cached_result is None:
                 metrics.incr("snuba.query_cache.miss", tags=metric_tags)
                 to_query.append((query_pos, query_params, cache_key))
             else:
                 metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
+                results.append((query_pos, _decode_cached_result(cached_result)))
+
+        if to_query:
+            results.extend(_query_coalesced(to_query, headers, metric_tags))
     else:
         to_query = [(query_pos, query_params, None) for query_pos, query_params in query_param_list]
-
-    if to_query:
-        query_results = _bulk_snuba_query(map(itemgetter(1), to_query), headers)
-        for result, (query_pos, _, cache_key) in zip(query_results, to_query):
-            if cache_key:
-                cache.set(cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
-            results.append((query_pos, result))
+        if to_query:
+            query_results = _bulk_snuba_query(map(itemgetter(1), to_query), headers)
+            results.extend(zip(map(itemgetter(0), to_query), query_results))
 
     # Sort so that we get the results back in the original param list order
-    results.sort()
+    results.sort(key=itemgetter(0))
     # Drop the sort order val
     return map(itemgetter(1), results)
 
 
+def _query_coalesced(
+    to_query: Sequence[Tuple[int, SnubaQueryBody, str]],
+    headers: Mapping[str, str],
+    metric_tags: Optional[Mapping[str, str]],
+) -> List[Tuple[int, Mapping[str, Any]]]:
+    """
+    Runs queries that missed the cache and caches their results.
+
+    A query that is already running in this process for the same cache key is
+    not sent to Snuba again; its result is awaited instead. If it fails, the
+    waiting callers fall back to running the query themselves.
+    """
+    leading = []
+    following = []
+    for query in to_query:
+        is_leader, future = _inflight_queries.claim(query[2])
+        if is_leader:
+            leading.append(query)
+        else:
+            following.append((query, future))
+
+    results: MutableMapping[str, Mapping[str, Any]] = {}
+    # Waiting callers decode their own copy of the result from its cached form.
+    encoded: MutableMapping[str, bytes] = {}
+    try:
+        _run_leading_queries(leading, headers, metric_tags, results, encoded)
+    finally:
+        for _, _, cache_key in leading:
+            _inflight_queries.resolve(cache_key, encoded.get(cache_key))
+
+    retry = []
+    for query, future in following:
+        try:
+            with metrics.timer("snuba.query_cache.coalesced_wait", tags=metric_tags):
+                result = future.result(
+                    timeout=settings.SENTRY_SNUBA_TIMEOUT + QUERY_CACHE_LOCK_DURATION
+                )
+        except FutureTimeoutError:
+            result = None
+
+        metrics.incr(
+            "snuba.query_cache.coalesced",
+            tags={
+                **(metric_tags or {}),
+                "scope": "local",
+                "result": "failed" if result is None else "ok",
+            },
+        )
+        if result is None:
+            retry.append(query)
+        else:
+            results[query[2]] = _decode_cached_result(result)
+
+    if retry:
+        _run_queries(retry, headers, results, encoded)
+
+    return [(query_pos, results[cache_key]) for query_pos, _, cache_key in to_query]
+
+
+def _run_leading_queries(
+    leading: Sequence[Tuple[int, SnubaQueryBody, str]],
+    headers: Mapping[str, str],
+    metric_tags: Optional[Mapping[str, str]],
+    results: MutableMapping[str, Mapping[str, Any]],
+    encoded: MutableMapping[str, bytes],
+) -> None:
+    held_locks: List[Lock] = []
+    try:
+        if leading and options.get("snuba.query-cache.coalesce-across-processes"):
+            leading = _coalesce_across_processes(leading, metric_tags, held_locks, results, encoded)
+        if leading:
+            _run_queries(leading, headers, results, encoded)
+    finally:
+        for lock in held_locks:
+            lock.release()
+
+
+def _run_queries(
+    to_query: Sequence[Tuple[int, SnubaQueryBody, str]],
+    headers: Mapping[str, str],
+    results: MutableMapping[str, Mapping[str, Any]],
+    encoded: MutableMapping[str, bytes],
+) -> None:
+    query_results = _bulk_snuba_query(map(itemgetter(1), to_query), headers)
+    for result, (_, _, cache_key) in zip(query_results, to_query):
+        cached_result = _encode_cached_result(result)
+        if cached_result is not None:
+            cache.set(cache_key, cached_result, settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
+            encoded[cache_key] = cached_result
+        results[cache_key] = result
+
+
+def _coalesce_across_processes(
+    leading: Sequence[Tuple[int, SnubaQueryBody, str]],
+    metric_tags: Optional[Mapping[str, str]],
+    held_locks: List[Lock],
+    results: MutableMapping[str, Mapping[str, Any]],
+    encoded: MutableMapping[str, bytes],
+) -> List[Tuple[int, SnubaQueryBody, str]]:
+    """
+    Takes a short lock for every query. Queries whose lock is held by another
+    process wait for that process to cache the result. Returns the queries
+    that still have to run, either because their lock was acquired or because
+    the other process did not produce a result in time.
+    """
+    from sentry.app import locks
+
+    to_query = []
+    waiting = {}
+    for query in leading:
+        cache_key = query[2]
+        lock = locks.get(f"{cache_key}:lock", duration=QUERY_CACHE_LOCK_DURATION)
+        try:
+            lock.acquire()
+        except UnableToAcquireLock:
+            waiting[cache_key] = query
+        else:
+            held_locks.append(lock)
+            to_query.append(query)
+
+    if not waiting:
+        return to_query
+
+    num_waiting = len(waiting)
+    deadline = time.monotonic() + QUERY_CACHE_LOCK_DURATION
+    delay = 0.05
+    with metrics.timer("snuba.query_cache.coalesced_wait", tags=metric_tags):
+        while waiting and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            for cache_key, cached_result in cache.get_many(list(waiting)).items():
+                if cached_result is not None:
+                    results[cache_key] = _decode_cached_result(cached_result)
+                    encoded[cache_key] = cached_result
+                    del waiting[cache_key]
+
+    tags = {**(metric_tags or {}), "scope": "remote"}
+    metrics.incr(
+        "snuba.query_cache.coalesced",
+        amount=num_waiting - len(waiting),
+        tags={**tags, "result": "ok"},
+    )
+    metrics.incr(
+        "snuba.query_cache.coalesced", amount=len(waiting), tags={**tags, "result": "failed"}
+    )
+    to_query.extend(waiting.values())
+
+    return to_query
+
+
 def _bulk_snuba_query(
     snuba_param_list: Sequence[SnubaQueryBody],
     headers: Mapping[str, str],
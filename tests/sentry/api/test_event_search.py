@@ -1,6 +1,7 @@
 import datetime
 import os
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 from django.test import SimpleTestCase
@@ -13,6 +14,9 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    _parse_result_cache,
+    _parse_tree_cache,
+    event_search_grammar,
     parse_search_query,
 )
 from sentry.constants import MODULE_ROOT
@@ -451,6 +455,61 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
         assert search_filter.value.value == 'a"b'
 
 
+class ParseSearchQueryCacheTest(SimpleTestCase):
+    def setUp(self):
+        _parse_tree_cache.clear()
+        _parse_result_cache.clear()
+
+    def test_cache(self):
+        query = "user.email:foo@example.com release:[1.0, 2.0] count():>10"
+        with patch.object(
+            event_search_grammar, "parse", wraps=event_search_grammar.parse
+        ) as grammar_parse:
+            result = parse_search_query(query)
+            assert parse_search_query(query) == result
+            assert grammar_parse.call_count == 1
+
+    def test_copies(self):
+        query = "release:[1.0, 2.0]"
+        result = parse_search_query(query)
+        result[0].value.raw_value.append("3.0")
+        result.append(SearchFilter(SearchKey("foo"), "=", SearchValue("bar")))
+        assert parse_search_query(query) == [
+            SearchFilter(SearchKey("release"), "IN", SearchValue(["1.0", "2.0"]))
+        ]
+
+    def test_config(self):
+        config = SearchConfig(key_mappings={"target_value": ["someValue"]})
+        assert parse_search_query("someValue:123") == [
+            SearchFilter(SearchKey("someValue"), "=", SearchValue("123"))
+        ]
+        assert parse_search_query("someValue:123", config=config) == [
+            SearchFilter(SearchKey("target_value"), "=", SearchValue("123"))
+        ]
+
+    def test_rel_time_filter(self):
+        # Filters with relative dates aren't cached, only the parse tree is
+        now = timezone.now()
+        with patch.object(
+            event_search_grammar, "parse", wraps=event_search_grammar.parse
+        ) as grammar_parse:
+            with freeze_time(now):
+                parse_search_query("first_seen:-2w")
+            later = now + timedelta(hours=1)
+            with freeze_time(later):
+                assert parse_search_query("first_seen:-2w") == [
+                    SearchFilter(
+                        SearchKey("first_seen"), ">=", SearchValue(later - timedelta(days=14))
+                    )
+                ]
+            assert grammar_parse.call_count == 1
+
+    def test_invalid(self):
+        for _ in range(2):
+            with pytest.raises(InvalidSearchQuery):
+                parse_search_query("first_seen:hello")
+
+
 @pytest.mark.parametrize(
     "raw,result",
     [
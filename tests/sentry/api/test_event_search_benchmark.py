@@ -0,0 +1,60 @@
+import pytest
+
+from sentry.api.event_search import (
+    _parse_result_cache,
+    _parse_tree_cache,
+    event_search_grammar,
+    parse_search_query,
+)
+from sentry.api.issue_search import parse_search_query as parse_issue_search_query
+from sentry.testutils.skips import requires_benchmark
+
+
+QUERIES = {
+    "issue_stream": "is:unresolved is:for_review assigned_or_suggested:[me, none]",
+    "discover": (
+        'event.type:transaction transaction:"/api/0/organizations/{organization_slug}/" '
+        "transaction.duration:>500ms http.method:[GET, POST] !user.email:*@example.com"
+    ),
+    "aggregates": (
+        "count():>100 p95(transaction.duration):>1s failure_rate():>0.05 "
+        "count_unique(user):>=10 avg(measurements.lcp):<2.5s"
+    ),
+    "boolean": " OR ".join(
+        f'(browser.name:"Chrome {i}" AND os.name:Windows AND release:1.{i}.0)' for i in range(20)
+    ),
+}
+
+
+def clear_caches():
+    _parse_tree_cache.clear()
+    _parse_result_cache.clear()
+
+
+@requires_benchmark
+@pytest.mark.parametrize("query_name", sorted(QUERIES))
+def test_benchmark_grammar_parse(query_name, benchmark):
+    benchmark(event_search_grammar.parse, QUERIES[query_name])
+
+
+@requires_benchmark
+@pytest.mark.parametrize("query_name", sorted(QUERIES))
+def test_benchmark_parse_search_query_uncached(query_name, benchmark):
+    def setup():
+        clear_caches()
+        return (QUERIES[query_name],), {}
+
+    benchmark.pedantic(parse_search_query, setup=setup, rounds=100)
+
+
+@requires_benchmark
+@pytest.mark.parametrize("query_name", sorted(QUERIES))
+def test_benchmark_parse_search_query_cached(query_name, benchmark):
+    clear_caches()
+    benchmark(parse_search_query, QUERIES[query_name])
+
+
+@requires_benchmark
+def test_benchmark_parse_issue_search_query_cached(benchmark):
+    clear_caches()
+    benchmark(parse_issue_search_query, QUERIES["issue_stream"])
@@ -1,9 +1,12 @@
 from datetime import timedelta
 from unittest import TestCase as SimpleTestCase
+from unittest.mock import patch
 
 from django.utils import timezone
 
 from sentry.api.paginator import (
+    COUNT_HITS_CACHED,
+    COUNT_HITS_ESTIMATE,
     BadPaginationError,
     ChainPaginator,
     CombinedQuerysetIntermediary,
@@ -63,6 +66,48 @@ class PaginatorTest(TestCase):
         result = paginator.count_hits(1)
         assert result == 1
 
+    def test_count_hits_exact(self):
+        self.create_user("foo@example.com")
+
+        result = self.cls(User.objects.all(), "id").get_result(limit=1, count_hits=True)
+        assert result.hits == 1
+        assert result.hits_exact is True
+
+        result = self.cls(User.objects.all(), "id").get_result(limit=1)
+        assert result.hits is None
+        assert result.hits_exact is None
+
+    def test_count_hits_cached(self):
+        self.create_user("foo@example.com")
+
+        queryset = User.objects.filter(email__startswith="foo")
+        paginator = self.cls(queryset, "id", count_hits_strategy=COUNT_HITS_CACHED)
+        assert paginator.get_hits(1000) == (1, True)
+
+        self.create_user("foo2@example.com")
+        paginator = self.cls(queryset, "id", count_hits_strategy=COUNT_HITS_CACHED)
+        assert paginator.get_hits(1000) == (1, False)
+
+        # Different queries do not share counts
+        paginator = self.cls(User.objects.all(), "id", count_hits_strategy=COUNT_HITS_CACHED)
+        assert paginator.get_hits(1000) == (2, True)
+
+    def test_count_hits_estimate(self):
+        self.create_user("foo@example.com")
+        self.create_user("bar@example.com")
+
+        paginator = self.cls(User.objects.all(), "id", count_hits_strategy=COUNT_HITS_ESTIMATE)
+        assert paginator.estimate_hits() >= 0
+
+        # Small estimates are counted exactly
+        with patch.object(paginator, "estimate_hits", return_value=10):
+            assert paginator.get_hits(1000) == (2, True)
+
+        with patch.object(paginator, "estimate_hits", return_value=5000):
+            result = paginator.get_result(limit=1, count_hits=True, max_hits=1000)
+        assert result.hits == 1000
+        assert result.hits_exact is False
+
     def test_prev_emptyset(self):
         queryset = User.objects.all()
 
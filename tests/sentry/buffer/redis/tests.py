@@ -5,7 +5,7 @@ from unittest import mock
 from django.utils import timezone
 from django.utils.encoding import force_text
 
-from sentry.buffer.redis import RedisBuffer
+from sentry.buffer.redis import COMPACT_ENCODING_V1, RedisBuffer
 from sentry.models import Group, Project
 from sentry.testutils import TestCase
 
@@ -183,6 +183,107 @@ class RedisBufferTest(TestCase):
         self.buf.process("foo")
         process.assert_called_once_with(mock.Mock, {"times_seen": 1}, {"pk": 1}, {}, True)
 
+    @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
+    @mock.patch("sentry.buffer.redis.process_incr", mock.Mock())
+    def test_incr_saves_compact_encoding(self):
+        self.buf.compact_encoding = True
+        now = datetime(2017, 5, 3, 6, 6, 6, tzinfo=timezone.utc)
+        client = self.buf.cluster.get_routing_client()
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        project = Project(id=1)
+        self.buf.incr(
+            model,
+            {"times_seen": 1},
+            {"pk": 1, "datetime": now},
+            extra={"foo": "bar", "datetime": now, "project": project},
+        )
+        result = client.hgetall("foo")
+        result = {force_text(k): v for k, v in result.items()}
+
+        assert result["f"].startswith(COMPACT_ENCODING_V1)
+        assert self.buf._decode(result["f"]) == {"pk": 1, "datetime": now}
+        assert result["e+foo"].startswith(COMPACT_ENCODING_V1)
+        assert self.buf._decode(result["e+foo"]) == "bar"
+        assert self.buf._decode(result["e+datetime"]) == now
+        # Values msgpack can't represent fall back to pickle.
+        assert pickle.loads(result["e+project"]) == project
+
+    @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_does_bubble_up_compact(self, process):
+        now = datetime(2017, 5, 3, 6, 6, 6, tzinfo=timezone.utc)
+        self.buf.compact_encoding = True
+        client = self.buf.cluster.get_routing_client()
+        client.hmset(
+            "foo",
+            {
+                "e+foo": self.buf._encode("bar"),
+                "e+datetime": self.buf._encode(now),
+                "f": self.buf._encode({"pk": 1}),
+                "i+times_seen": "2",
+                "m": "sentry.models.Group",
+            },
+        )
+        self.buf.process("foo")
+        process.assert_called_once_with(
+            Group, {"times_seen": 2}, {"pk": 1}, {"foo": "bar", "datetime": now}, None
+        )
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batch(self, process):
+        self.buf.batch_process = True
+        self.buf.compact_encoding = True
+        with self.buf.cluster.map() as client:
+            client.hmset(
+                "foo",
+                {"f": self.buf._encode({"pk": 1}), "i+times_seen": "2", "m": "sentry.models.Group"},
+            )
+            client.hmset(
+                "bar",
+                {"f": pickle.dumps({"pk": 2}), "i+times_seen": "3", "m": "sentry.models.Group"},
+            )
+            client.zadd("b:p", {"foo": 1, "bar": 2})
+
+        self.buf.process(batch_keys=["foo", "bar", "baz"])
+
+        assert process.mock_calls == [
+            mock.call(Group, {"times_seen": 2}, {"pk": 1}, {}, None),
+            mock.call(Group, {"times_seen": 3}, {"pk": 2}, {}, None),
+        ]
+        client = self.buf.cluster.get_routing_client()
+        assert client.zrange("b:p", 0, -1) == []
+        assert not client.exists("foo")
+        assert not client.exists("bar")
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batch_continues_after_failure(self, process):
+        self.buf.batch_process = True
+        process.side_effect = [Exception("Boom!"), None]
+        with self.buf.cluster.map() as client:
+            client.hmset(
+                "foo",
+                {"f": pickle.dumps({"pk": 1}), "i+times_seen": "2", "m": "sentry.models.Group"},
+            )
+            client.hmset(
+                "bar",
+                {"f": pickle.dumps({"pk": 2}), "i+times_seen": "3", "m": "sentry.models.Group"},
+            )
+
+        self.buf.process(batch_keys=["foo", "bar"])
+
+        assert process.mock_calls == [
+            mock.call(Group, {"times_seen": 2}, {"pk": 1}, {}, None),
+            mock.call(Group, {"times_seen": 3}, {"pk": 2}, {}, None),
+        ]
+
+    def test_encode_compact_large_int(self):
+        self.buf.compact_encoding = True
+        value = 2 ** 64
+        encoded = self.buf._encode(value)
+        assert not encoded.startswith(COMPACT_ENCODING_V1)
+        assert self.buf._decode(encoded) == value
+
 
 #    @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
 #    def test_incr_uses_signal_only(self):
@@ -0,0 +1,99 @@
+import os
+from unittest import mock
+
+from django.test import override_settings
+
+from sentry.db.models.manager.process_cache import ProcessCache, process_cache
+from sentry.models import Organization, Project
+from sentry.testutils import TestCase
+
+
+@override_settings(SENTRY_MODEL_PROCESS_CACHE=True)
+class ProcessCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        # Do not subscribe to invalidations, they are also applied locally.
+        for patcher in (
+            mock.patch.object(process_cache, "_ensure_listener"),
+            mock.patch.object(process_cache, "_subscribed", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        process_cache.clear()
+        self.addCleanup(process_cache.clear)
+
+    def test_get_from_cache(self):
+        project = self.create_project()
+        Project.objects.get_from_cache(id=project.id)
+
+        with mock.patch("sentry.db.models.manager.base.cache.get") as cache_get:
+            first = Project.objects.get_from_cache(id=project.id)
+            second = Project.objects.get_from_cache(id=project.id)
+
+        assert not cache_get.called
+        assert first == second == project
+        # Every caller gets its own instance
+        assert first is not second
+        first.name = "changed"
+        assert second.name == project.name
+
+    def test_invalidated_on_save(self):
+        project = self.create_project(name="foo")
+        assert Project.objects.get_from_cache(id=project.id).name == "foo"
+
+        project.name = "bar"
+        project.save()
+        assert Project.objects.get_from_cache(id=project.id).name == "bar"
+
+    def test_invalidates_previous_lookup_values(self):
+        organization = self.create_organization(slug="foo")
+        assert Organization.objects.get_from_cache(slug="foo") == organization
+
+        organization.slug = "bar"
+        organization.save()
+        with self.assertRaises(Organization.DoesNotExist):
+            Organization.objects.get_from_cache(slug="foo")
+        assert Organization.objects.get_from_cache(slug="bar") == organization
+
+    def test_published_invalidations(self):
+        project = self.create_project()
+        Project.objects.get_from_cache(id=project.id)
+
+        with mock.patch.object(process_cache, "_get_client") as get_client:
+            project.delete()
+
+        (channel, payload), _ = get_client.return_value.publish.call_args
+        assert channel == "sentry.modelcache.invalidate"
+        assert payload
+        with self.assertRaises(Project.DoesNotExist):
+            Project.objects.get_from_cache(id=project.id)
+
+
+def test_reset_after_fork():
+    cache = ProcessCache(10)
+    with mock.patch.object(ProcessCache, "_listen"):
+        cache.set("key", "value", 60)
+    # Pretend that the listener of the parent has subscribed.
+    cache._subscribed = True
+    cache.set("key", "value", 60)
+    assert cache.get("key", "test") == "value"
+    parent_listener = cache._listener
+
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            with mock.patch.object(ProcessCache, "_listen") as listen:
+                # Until the child has subscribed, nothing is served or cached.
+                assert cache.get("key", "test") is None
+                cache.set("key", "value", 60)
+                assert cache.get("key", "test") is None
+                assert cache._listener is not parent_listener
+                cache._listener.join()
+                assert listen.called
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
@@ -1,6 +1,8 @@
 from unittest import mock
 from uuid import uuid4
 
+from django.core.cache import cache
+
 from sentry import nodestore
 from sentry.deletions.defaults.group import EventDataDeletionTask
 from sentry.eventstore.models import Event
@@ -15,7 +17,8 @@ from sentry.models import (
     UserReport,
 )
 from sentry.tasks.deletion import delete_groups
-from sentry.testutils import SnubaTestCase, TestCase
+from sentry.testutils import SnubaTestCase, TestCase, TransactionTestCase
+from sentry.testutils.helpers import override_options
 from sentry.testutils.helpers.datetime import before_now, iso_format
 
 
@@ -111,3 +114,68 @@ class DeleteGroupTest(TestCase, SnubaTestCase):
             delete_groups(object_ids=[group.id])
 
         assert nodestore_delete_multi.call_count == 0
+
+
+class DeleteGroupShardedEventDataTest(TransactionTestCase, SnubaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.events = [
+            self.store_event(
+                data={
+                    "timestamp": iso_format(before_now(hours=hours)),
+                    "fingerprint": ["group1"],
+                },
+                project_id=self.project.id,
+            )
+            for hours in (1, 2, 5, 12, 23)
+        ]
+        self.group = self.events[0].group
+        self.node_ids = [
+            Event.generate_node_id(self.project.id, event.event_id) for event in self.events
+        ]
+        file = File.objects.create(name="hello.png", type="image/png")
+        EventAttachment.objects.create(
+            event_id=self.events[-1].event_id,
+            project_id=self.project.id,
+            file_id=file.id,
+            type=file.type,
+            name="hello.png",
+        )
+
+    def get_task(self):
+        return EventDataDeletionTask(
+            manager=None, group_id=self.group.id, project_id=self.project.id
+        )
+
+    @mock.patch.object(EventDataDeletionTask, "DEFAULT_CHUNK_SIZE", 1)
+    def test_simple(self):
+        assert all(nodestore.get(node_id) for node_id in self.node_ids)
+
+        with override_options({"deletions.group.event-data-shards": 3}), self.tasks():
+            delete_groups(object_ids=[self.group.id])
+
+        assert not Group.objects.filter(id=self.group.id).exists()
+        assert not any(nodestore.get(node_id) for node_id in self.node_ids)
+        assert not EventAttachment.objects.filter(event_id=self.events[-1].event_id).exists()
+        assert cache.get(self.get_task().get_checkpoint_key("windows")) is None
+
+    def test_resume(self):
+        task = self.get_task()
+        windows = task.get_windows(3)
+        assert len(windows) == 3
+        assert windows[0][0] is None and windows[-1][1] is None
+        # Windows that were deleted before aren't deleted again
+        cache.set(task.get_checkpoint_key(0), task.CHECKPOINT_DONE)
+        cache.set(task.get_checkpoint_key(1), task.CHECKPOINT_DONE)
+
+        with override_options({"deletions.group.event-data-shards": 3}):
+            assert self.get_task().chunk() is False
+
+        # Only the last window, with the events of the last 8 hours, was deleted
+        assert [bool(nodestore.get(node_id)) for node_id in self.node_ids] == [
+            False,
+            False,
+            False,
+            True,
+            True,
+        ]
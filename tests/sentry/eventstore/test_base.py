@@ -2,10 +2,12 @@ import logging
 from unittest import mock
 
 import pytest
+from django.test import override_settings
 
 from sentry import eventstore
 from sentry.eventstore.base import EventStorage
 from sentry.eventstore.models import Event
+from sentry.nodestore.indexed import LazyNodeData
 from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.utils.samples import load_data
@@ -39,6 +41,23 @@ class EventStorageTest(TestCase):
         assert event.data._node_data is not None
         assert event.data["user"]["id"] == "user1"
 
+    def test_bind_nodes_lazy(self):
+        min_ago = iso_format(before_now(minutes=1))
+        with override_settings(SENTRY_NODESTORE_INDEXED_PAYLOADS=True):
+            self.store_event(
+                data={"event_id": "a" * 32, "timestamp": min_ago, "user": {"id": "user1"}},
+                project_id=self.project.id,
+            )
+
+        event = Event(project_id=self.project.id, event_id="a" * 32)
+        self.eventstorage.bind_nodes([event], "data", lazy=True)
+        node_data = event.data.data
+        assert isinstance(node_data, LazyNodeData)
+        assert event.data["user"]["id"] == "user1"
+        # Only the keys that were accessed have been decoded
+        assert set(node_data._values) == {"user"}
+        assert event.data["timestamp"]
+
 
 class ServiceDelegationTest(TestCase, SnubaTestCase):
     def setUp(self):
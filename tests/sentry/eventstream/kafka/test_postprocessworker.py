@@ -1,15 +1,21 @@
-from unittest.mock import MagicMock, Mock, patch
+import time
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
+from confluent_kafka import TIMESTAMP_CREATE_TIME
 
 from sentry import options
 from sentry.eventstream.kafka.postprocessworker import (
+    _ADAPTIVE_CONCURRENCY_OPTION,
+    _BATCH_DISPATCH_OPTION,
     _CONCURRENCY_OPTION,
     ErrorsPostProcessForwarderWorker,
     PostProcessForwarderWorker,
     TransactionsPostProcessForwarderWorker,
+    get_adaptive_concurrency,
 )
 from sentry.eventstream.kafka.protocol import InvalidVersion
+from sentry.testutils.helpers import override_options
 from sentry.utils import json
 
 
@@ -160,6 +166,89 @@ def test_post_process_forwarder_concurrency(kafka_message_payload):
     forwarder.shutdown()
 
 
+@patch("sentry.eventstream.kafka.postprocessworker.post_process_group")
+def test_post_process_forwarder_batch_dispatch(
+    post_process_group, kafka_message_without_transaction_header
+):
+    """
+    Tests that in batch dispatch mode, the tasks of a batch are published in one chunk
+    per thread, with one producer per chunk.
+    """
+    producer = post_process_group.app.producer_or_acquire.return_value.__enter__.return_value
+    with override_options({_BATCH_DISPATCH_OPTION: True, _CONCURRENCY_OPTION: 2}):
+        forwarder = PostProcessForwarderWorker(concurrency=2)
+        batch = [
+            forwarder.process_message(kafka_message_without_transaction_header) for _ in range(3)
+        ]
+        assert batch == [kafka_message_without_transaction_header] * 3
+
+        forwarder.flush_batch(batch)
+
+    assert post_process_group.app.producer_or_acquire.call_count == 2
+    assert (
+        post_process_group.apply_async.call_args_list
+        == [
+            call(
+                kwargs={
+                    "is_new": False,
+                    "is_regression": None,
+                    "is_new_group_environment": False,
+                    "primary_hash": "311ee66a5b8e697929804ceb1c456ffe",
+                    "cache_key": "e:fe0ee9a2bc3b415497bad68aaf70dc7f:1",
+                    "group_id": 43,
+                },
+                producer=producer,
+            )
+        ]
+        * 3
+    )
+
+    forwarder.shutdown()
+
+
+@pytest.mark.parametrize(
+    "concurrency,publish_latency,lag,expected",
+    [
+        # Publishing is slow
+        (8, 1.0, 10.0, 6),
+        (2, 1.0, 10.0, 1),
+        (1, 1.0, 10.0, 1),
+        # The consumer is lagging behind
+        (2, 0.001, 10.0, 3),
+        (10, 0.001, 10.0, 10),
+        # Neither
+        (2, 0.001, 0.1, 2),
+        # The maximum was reduced
+        (12, 0.001, 0.1, 10),
+    ],
+)
+def test_get_adaptive_concurrency(concurrency, publish_latency, lag, expected):
+    assert get_adaptive_concurrency(concurrency, 10, publish_latency, lag) == expected
+
+
+@patch("sentry.eventstream.kafka.postprocessworker.dispatch_post_process_group_task")
+def test_post_process_forwarder_adaptive_concurrency(
+    dispatch_post_process_group_task, kafka_message_without_transaction_header
+):
+    """
+    Tests that with adaptive concurrency, threads are added while the consumer is
+    lagging behind, up to the concurrency option.
+    """
+    kafka_message_without_transaction_header.timestamp = MagicMock(
+        return_value=(TIMESTAMP_CREATE_TIME, int((time.time() - 60) * 1000))
+    )
+    with override_options({_ADAPTIVE_CONCURRENCY_OPTION: True, _CONCURRENCY_OPTION: 2}):
+        forwarder = PostProcessForwarderWorker(concurrency=1)
+        for expected_concurrency in (2, 2):
+            future = forwarder.process_message(kafka_message_without_transaction_header)
+            forwarder.flush_batch([future])
+            assert (
+                forwarder._PostProcessForwarderWorker__current_concurrency == expected_concurrency
+            )
+
+    forwarder.shutdown()
+
+
 @pytest.mark.django_db
 @patch("sentry.eventstream.kafka.postprocessworker.dispatch_post_process_group_task")
 def test_errors_post_process_forwarder_missing_headers(
@@ -1,26 +1,153 @@
+"""
+Benchmarks for the grouping pipeline.
+
+These are skipped unless pytest-benchmark is installed. Run them with::
+
+    pytest tests/sentry/grouping/test_benchmark.py --benchmark-only
+
+To catch throughput regressions of a grouping config change, first record a
+baseline on the unchanged tree, then re-run the benchmarks on the change::
+
+    SENTRY_GROUPING_BENCHMARK_WRITEBACK=1 pytest tests/sentry/grouping/test_benchmark.py
+    pytest tests/sentry/grouping/test_benchmark.py
+
+The baseline maps every benchmark to its mean duration and is stored in
+``.artifacts/grouping-benchmark-baseline.json`` (override with
+``SENTRY_GROUPING_BENCHMARK_BASELINE``). A benchmark fails if its mean is more
+than ``SENTRY_GROUPING_BENCHMARK_THRESHOLD`` (default ``0.2``, i.e. 20%) slower
+than the baseline. Timings are machine dependent, so only compare against
+baselines recorded on the same machine.
+"""
+import copy
+import itertools
+import os
+
 import pytest
 
-from sentry.grouping.api import get_default_grouping_config_dict
+import sentry.grouping.enhancer
+from sentry import eventstore
+from sentry.event_manager import EventManager, _calculate_event_grouping
+from sentry.grouping.api import (
+    apply_server_fingerprinting,
+    get_default_grouping_config_dict,
+    load_grouping_config,
+)
+from sentry.grouping.enhancer import ENHANCEMENT_BASES, Enhancements, _loads_cache
+from sentry.grouping.fingerprinting import FingerprintingRules
+from sentry.grouping.strategies.base import GroupingContext, lookup_strategy
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.stacktraces.processing import normalize_stacktraces_for_grouping
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json
+from tests.sentry.grouping import fingerprint_input as fingerprint_inputs
 from tests.sentry.grouping import grouping_input as grouping_inputs
+from tests.sentry.grouping.test_categorization import CONFIG as CATEGORIZATION_CONFIG
+from tests.sentry.grouping.test_categorization import INPUTS as categorization_inputs
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
+#: The strategies defined in ``sentry.grouping.strategies.newstyle``, mapped
+#: to the interfaces they are applied to.
+NEWSTYLE_STRATEGIES = {
+    "frame:v1": "frame",
+    "stacktrace:v1": "stacktrace",
+    "single-exception:v1": "single-exception",
+    "chained-exception:v1": "exception",
+    "threads:v1": "threads",
+}
 
-def benchmark_available():
-    try:
-        import pytest_benchmark  # NOQA
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
+_enhancement_configs_path = os.path.join(
+    os.path.dirname(sentry.grouping.enhancer.__file__), "enhancement-configs"
+)
 
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
-@pytest.mark.parametrize(
-    "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
+_baseline_path = os.environ.get("SENTRY_GROUPING_BENCHMARK_BASELINE") or os.path.join(
+    ".artifacts", "grouping-benchmark-baseline.json"
 )
-def test_benchmark_grouping(config_name, benchmark):
+_baseline_writeback = os.environ.get("SENTRY_GROUPING_BENCHMARK_WRITEBACK") == "1"
+_baseline_threshold = float(os.environ.get("SENTRY_GROUPING_BENCHMARK_THRESHOLD") or "0.2")
+
+
+def _ids(x):
+    return x.replace("-", "_").replace(":", "_")
+
+
+class BenchmarkBaseline:
+    """
+    Mean durations of a previous benchmark run, keyed by test id.
+    """
+
+    def __init__(self, path, writeback, threshold):
+        self.path = path
+        self.writeback = writeback
+        self.threshold = threshold
+        self.results = {}
+
+        try:
+            with open(path) as f:
+                self.results = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    def check(self, name, benchmark):
+        if benchmark.disabled:
+            return
+
+        mean = benchmark.stats.stats.mean
+        if self.writeback:
+            self.results[name] = mean
+            return
+
+        expected = self.results.get(name)
+        if expected is None:
+            return
+
+        assert mean <= expected * (1 + self.threshold), (
+            f"{name} regressed: mean {mean * 1000:.3f}ms is more than "
+            f"{self.threshold:.0%} slower than the baseline {expected * 1000:.3f}ms"
+        )
+
+    def save(self):
+        if not self.writeback:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.results, f)
+
+
+@pytest.fixture(scope="module")
+def benchmark_baseline():
+    baseline = BenchmarkBaseline(_baseline_path, _baseline_writeback, _baseline_threshold)
+    yield baseline
+    baseline.save()
+
+
+@pytest.fixture
+def check_baseline(request, benchmark, benchmark_baseline):
+    def inner():
+        benchmark_baseline.check(request.node.name, benchmark)
+
+    return inner
+
+
+def run_cycled(benchmark, func, inputs):
+    """
+    Runs ``func`` once per input. ``inputs`` is a list of argument tuples
+    whose first item is the event data, which is mutated by ``func`` and
+    therefore deep-copied outside of the timed section.
+    """
+    input_iter = itertools.cycle(inputs)
+
+    def setup():
+        data, *args = next(input_iter)
+        return (copy.deepcopy(data), *args), {}
+
+    benchmark.pedantic(func, setup=setup, rounds=len(inputs))
+
+
+@requires_benchmark
+@pytest.mark.parametrize("config_name", sorted(CONFIGURATIONS.keys()), ids=_ids)
+def test_benchmark_grouping(config_name, benchmark, check_baseline):
     config = CONFIGS[config_name]
     input_iter = iter(grouping_inputs)
 
@@ -28,6 +155,7 @@ def test_benchmark_grouping(config_name, benchmark):
         return (next(input_iter), config), {}
 
     benchmark.pedantic(run_configuration, setup=setup, rounds=len(grouping_inputs))
+    check_baseline()
 
 
 def run_configuration(grouping_input, config):
@@ -37,3 +165,141 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+@requires_benchmark
+@pytest.mark.parametrize("base", sorted(ENHANCEMENT_BASES), ids=_ids)
+def test_benchmark_enhancer_parse(base, benchmark, check_baseline):
+    # We cannot use `:` in filenames on Windows, see `_load_configs`.
+    filename = base.replace(":", "@") + ".txt"
+    with open(os.path.join(_enhancement_configs_path, filename), encoding="utf-8") as f:
+        config_string = f.read()
+
+    benchmark(Enhancements.from_config_string, config_string, id=base)
+    check_baseline()
+
+
+@requires_benchmark
+@pytest.mark.parametrize("config_name", sorted(CONFIGURATIONS.keys()), ids=_ids)
+def test_benchmark_enhancer_loads(config_name, benchmark, check_baseline):
+    enhancements = CONFIGS[config_name]["enhancements"]
+
+    def setup():
+        # Measure decoding, not the cache lookup.
+        _loads_cache.clear()
+        return (enhancements,), {}
+
+    benchmark.pedantic(Enhancements.loads, setup=setup, rounds=100)
+    check_baseline()
+
+
+@requires_benchmark
+def test_benchmark_enhancer_apply(benchmark, check_baseline):
+    inputs = [(input.data, CATEGORIZATION_CONFIG) for input in categorization_inputs]
+    run_cycled(benchmark, normalize_stacktraces_for_grouping, inputs)
+    check_baseline()
+
+
+def _get_fingerprinting_input(fingerprint_input):
+    data = dict(fingerprint_input.data)
+    rules = FingerprintingRules.from_json(
+        {"rules": data.pop("_fingerprinting_rules"), "version": 1}
+    )
+    mgr = EventManager(data=data)
+    mgr.normalize()
+    data = mgr.get_data()
+    data.setdefault("fingerprint", ["{{ default }}"])
+    return data, rules
+
+
+@requires_benchmark
+def test_benchmark_fingerprinting(benchmark, check_baseline):
+    inputs = [_get_fingerprinting_input(input) for input in fingerprint_inputs]
+    run_cycled(benchmark, apply_server_fingerprinting, inputs)
+    check_baseline()
+
+
+def _iter_interfaces(event, interface):
+    exception = event.interfaces.get("exception")
+    exceptions = exception.exceptions() if exception is not None else []
+
+    if interface == "single-exception":
+        yield from exceptions
+        return
+
+    if interface != "frame":
+        rv = event.interfaces.get(interface)
+        if rv is not None:
+            yield rv
+        return
+
+    stacktraces = [exc.stacktrace for exc in exceptions]
+    stacktraces.append(event.interfaces.get("stacktrace"))
+    for stacktrace in stacktraces:
+        if stacktrace is not None:
+            yield from stacktrace.frames
+
+
+def _get_strategy_inputs(strategy_id, config):
+    inputs = []
+    for grouping_input in grouping_inputs:
+        event = grouping_input.create_event(config)
+        event.project = None
+        for interface in _iter_interfaces(event, NEWSTYLE_STRATEGIES[strategy_id]):
+            inputs.append((interface, event))
+    return inputs
+
+
+@requires_benchmark
+@pytest.mark.parametrize("strategy_id", sorted(NEWSTYLE_STRATEGIES), ids=_ids)
+def test_benchmark_strategy(strategy_id, benchmark, check_baseline):
+    config_dict = get_default_grouping_config_dict()
+    config = load_grouping_config(config_dict)
+    strategy = lookup_strategy(strategy_id)
+    inputs = _get_strategy_inputs(strategy_id, config_dict)
+    if not inputs:
+        pytest.skip(f"no grouping inputs for {strategy_id}")
+
+    input_iter = itertools.cycle(inputs)
+
+    def setup():
+        return next(input_iter), {}
+
+    def run(interface, event):
+        context = GroupingContext(config)
+        if strategy.score is None:
+            # Delegates are only ever invoked for a specific variant.
+            for variant in ("system", "app"):
+                with context:
+                    context["variant"] = variant
+                    strategy(interface, event=event, context=context)
+        else:
+            strategy.get_grouping_component_variants(event, context)
+
+    benchmark.pedantic(run, setup=setup, rounds=len(inputs))
+    check_baseline()
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("config_name", sorted(CONFIGURATIONS.keys()), ids=_ids)
+def test_benchmark_calculate_event_grouping(
+    config_name, default_project, benchmark, check_baseline
+):
+    config = CONFIGS[config_name]
+    inputs = []
+    for grouping_input in grouping_inputs:
+        data = dict(grouping_input.data)
+        data.pop("_grouping", None)
+        mgr = EventManager(data=data, grouping_config=config)
+        mgr.normalize()
+        inputs.append(mgr.get_data())
+
+    input_iter = itertools.cycle(inputs)
+
+    def setup():
+        event = eventstore.create_event(data=copy.deepcopy(next(input_iter)))
+        return (default_project, event, config), {}
+
+    benchmark.pedantic(_calculate_event_grouping, setup=setup, rounds=len(inputs))
+    check_baseline()
@@ -2,6 +2,7 @@ import pytest
 
 from sentry.grouping.component import GroupingComponent
 from sentry.grouping.enhancer import Enhancements, InvalidEnhancerConfig, create_match_frame
+from sentry.grouping.enhancer.index import RuleIndex
 
 
 def dump_obj(obj):
@@ -418,3 +419,76 @@ def test_sentinel_and_prefix(action, type):
     actions[0][1].update_frame_components_contributions([component], frames, 0)
     expected = True if action == "+" else False
     assert getattr(component, f"is_{type}_frame") is expected
+
+
+def test_rule_index_candidates():
+    enhancement = Enhancements.from_config_string(
+        """
+        function:std::*                                -app
+        family:native module:core::*                   -group
+        family:javascript                              +group
+        !function:std::*                               +app
+        [ function:foo ] | function:bar                ^-group
+        """
+    )
+    frames = [
+        create_match_frame(frame, "native")
+        for frame in [
+            {"function": "std::panic"},
+            {"function": "bar", "module": "core::fmt"},
+            {"function": "main"},
+        ]
+    ]
+
+    candidates = {
+        str(rule.matcher_description): indices
+        for rule, indices in RuleIndex(enhancement.rules).iter_candidates(frames)
+    }
+    assert candidates == {
+        "function:std::* -app": [0],
+        "family:native module:core::* -group": [1],
+        "!function:std::* +app": None,
+        "[ function:foo ] | function:bar ^-group": [1],
+    }
+
+
+def test_rule_index_matches_all_rules():
+    enhancement = Enhancements.from_config_string(
+        """
+        function:std::*                                -app
+        family:native function:core::*                 -group
+        family:native !function:core::fmt::*           +group
+        module:core::fmt::*                            v-group
+        function:rust_begin_unwind                     ^-group
+        function:*panic*                               -app
+        """
+    )
+    frames = [
+        {"function": "std::rt::lang_start", "in_app": True},
+        {"function": "core::fmt::write", "module": "core::fmt::write"},
+        {"function": "rust_begin_unwind"},
+        {"function": "my_crate::do_panic", "in_app": True},
+        {"function": "main", "platform": "javascript"},
+    ]
+
+    def apply(use_index):
+        components = [GroupingComponent(id="frame", contributes=True) for _ in frames]
+        match_frames = [create_match_frame(frame, "native") for frame in frames]
+        rules = enhancement._updater_rules
+        if use_index:
+            candidates = enhancement._updater_index.iter_candidates(match_frames)
+        else:
+            candidates = [(rule, None) for rule in rules]
+        for rule, frame_indices in candidates:
+            for idx, action in rule.get_matching_frame_actions(
+                match_frames, "native", None, {}, frame_indices
+            ):
+                action.update_frame_components_contributions(components, frames, idx, rule=rule)
+        return [(c.contributes, c.hint) for c in components]
+
+    assert apply(use_index=True) == apply(use_index=False)
+
+
+def test_loads_is_cached():
+    config = Enhancements.from_config_string("function:foo -app").dumps()
+    assert Enhancements.loads(config) is Enhancements.loads(config)
@@ -184,3 +184,50 @@ def test_event_hash_variant(insta_snapshot, input):
             },
         }
     )
+
+
+def test_compiled_rules():
+    rules = FingerprintingRules.from_config_string(
+        """
+type:DatabaseUnavailable -> database-unavailable
+value:"*timeout*" -> timeout
+level:ERROR logger:sentry.* -> sentry-error
+function:foo* app:yes -> foo-in-app
+!type:DatabaseUnavailable -> fallback
+"""
+    )
+    compiled = rules.compiled
+    assert compiled._unindexed == [1, 4]
+
+    def get_fingerprint(event):
+        return rules.get_fingerprint_values_for_event(event)[1]
+
+    assert get_fingerprint({"exception": {"values": [{"type": "DatabaseUnavailable"}]}}) == [
+        "database-unavailable"
+    ]
+    assert get_fingerprint(
+        {"exception": {"values": [{"type": "DatabaseUnavailable", "value": "Timeout"}]}}
+    ) == ["database-unavailable"]
+    assert get_fingerprint(
+        {"exception": {"values": [{"type": "Error", "value": "Connection Timeout"}]}}
+    ) == ["timeout"]
+    assert get_fingerprint({"level": "error", "logger": "sentry.tasks"}) == ["sentry-error"]
+    assert rules.get_fingerprint_values_for_event({"level": "error", "logger": "celery"}) is None
+    assert get_fingerprint(
+        {"level": "error", "logger": "celery", "exception": {"values": [{"type": "Error"}]}}
+    ) == ["fallback"]
+    assert (
+        get_fingerprint(
+            {
+                "exception": {
+                    "values": [
+                        {
+                            "type": "DatabaseUnavailable",
+                            "stacktrace": {"frames": [{"function": "foobar", "in_app": True}]},
+                        }
+                    ]
+                }
+            }
+        )
+        == ["database-unavailable"]
+    )
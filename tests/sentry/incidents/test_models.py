@@ -78,6 +78,31 @@ class IncidentGetForSubscriptionTest(TestCase):
         assert AlertRule.objects.get_for_subscription(subscription) == alert_rule
 
 
+class IncidentGetForSubscriptionsTest(TestCase):
+    def test(self):
+        alert_rule = self.create_alert_rule()
+        subscription = alert_rule.snuba_query.subscriptions.get()
+        other_alert_rule = self.create_alert_rule()
+        other_subscription = other_alert_rule.snuba_query.subscriptions.get()
+        AlertRule.objects.get_for_subscription(subscription)
+        # Only the subscription that isn't cached is fetched from the database
+        with self.assertNumQueries(1):
+            assert AlertRule.objects.get_for_subscriptions([subscription, other_subscription]) == {
+                subscription.id: alert_rule,
+                other_subscription.id: other_alert_rule,
+            }
+        assert (
+            cache.get(AlertRule.objects.CACHE_SUBSCRIPTION_KEY % other_subscription.id)
+            == other_alert_rule
+        )
+
+    def test_no_alert_rule(self):
+        alert_rule = self.create_alert_rule()
+        subscription = alert_rule.snuba_query.subscriptions.get()
+        delete_alert_rule(alert_rule)
+        assert AlertRule.objects.get_for_subscriptions([subscription]) == {}
+
+
 class IncidentClearSubscriptionCacheTest(TestCase):
     def setUp(self):
         self.alert_rule = self.create_alert_rule()
@@ -161,6 +186,47 @@ class AlertRuleTriggerClearCacheTest(TestCase):
         ) is None
 
 
+class AlertRuleTriggerGetForAlertRulesTest(TestCase):
+    def test(self):
+        alert_rule = self.create_alert_rule()
+        trigger = self.create_alert_rule_trigger(alert_rule)
+        other_alert_rule = self.create_alert_rule()
+        AlertRuleTrigger.objects.get_for_alert_rule(alert_rule)
+        with self.assertNumQueries(1):
+            assert AlertRuleTrigger.objects.get_for_alert_rules([alert_rule, other_alert_rule]) == {
+                alert_rule.id: [trigger],
+                other_alert_rule.id: [],
+            }
+        assert (
+            cache.get(AlertRuleTrigger.objects._build_trigger_cache_key(other_alert_rule.id)) == []
+        )
+
+
+class IncidentGetActiveIncidentsTest(TestCase):
+    def test(self):
+        alert_rule = self.create_alert_rule()
+        other_alert_rule = self.create_alert_rule()
+        project = self.create_project()
+        incident = self.create_incident(alert_rule=alert_rule, projects=[self.project])
+        self.create_incident(
+            alert_rule=alert_rule, projects=[project], status=IncidentStatus.CLOSED.value
+        )
+        pairs = [
+            (alert_rule, self.project),
+            (alert_rule, project),
+            (other_alert_rule, self.project),
+        ]
+        assert Incident.objects.get_active_incidents(pairs) == {
+            (alert_rule.id, self.project.id): incident,
+            (alert_rule.id, project.id): None,
+            (other_alert_rule.id, self.project.id): None,
+        }
+        # The results are cached like those of `get_active_incident`
+        with self.assertNumQueries(0):
+            for pair_alert_rule, pair_project in pairs:
+                Incident.objects.get_active_incident(pair_alert_rule, pair_project)
+
+
 class ActiveIncidentClearCacheTest(TestCase):
     def setUp(self):
         self.alert_rule = self.create_alert_rule()
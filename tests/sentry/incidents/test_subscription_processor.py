@@ -34,8 +34,11 @@ from sentry.incidents.subscription_processor import (
     build_alert_rule_trigger_stat_key,
     build_trigger_stat_keys,
     get_alert_rule_stats,
+    get_alert_rule_stats_many,
     get_redis_client,
     partition,
+    prefetch_comparison_values,
+    process_updates,
     update_alert_rule_stats,
 )
 from sentry.models import Integration
@@ -47,6 +50,7 @@ from sentry.testutils.cases import SessionMetricsTestCase
 from sentry.testutils.helpers.datetime import iso_format
 from sentry.utils import json
 from sentry.utils.dates import to_timestamp
+from sentry.utils.snuba import bulk_raw_query
 
 EMPTY = object()
 
@@ -389,6 +393,71 @@ class ProcessUpdateTest(ProcessUpdateBaseClass):
         self.assert_trigger_exists_with_status(incident, self.trigger, TriggerStatus.ACTIVE)
         self.assert_actions_fired_for_incident(incident, [self.action])
 
+    def test_process_updates(self):
+        # Verify that a batch of updates is processed like the same updates sent one at
+        # a time, with the state of a subscription carried over between its updates
+        rule = self.rule
+        rule.update(threshold_period=2)
+        trigger = self.trigger
+        updates = [
+            (
+                self.build_subscription_update(
+                    subscription, value=trigger.alert_threshold + 1, time_delta=time_delta
+                ),
+                subscription,
+            )
+            for subscription, time_delta in (
+                (self.sub, timedelta(minutes=-2)),
+                (self.other_sub, timedelta(minutes=-1)),
+                (self.sub, timedelta(minutes=-1)),
+            )
+        ]
+        with self.feature(
+            ["organizations:incidents", "organizations:performance-view"]
+        ), self.capture_on_commit_callbacks(execute=True):
+            process_updates(updates)
+
+        incident = self.assert_active_incident(rule)
+        self.assert_trigger_exists_with_status(incident, self.trigger, TriggerStatus.ACTIVE)
+        self.assert_actions_fired_for_incident(incident, [self.action])
+        self.assert_no_active_incident(rule, self.other_sub)
+        assert get_alert_rule_stats(rule, self.sub, [trigger])[1] == {trigger.id: 0}
+        assert get_alert_rule_stats(rule, self.other_sub, [trigger])[1] == {trigger.id: 1}
+
+    def test_process_updates_failure(self):
+        # Verify that the stats of the updates processed before a failing update are
+        # still written
+        rule = self.rule
+        rule.update(threshold_period=2)
+        trigger = self.trigger
+        updates = [
+            (
+                self.build_subscription_update(
+                    subscription, value=trigger.alert_threshold + 1, time_delta=time_delta
+                ),
+                subscription,
+            )
+            for subscription, time_delta in (
+                (self.sub, timedelta(minutes=-2)),
+                (self.other_sub, timedelta(minutes=-1)),
+            )
+        ]
+        process_update = SubscriptionProcessor.process_update
+
+        def fail_other_sub(processor, subscription_update):
+            if processor.subscription == self.other_sub:
+                raise Exception("Boom!")
+            return process_update(processor, subscription_update)
+
+        with self.feature(["organizations:incidents", "organizations:performance-view"]):
+            with patch.object(
+                SubscriptionProcessor, "process_update", autospec=True, side_effect=fail_other_sub
+            ), self.assertRaises(Exception):
+                process_updates(updates)
+
+        assert get_alert_rule_stats(rule, self.sub, [trigger])[1] == {trigger.id: 1}
+        assert get_alert_rule_stats(rule, self.other_sub, [trigger])[1] == {trigger.id: 0}
+
     def test_alert_multiple_triggers_non_consecutive(self):
         # Verify that a rule that expects two consecutive updates to be over the
         # alert threshold doesn't trigger if there are two updates that are above with
@@ -1254,6 +1323,46 @@ class ProcessUpdateTest(ProcessUpdateBaseClass):
         self.assert_trigger_exists_with_status(incident, trigger, TriggerStatus.RESOLVED)
         self.assert_actions_resolved_for_incident(incident, [self.action])
 
+    def test_comparison_alert_prefetch(self):
+        rule = self.comparison_rule_above
+        comparison_delta = timedelta(seconds=rule.comparison_delta)
+        trigger = self.trigger
+        comparison_date = timezone.now() - comparison_delta
+        for i in range(4):
+            self.store_event(
+                data={"timestamp": iso_format(comparison_date - timedelta(minutes=30 + i))},
+                project_id=self.project.id,
+            )
+
+        updates = [
+            (
+                self.build_subscription_update(
+                    self.sub, value=value, time_delta=timedelta(minutes=-minutes)
+                ),
+                self.sub,
+            )
+            for value, minutes in ((2, 9), (7, 8))
+        ]
+        with patch(
+            "sentry.incidents.subscription_processor.bulk_raw_query", wraps=bulk_raw_query
+        ) as bulk_query:
+            prefetch_comparison_values(updates)
+            assert bulk_query.call_count == 1
+            assert len(bulk_query.call_args[0][0]) == 2
+
+            with self.feature(
+                ["organizations:incidents", "organizations:performance-view"]
+            ), self.capture_on_commit_callbacks(execute=True):
+                for update, subscription in updates:
+                    SubscriptionProcessor(subscription).process_update(update)
+            # The processors use the prefetched comparison values
+            assert bulk_query.call_count == 1
+
+        # 7/4 == 175% > 150%
+        incident = self.assert_active_incident(rule)
+        self.assert_trigger_exists_with_status(incident, trigger, TriggerStatus.ACTIVE)
+        self.assert_actions_fired_for_incident(incident, [self.action])
+
     def test_comparison_alert_different_aggregate(self):
         rule = self.comparison_rule_above
         update_alert_rule(rule, aggregate="count_unique(tags[sentry:user])")
@@ -1785,6 +1894,25 @@ class TestGetAlertRuleStats(TestCase):
         assert resolve_counts == {3: 2, 4: 4}
 
 
+class TestGetAlertRuleStatsMany(TestCase):
+    def test(self):
+        alert_rule = AlertRule(id=1)
+        sub = QuerySubscription(project_id=2)
+        other_sub = QuerySubscription(project_id=3)
+        triggers = [AlertRuleTrigger(id=4)]
+        timestamp = datetime.now().replace(tzinfo=pytz.utc, microsecond=0)
+        update_alert_rule_stats(alert_rule, sub, timestamp, {4: 1}, {4: 2})
+
+        stats = get_alert_rule_stats_many(
+            [(alert_rule, sub, triggers), (alert_rule, other_sub, triggers)]
+        )
+        assert stats == [
+            get_alert_rule_stats(alert_rule, sub, triggers),
+            get_alert_rule_stats(alert_rule, other_sub, triggers),
+        ]
+        assert stats[0] == (timestamp, {4: 1}, {4: 2})
+
+
 class TestUpdateAlertRuleStats(TestCase):
     def test(self):
         alert_rule = AlertRule(id=1)
@@ -1808,3 +1936,14 @@ class TestUpdateAlertRuleStats(TestCase):
         )
 
         assert results == [int(to_timestamp(date)), 20, 10, 3, 15]
+
+    def test_pipeline(self):
+        alert_rule = AlertRule(id=1)
+        sub = QuerySubscription(project_id=2)
+        date = datetime.utcnow().replace(tzinfo=pytz.utc)
+        client = get_redis_client()
+        pipeline = client.pipeline()
+        update_alert_rule_stats(alert_rule, sub, date, {3: 20}, {3: 10}, pipeline=pipeline)
+        assert client.get("{alert_rule:1:project:2}:last_update") is None
+        pipeline.execute()
+        assert int(client.get("{alert_rule:1:project:2}:last_update")) == int(to_timestamp(date))
@@ -1,16 +1,19 @@
 import datetime
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
 import pytest
 
 from sentry.event_manager import EventManager
 from sentry.ingest.ingest_consumer import (
+    IngestConsumerWorker,
     process_attachment_chunk,
     process_event,
     process_individual_attachment,
     process_userreport,
+    shard_messages,
 )
 from sentry.models import EventAttachment, EventUser, File, UserReport
 from sentry.utils import json
@@ -370,3 +373,49 @@ def test_individual_attachments_missing_chunks(default_project, factories, monke
     attachments = list(EventAttachment.objects.filter(project_id=project_id, event_id=event_id))
 
     assert not attachments
+
+
+def test_shard_messages_keeps_project_order():
+    messages = [
+        {"type": "event", "project_id": 1, "event_id": "a"},
+        {"type": "event", "project_id": 2, "event_id": "b"},
+        {"type": "event", "project_id": 3, "event_id": "c"},
+        {"type": "event", "project_id": 1, "event_id": "d"},
+    ]
+
+    shards = shard_messages(messages, 2)
+
+    assert [[m["event_id"] for m in shard] for shard in shards] == [["b"], ["a", "c", "d"]]
+    assert shard_messages(messages, 1) == [messages]
+    assert shard_messages([], 4) == []
+
+
+def test_sharded_flush_processes_chunks_first(monkeypatch):
+    processed = []
+
+    def process_message_shard(messages):
+        processed.append([m["type"] for m in messages])
+        return 0.0, len(messages)
+
+    monkeypatch.setattr(
+        "sentry.ingest.ingest_consumer.process_message_shard", process_message_shard
+    )
+
+    worker = IngestConsumerWorker(process_pool_executor=ThreadPoolExecutor(1), process_pool_size=1)
+    worker.flush_batch(
+        [
+            {"type": "event", "project_id": 1},
+            {"type": "attachment_chunk", "project_id": 1},
+            {"type": "user_report", "project_id": 1},
+        ]
+    )
+    worker.shutdown()
+
+    assert processed == [["attachment_chunk"], ["event", "user_report"]]
+
+
+def test_sharded_flush_rejects_unknown_message_type():
+    worker = IngestConsumerWorker(process_pool_executor=ThreadPoolExecutor(1), process_pool_size=1)
+    with pytest.raises(ValueError):
+        worker.flush_batch([{"type": "unknown", "project_id": 1}])
+    worker.shutdown()
@@ -25,6 +25,8 @@ from sentry.lang.javascript.processor import (
     fetch_release_file,
     fetch_sourcemap,
     generate_module,
+    get_artifact_index,
+    get_fetch_pool,
     get_max_age,
     get_release_file_cache_key,
     get_release_file_cache_key_meta,
@@ -624,10 +626,10 @@ class FetchFileTest(TestCase):
         cache_get.reset_mock()
         cache_set.reset_mock()
 
-        # Still no archive, cache is only read
+        # Still no archive, the parsed index is kept in memory
         result = fetch_release_archive_for_url(release, dist=None, url="foo")
         assert result is None
-        assert len(relevant_calls(cache_get, "artifact-index")) == 1
+        assert len(relevant_calls(cache_get, "artifact-index")) == 0
         assert len(relevant_calls(cache_set, "artifact-index")) == 0
         assert len(relevant_calls(cache_get, "releasefile")) == 0
         assert len(relevant_calls(cache_set, "releasefile")) == 0
@@ -648,26 +650,42 @@ class FetchFileTest(TestCase):
         cache_get.reset_mock()
         cache_set.reset_mock()
 
-        # Second time, get it from cache
+        # Second time, get it from cache (the index is kept in memory)
         result = fetch_release_archive_for_url(release2, dist=None, url="foo")
         assert result is not None
-        assert len(relevant_calls(cache_get, "artifact-index")) == 1
+        assert len(relevant_calls(cache_get, "artifact-index")) == 0
         assert len(relevant_calls(cache_set, "artifact-index")) == 0
         assert len(relevant_calls(cache_get, "releasefile")) == 1
         assert len(relevant_calls(cache_set, "releasefile")) == 0
         cache_get.reset_mock()
         cache_set.reset_mock()
 
-        # For other file, get cached manifest but no release file
+        # For other file, get in-memory manifest but no release file
         result = fetch_release_archive_for_url(release2, dist=None, url="bar")
         assert result is None
-        assert len(relevant_calls(cache_get, "artifact-index")) == 1
+        assert len(relevant_calls(cache_get, "artifact-index")) == 0
         assert len(relevant_calls(cache_set, "artifact-index")) == 0
         assert len(relevant_calls(cache_get, "releasefile")) == 0
         assert len(relevant_calls(cache_set, "releasefile")) == 0
         cache_get.reset_mock()
         cache_set.reset_mock()
 
+    def test_artifact_index_local_cache(self):
+        release = Release.objects.create(version="1", organization_id=self.project.organization_id)
+        self._create_archive(release, "~/foo.js")
+
+        index = get_artifact_index(release, None)
+        assert get_artifact_index(release, None) is index
+        assert index.get_entry("http://example.com/foo.js?v=1") is not None
+        assert index.get_entry("http://example.com/bar.js") is None
+
+        release2 = Release.objects.create(version="2", organization_id=self.project.organization_id)
+        self._create_archive(release2, "~/foo.js")
+        with patch("sentry.lang.javascript.processor.ARTIFACT_INDEX_LOCAL_TTL", 0):
+            index2 = get_artifact_index(release2, None)
+        # Expired entries are decoded again from the shared cache
+        assert get_artifact_index(release2, None) is not index2
+
     @patch("sentry.lang.javascript.processor.CACHE_MAX_VALUE_SIZE", 9)
     @patch("sentry.lang.javascript.processor.cache.set", side_effect=cache.set)
     def test_archive_too_large_for_mem_cache(self, cache_set):
@@ -1023,6 +1041,26 @@ class FetchSourcemapTest(TestCase):
         with pytest.raises(UnparseableSourcemap):
             fetch_sourcemap("http://example.com")
 
+    @responses.activate
+    def test_parsed_view_is_cached(self):
+        smap = {"version": 3, "sources": ["/test.js"], "names": [], "mappings": ";AAAA"}
+        responses.add(
+            responses.GET, "http://example.com/a.js.map", body=json.dumps(smap), status=200
+        )
+        responses.add(
+            responses.GET,
+            "http://example.com/b.js.map",
+            body=json.dumps(dict(smap, sources=["/other.js"])),
+            status=200,
+        )
+
+        smap_view = fetch_sourcemap("http://example.com/a.js.map")
+        assert fetch_sourcemap("http://example.com/a.js.map") is smap_view
+
+        other_view = fetch_sourcemap("http://example.com/b.js.map")
+        assert other_view is not smap_view
+        assert other_view.get_source_name(0) == "/other.js"
+
 
 class TrimLineTest(unittest.TestCase):
     long_line = "The public is more familiar with bad design than good design. It is, in effect, conditioned to prefer bad design, because that is what it lives with. The new becomes threatening, the old reassuring."
@@ -1372,3 +1410,98 @@ class CacheSourceTest(TestCase):
         # now we have an error
         assert len(processor.cache.get_errors(abs_path)) == 1
         assert processor.cache.get_errors(abs_path)[0] == {"url": map_url, "type": "js_no_source"}
+
+
+class PopulateSourceCacheTest(TestCase):
+    def get_processor(self, max_fetches=None):
+        processor = JavaScriptStacktraceProcessor(
+            data={}, stacktrace_infos=None, project=self.create_project()
+        )
+        if max_fetches is not None:
+            processor.max_fetches = max_fetches
+        return processor
+
+    def fetch_file(self, url, **kwargs):
+        if "missing" in url:
+            raise http.BadSource({"type": EventError.JS_MISSING_SOURCE, "url": url})
+        body = b"console.log(1)\n//# sourceMappingURL=" + url.rsplit("/", 1)[1].encode()
+        if "shared" in url:
+            body = b"console.log(1)\n//# sourceMappingURL=shared.js.map"
+        return http.UrlResult(url, {}, body, 200, None)
+
+    def populate(self, processor, abs_paths, concurrency):
+        frames = [{"abs_path": abs_path} for abs_path in abs_paths]
+        with override_options({"processing.javascript.fetch-concurrency": concurrency}), patch(
+            "sentry.lang.javascript.processor.fetch_file", side_effect=self.fetch_file
+        ), patch(
+            "sentry.lang.javascript.processor.fetch_sourcemap",
+            side_effect=http.BadSource({"type": EventError.JS_INVALID_SOURCEMAP}),
+        ) as fetch_sourcemap:
+            processor.populate_source_cache(frames)
+        return fetch_sourcemap
+
+    def test_concurrent_fetch(self):
+        abs_paths = [
+            "http://example.com/a.js",
+            "http://example.com/missing.js",
+            "http://example.com/shared-1.js",
+            "http://example.com/shared-2.js",
+            "http://example.com/a.js",
+        ]
+
+        serial = self.get_processor()
+        self.populate(serial, abs_paths, concurrency=1)
+
+        concurrent = self.get_processor()
+        fetch_sourcemap = self.populate(concurrent, abs_paths, concurrency=4)
+
+        # The shared source map is only fetched once
+        assert sorted(c[0][0] for c in fetch_sourcemap.call_args_list) == [
+            "http://example.com/a.js",
+            "http://example.com/shared.js.map",
+        ]
+        assert concurrent.fetch_count == serial.fetch_count == 4
+
+        for abs_path in abs_paths:
+            assert concurrent.cache.get_errors(abs_path) == serial.cache.get_errors(abs_path)
+            assert concurrent.sourcemaps.get_link(abs_path) == serial.sourcemaps.get_link(abs_path)
+            assert (concurrent.cache.get(abs_path) is None) == (serial.cache.get(abs_path) is None)
+
+        assert concurrent.cache.get_errors("http://example.com/shared-2.js") == [
+            {"type": EventError.JS_INVALID_SOURCEMAP}
+        ]
+
+    def test_max_fetches(self):
+        abs_paths = [f"http://example.com/missing-{i}.js" for i in range(5)]
+
+        processor = self.get_processor(max_fetches=3)
+        self.populate(processor, abs_paths, concurrency=4)
+
+        for abs_path in abs_paths[:3]:
+            assert processor.cache.get_errors(abs_path) == [
+                {"type": EventError.JS_MISSING_SOURCE, "url": abs_path}
+            ]
+        for abs_path in abs_paths[3:]:
+            assert processor.cache.get_errors(abs_path) == [
+                {"type": EventError.JS_TOO_MANY_REMOTE_SOURCES}
+            ]
+
+    def test_shared_pool(self):
+        abs_paths = ["http://example.com/missing-1.js", "http://example.com/missing-2.js"]
+
+        with override_options({"processing.javascript.fetch-concurrency": 4}):
+            pool = get_fetch_pool()
+            assert get_fetch_pool() is pool
+
+        with patch("sentry.lang.javascript.processor.connections.close_all") as close_all, patch(
+            "sentry.lang.javascript.processor.ThreadPoolExecutor"
+        ) as executor:
+            self.populate(self.get_processor(), abs_paths, concurrency=4)
+
+        # The pool of the first event is reused, and pool threads close their
+        # database connections after each fetch.
+        assert not executor.called
+        assert close_all.call_count == len(abs_paths)
+
+        with override_options({"processing.javascript.fetch-concurrency": 2}):
+            assert get_fetch_pool() is not pool
@@ -0,0 +1,68 @@
+import zlib
+
+import pytest
+import zstandard
+
+from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.compression import NodeCompressor
+from sentry.testutils.skips import requires_benchmark
+from tests.sentry.grouping import grouping_input as grouping_inputs
+
+
+def encode(data):
+    return NodeStorage._encode(None, {None: data})
+
+
+# Train on half of the inputs and measure on the other half, so the
+# dictionary has not seen the payloads it is measured on.
+TRAINING_PAYLOADS = [encode(i.data) for i in grouping_inputs[::2]]
+PAYLOADS = [encode(i.data) for i in grouping_inputs[1::2]]
+
+
+def get_codecs():
+    compressor = NodeCompressor()
+    dictionary_compressor = NodeCompressor(
+        {"default": zstandard.train_dictionary(16384, TRAINING_PAYLOADS)}
+    )
+    return {
+        "json": (lambda value: value, lambda value: value),
+        "zlib": (zlib.compress, zlib.decompress),
+        "zstd": (compressor.compress, compressor.decompress),
+        "zstd_dictionary": (dictionary_compressor.compress, dictionary_compressor.decompress),
+    }
+
+
+CODECS = get_codecs()
+
+
+def record_ratio(benchmark, encode):
+    raw_size = sum(len(payload) for payload in PAYLOADS)
+    encoded_size = sum(len(encode(payload)) for payload in PAYLOADS)
+    benchmark.extra_info["ratio"] = raw_size / encoded_size
+
+
+@requires_benchmark
+@pytest.mark.parametrize("codec", sorted(CODECS.keys()))
+def test_benchmark_nodestore_encode(codec, benchmark):
+    encode, _ = CODECS[codec]
+    record_ratio(benchmark, encode)
+
+    def run():
+        for payload in PAYLOADS:
+            encode(payload)
+
+    benchmark(run)
+
+
+@requires_benchmark
+@pytest.mark.parametrize("codec", sorted(CODECS.keys()))
+def test_benchmark_nodestore_decode(codec, benchmark):
+    encode, decode = CODECS[codec]
+    record_ratio(benchmark, encode)
+    encoded = [encode(payload) for payload in PAYLOADS]
+
+    def run():
+        for value in encoded:
+            decode(value)
+
+    benchmark(run)
@@ -5,8 +5,11 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 from contextlib import contextmanager
 
 import pytest
+from django.test import override_settings
 
+from sentry.nodestore.compression import ZSTD_HEADER
 from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.nodestore.indexed import INDEXED_HEADER, LazyNodeData
 from tests.sentry.nodestore.bigtable.backend.tests import (
     MockedBigtableNodeStorage,
     get_temporary_bigtable_nodestorage,
@@ -97,3 +100,36 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+def test_set_compressed(ns):
+    node_id = "d2502ebbd7df41ceba8d3275595cac33"
+    data = {"foo": "bar", "platform": "python"}
+    with override_settings(SENTRY_NODESTORE_COMPRESSION="zstd"):
+        ns.set_subkeys(node_id, {None: data, "other": {"foo": "baz"}})
+        assert ns._get_bytes(node_id).startswith(ZSTD_HEADER)
+        ns._delete_cache_item(node_id)
+        assert ns.get(node_id) == data
+
+    # Compressed payloads are readable regardless of the setting.
+    ns._delete_cache_item(node_id)
+    assert ns.get(node_id) == data
+    assert ns.get(node_id, subkey="other") == {"foo": "baz"}
+
+
+def test_set_indexed(ns):
+    node_id = "d2502ebbd7df41ceba8d3275595cac33"
+    data = {"foo": "bar", "baz": [1, 2]}
+    with override_settings(SENTRY_NODESTORE_INDEXED_PAYLOADS=True):
+        ns.set_subkeys(node_id, {None: data, "other": {"foo": "baz"}})
+
+    assert ns._get_bytes(node_id).startswith(INDEXED_HEADER)
+    ns._delete_cache_item(node_id)
+    assert ns.get(node_id) == data
+    assert ns.get(node_id, subkey="other") == {"foo": "baz"}
+
+    ns._delete_cache_item(node_id)
+    lazy = ns.get(node_id, lazy=True)
+    assert isinstance(lazy, LazyNodeData)
+    assert lazy["foo"] == "bar"
+    assert ns.get_multi([node_id], lazy=True) == {node_id: data}
@@ -0,0 +1,59 @@
+import pytest
+import zstandard
+
+from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.compression import ZSTD_HEADER, NodeCompressor
+from sentry.utils import json
+
+
+def make_payload(i, platform="python"):
+    return NodeStorage._encode(
+        None,
+        {
+            None: {
+                "event_id": "%032x" % i,
+                "platform": platform,
+                "message": f"Something went wrong {i}",
+                "exception": {"values": [{"type": "ValueError", "value": f"bad value {i}"}]},
+            }
+        },
+    )
+
+
+@pytest.fixture
+def dictionaries():
+    samples = [make_payload(i) for i in range(1000)]
+    return {"python": zstandard.train_dictionary(4096, samples)}
+
+
+def test_roundtrip_without_dictionary():
+    compressor = NodeCompressor()
+    payload = make_payload(1)
+    compressed = compressor.compress(payload)
+    assert compressed.startswith(ZSTD_HEADER)
+    assert compressor.decompress(compressed) == payload
+
+
+def test_roundtrip_with_dictionary(dictionaries):
+    compressor = NodeCompressor(dictionaries)
+    payload = make_payload(1001)
+    compressed = compressor.compress(payload, platform="python")
+    assert len(compressed) < len(NodeCompressor().compress(payload))
+    assert compressor.decompress(compressed) == payload
+
+    # Platforms without a dictionary are compressed without one.
+    other = make_payload(1002, platform="javascript")
+    assert compressor.decompress(compressor.compress(other, platform="javascript")) == other
+
+
+def test_missing_dictionary(dictionaries):
+    compressed = NodeCompressor(dictionaries).compress(make_payload(1), platform="python")
+    with pytest.raises(ValueError):
+        NodeCompressor().decompress(compressed)
+
+
+def test_uncompressed_passthrough():
+    compressor = NodeCompressor()
+    payload = json.dumps({"foo": "bar"}).encode("utf-8")
+    assert compressor.decompress(payload) == payload
+    assert compressor.decompress(None) is None
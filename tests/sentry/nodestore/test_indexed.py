@@ -0,0 +1,84 @@
+import pickle
+from unittest import mock
+
+import pytest
+
+from sentry.nodestore import indexed
+from sentry.nodestore.indexed import (
+    INDEXED_HEADER,
+    LazyNodeData,
+    decode_indexed,
+    encode_indexed,
+    json_dumps,
+)
+
+DATA = {
+    None: {"message": "hello", "exception": {"values": [{"type": "ValueError"}]}, "level": 40},
+    "unprocessed": {"message": "raw"},
+    "string": "just a string",
+}
+
+
+def test_roundtrip():
+    value = encode_indexed(dict(DATA))
+    assert value.startswith(INDEXED_HEADER)
+    assert decode_indexed(value) == DATA[None]
+    assert decode_indexed(value, subkey="unprocessed") == {"message": "raw"}
+    assert decode_indexed(value, subkey="string") == "just a string"
+    assert decode_indexed(value, subkey="missing") is None
+
+    # Payloads are stored as the same documents as in the regular encoding
+    assert json_dumps(DATA[None]).encode("utf8") in value
+
+
+def test_lazy_untouched_keys_not_decoded():
+    value = encode_indexed(dict(DATA))
+    with mock.patch.object(indexed, "_loads", wraps=indexed._loads) as loads:
+        rv = decode_indexed(value, lazy=True)
+        assert not loads.called
+
+        assert rv["level"] == 40
+        assert rv["level"] == 40
+        assert "exception" in rv
+        assert sorted(rv) == ["exception", "level", "message"]
+
+    assert [bytes(call[0][0]) for call in loads.call_args_list] == [b"40"]
+
+
+def test_lazy_decodes_on_access():
+    rv = decode_indexed(encode_indexed(dict(DATA)), lazy=True)
+    assert isinstance(rv, LazyNodeData)
+    assert rv._values == {}
+
+    assert rv["level"] == 40
+    assert rv._values == {"level": 40}
+    assert "exception" in rv
+    assert "exception" not in rv._values
+    assert rv.get("missing") is None
+    assert rv == DATA[None]
+
+
+def test_lazy_mutation():
+    rv = decode_indexed(encode_indexed(dict(DATA)), lazy=True)
+
+    rv["level"] = 30
+    rv["new"] = True
+    del rv["message"]
+    assert rv.pop("exception") == DATA[None]["exception"]
+
+    with pytest.raises(KeyError):
+        rv["message"]
+    with pytest.raises(KeyError):
+        del rv["message"]
+
+    assert list(rv) == ["level", "new"]
+    assert len(rv) == 2
+    assert rv.to_dict() == {"level": 30, "new": True}
+
+    rv["message"] = "again"
+    assert rv["message"] == "again"
+
+
+def test_lazy_pickle():
+    rv = decode_indexed(encode_indexed(dict(DATA)), lazy=True)
+    assert pickle.loads(pickle.dumps(rv)) == DATA[None]
@@ -451,6 +451,20 @@ def test_get_counts_for_projects_with_gap(
     assert buckets.counts[-5] == 3
 
 
+def test_get_counts_for_projects(
+    store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
+) -> None:
+    redis_cluster.set("symbolicate_event_low_priority:counter:10:42:110", 3)
+    redis_cluster.set("symbolicate_event_low_priority:counter:10:43:100", 5)
+
+    counts = store.get_counts_for_projects([42, 43, 44], timestamp=113)
+
+    assert counts[42] == store.get_counts_for_project(42, timestamp=113)
+    assert counts[42].counts[-1] == 3
+    assert counts[43].counts[-2] == 5
+    assert counts[44].total_count() == 0
+
+
 #
 # get_durations_for_project()
 #
@@ -505,3 +519,21 @@ def test_get_durations_for_projects_with_gap(
     assert durations.histograms[-3].total_count() == 0
     assert durations.histograms[-4].total_count() == 0
     assert durations.histograms[-5].total_count() == 3
+
+
+def test_get_durations_for_projects(
+    store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
+) -> None:
+    redis_cluster.hset("symbolicate_event_low_priority:duration:10:42:110", 20, 3)
+    redis_cluster.hset("symbolicate_event_low_priority:duration:10:43:100", 30, 5)
+
+    durations = store.get_durations_for_projects([42, 43, 44], timestamp=113)
+
+    assert durations[42].histograms[-1].total_count() == 3
+    assert durations[43].histograms[-2].total_count() == 5
+    assert all(hist.total_count() == 0 for hist in durations[44].histograms)
+    for project_id in (42, 43, 44):
+        expected = store.get_durations_for_project(project_id, timestamp=113)
+        assert [h.total_count() for h in durations[project_id].histograms] == [
+            h.total_count() for h in expected.histograms
+        ]
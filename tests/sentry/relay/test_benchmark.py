@@ -0,0 +1,59 @@
+import pytest
+
+from sentry.models import ProjectKey, ProjectKeyStatus
+from sentry.relay.config import get_project_config, get_project_configs
+from sentry.testutils.skips import requires_benchmark
+
+
+@pytest.fixture
+def synthetic_organization(request, factories, default_organization):
+    """
+    An organization with ``num_projects`` projects with ``num_keys`` project
+    keys each.
+    """
+    num_projects, num_keys = request.param
+    projects = []
+    for _ in range(num_projects):
+        project = factories.create_project(organization=default_organization)
+        # Every project gets a default key on creation
+        for _ in range(num_keys - 1):
+            factories.create_project_key(project=project)
+        projects.append(project)
+
+    project_keys = {}
+    for key in ProjectKey.objects.filter(project__in=projects):
+        project_keys.setdefault(key.project_id, []).append(key)
+
+    return projects, project_keys
+
+
+def get_configs_per_project(projects, project_keys):
+    configs = {}
+    for project in projects:
+        configs[project.id] = get_project_config(project, project_keys=project_keys[project.id])
+        for key in project_keys[project.id]:
+            if key.status == ProjectKeyStatus.ACTIVE:
+                configs[key.public_key] = get_project_config(project, project_keys=[key])
+    return configs
+
+
+def get_configs_bulk(projects, project_keys):
+    project_configs, key_configs = get_project_configs(projects, project_keys)
+    return {**project_configs, **key_configs}
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "synthetic_organization",
+    [(10, 1), (10, 5), (50, 3)],
+    ids=lambda x: "{}_projects_{}_keys".format(*x),
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "get_configs", [get_configs_per_project, get_configs_bulk], ids=["per_project", "bulk"]
+)
+def test_benchmark_project_configs(synthetic_organization, get_configs, benchmark):
+    projects, project_keys = synthetic_organization
+    configs = benchmark(get_configs, projects, project_keys)
+    assert len(configs) == sum(len(keys) + 1 for keys in project_keys.values())
@@ -1,7 +1,7 @@
 import pytest
 
-from sentry.models import ProjectKey
-from sentry.relay.config import get_project_config
+from sentry.models import ProjectKey, ProjectKeyStatus
+from sentry.relay.config import get_project_config, get_project_configs
 from sentry.testutils.helpers import Feature
 from sentry.utils.safe import get_path
 
@@ -130,3 +130,38 @@ def test_project_config_with_span_attributes(default_project, insta_snapshot):
 
     cfg = cfg.to_dict()
     insta_snapshot(cfg["config"]["spanAttributes"])
+
+
+def _strip_volatile(cfg):
+    cfg = cfg.to_dict()
+    for key in ("lastChange", "lastFetch", "rev"):
+        cfg.pop(key, None)
+    return cfg
+
+
+@pytest.mark.django_db
+def test_get_project_configs(default_project, factories):
+    other_project = factories.create_project(organization=default_project.organization)
+    factories.create_project_key(project=other_project)
+    inactive_key = factories.create_project_key(project=other_project)
+    inactive_key.update(status=ProjectKeyStatus.INACTIVE)
+
+    projects = [default_project, other_project]
+    project_keys = {}
+    for key in ProjectKey.objects.filter(project__in=projects):
+        project_keys.setdefault(key.project_id, []).append(key)
+
+    project_configs, key_configs = get_project_configs(projects, project_keys)
+
+    assert set(project_configs) == {default_project.id, other_project.id}
+    for project in projects:
+        expected = get_project_config(project, project_keys=project_keys[project.id])
+        assert _strip_volatile(project_configs[project.id]) == _strip_volatile(expected)
+
+        for key in project_keys[project.id]:
+            if key.status != ProjectKeyStatus.ACTIVE:
+                assert key.public_key not in key_configs
+                continue
+
+            expected = get_project_config(project, project_keys=[key])
+            assert _strip_volatile(key_configs[key.public_key]) == _strip_volatile(expected)
@@ -198,6 +198,41 @@ class RuleProcessorTest(TestCase):
         # mock condition first.
         assert passes.call_count == 0
 
+    def test_frequency_conditions_share_queries(self):
+        frequency_condition = {
+            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+            "interval": "1h",
+            "value": 1000,
+        }
+        percent_condition = dict(
+            frequency_condition, comparisonType="percent", comparisonInterval="1d"
+        )
+        for condition in (frequency_condition, percent_condition):
+            Rule.objects.create(
+                project=self.event.project,
+                data={"conditions": [condition], "actions": [EMAIL_ACTION_DATA]},
+            )
+        self.rule.update(data={"conditions": [frequency_condition], "actions": [EMAIL_ACTION_DATA]})
+
+        with patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.query_hook",
+            return_value=1,
+        ) as query_hook:
+            rp = RuleProcessor(
+                self.event,
+                is_new=True,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            assert len(rp.apply()) == 0
+            # One query for the current and one for the comparison window
+            assert query_hook.call_count == 2
+
+            # Results are cached for the group
+            rp.apply()
+            assert query_hook.call_count == 2
+
 
 # mock filter which always passes
 class MockFilterTrue(EventFilter):
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer
 from sentry.sentry_metrics.indexer.postgres import PGStringIndexer
 from sentry.testutils.cases import TestCase
@@ -28,3 +30,14 @@ class PostgresIndexerTest(TestCase):
         # test invalid values
         assert PGStringIndexer().resolve("beep") is None
         assert PGStringIndexer().reverse_resolve(1234) is None
+
+    def test_local_cache(self):
+        indexer = PGStringIndexer(local_cache_size=10)
+        results = indexer.bulk_record(strings=["hello", "hey"])
+
+        with patch.object(MetricsKeyIndexer.objects, "get_many_from_cache") as get_many:
+            assert indexer.bulk_record(strings=["hello", "hey", "hello"]) == results
+            assert not get_many.called
+
+        results.update(indexer.bulk_record(strings=["hello", "hi"]))
+        assert indexer._local_cache.get_many(["hello", "hey", "hi"]) == results
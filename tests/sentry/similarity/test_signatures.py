@@ -1,7 +1,8 @@
+import random
 from collections import Counter
 from unittest import TestCase
 
-from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.similarity.signatures import MinHashSignatureBuilder, NumpyMinHashSignatureBuilder
 
 
 class MinHashSignatureBuilderTestCase(TestCase):
@@ -28,3 +29,20 @@ class MinHashSignatureBuilderTestCase(TestCase):
         self.assertAlmostEqual(
             similarity, estimation, delta=0.1  # totally made up constant, seems reasonable
         )
+
+    def test_numpy_signatures(self):
+        rng = random.Random(0)
+        feature_sets = [
+            [
+                bytes(rng.randrange(256) for _ in range(rng.randint(0, 40)))
+                for _ in range(rng.randint(1, 20))
+            ]
+            for _ in range(100)
+        ]
+        feature_sets.append({"foo", "bar", "b\xe4z"})
+        feature_sets.append("hello world")
+
+        expected = MinHashSignatureBuilder(16, 0xFFFF)
+        builder = NumpyMinHashSignatureBuilder(16, 0xFFFF)
+        assert builder.sign_many(feature_sets) == expected.sign_many(feature_sets)
+        assert builder("hello world") == expected("hello world")
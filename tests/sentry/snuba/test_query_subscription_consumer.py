@@ -14,6 +14,10 @@ from sentry.snuba.query_subscription_consumer import (
     InvalidMessageError,
     InvalidSchemaError,
     QuerySubscriptionConsumer,
+    batch_preparer_registry,
+    batch_subscriber_registry,
+    register_batch_preparer,
+    register_batch_subscriber,
     register_subscriber,
     subscriber_registry,
 )
@@ -123,6 +127,101 @@ class HandleMessageTest(BaseQuerySubscriptionTest, TestCase):
         )
         mock_callback.assert_called_once_with(data["payload"], sub)
 
+    def test_handle_messages(self):
+        registration_key = "registered_batch_test"
+        calls = mock.Mock()
+        register_subscriber(registration_key)(calls.callback)
+        register_batch_preparer(registration_key)(calls.batch_preparer)
+        with self.tasks():
+            snuba_query = create_snuba_query(
+                QueryDatasets.EVENTS,
+                "hello",
+                "count()",
+                timedelta(minutes=10),
+                timedelta(minutes=1),
+                None,
+            )
+            sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+        sub.refresh_from_db()
+
+        data = self.valid_wrapper
+        data["payload"]["subscription_id"] = sub.subscription_id
+        other_data = deepcopy(data)
+        other_data["payload"]["timestamp"] = "2020-01-01T01:24:45.1234"
+        self.consumer.handle_messages(
+            [self.build_mock_message(data), self.build_mock_message(other_data)]
+        )
+
+        payloads = [self.consumer.parse_message_value(json.dumps(d)) for d in (data, other_data)]
+        assert calls.mock_calls == [
+            mock.call.batch_preparer([(payload, sub) for payload in payloads]),
+            mock.call.callback(payloads[0], sub),
+            mock.call.callback(payloads[1], sub),
+        ]
+
+    def test_handle_messages_batch_preparer_fails(self):
+        registration_key = "registered_failing_batch_test"
+        mock_callback = mock.Mock()
+        register_subscriber(registration_key)(mock_callback)
+        register_batch_preparer(registration_key)(mock.Mock(side_effect=Exception("Boom!")))
+        with self.tasks():
+            snuba_query = create_snuba_query(
+                QueryDatasets.EVENTS,
+                "hello",
+                "count()",
+                timedelta(minutes=10),
+                timedelta(minutes=1),
+                None,
+            )
+            sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+        sub.refresh_from_db()
+
+        data = self.valid_wrapper
+        data["payload"]["subscription_id"] = sub.subscription_id
+        self.consumer.handle_messages([self.build_mock_message(data)])
+        assert mock_callback.call_count == 1
+
+    def test_handle_messages_batch_subscriber(self):
+        registration_key = "registered_batch_subscriber_test"
+        calls = mock.Mock()
+        register_subscriber(registration_key)(calls.callback)
+        register_batch_preparer(registration_key)(calls.batch_preparer)
+        register_batch_subscriber(registration_key)(calls.batch_subscriber)
+        with self.tasks():
+            snuba_query = create_snuba_query(
+                QueryDatasets.EVENTS,
+                "hello",
+                "count()",
+                timedelta(minutes=10),
+                timedelta(minutes=1),
+                None,
+            )
+            sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+            other_sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+        sub.refresh_from_db()
+        other_sub.refresh_from_db()
+
+        data = self.valid_wrapper
+        data["payload"]["subscription_id"] = sub.subscription_id
+        other_data = deepcopy(data)
+        other_data["payload"]["subscription_id"] = other_sub.subscription_id
+        with self.assertNumQueries(1):
+            self.consumer.handle_messages(
+                [
+                    self.build_mock_message(data),
+                    self.build_mock_message(other_data),
+                ]
+            )
+
+        updates = [
+            (self.consumer.parse_message_value(json.dumps(data)), sub),
+            (self.consumer.parse_message_value(json.dumps(other_data)), other_sub),
+        ]
+        assert calls.mock_calls == [
+            mock.call.batch_preparer(updates),
+            mock.call.batch_subscriber(updates),
+        ]
+
 
 class ParseMessageValueTest(BaseQuerySubscriptionTest, unittest.TestCase):
     def run_test(self, message):
@@ -198,3 +297,37 @@ class RegisterSubscriberTest(unittest.TestCase):
         with self.assertRaises(Exception) as cm:
             register_subscriber("hello")(other_callback)
         assert str(cm.exception) == "Handler already registered for hello"
+
+
+class RegisterBatchPreparerTest(unittest.TestCase):
+    def setUp(self):
+        self.orig_registry = deepcopy(batch_preparer_registry)
+
+    def tearDown(self):
+        batch_preparer_registry.clear()
+        batch_preparer_registry.update(self.orig_registry)
+
+    def test_register(self):
+        preparer = object()
+        register_batch_preparer("hello")(preparer)
+        assert batch_preparer_registry["hello"] == preparer
+        with self.assertRaises(Exception) as cm:
+            register_batch_preparer("hello")(object())
+        assert str(cm.exception) == "Batch preparer already registered for hello"
+
+
+class RegisterBatchSubscriberTest(unittest.TestCase):
+    def setUp(self):
+        self.orig_registry = deepcopy(batch_subscriber_registry)
+
+    def tearDown(self):
+        batch_subscriber_registry.clear()
+        batch_subscriber_registry.update(self.orig_registry)
+
+    def test_register(self):
+        subscriber = object()
+        register_batch_subscriber("hello")(subscriber)
+        assert batch_subscriber_registry["hello"] == subscriber
+        with self.assertRaises(Exception) as cm:
+            register_batch_subscriber("hello")(object())
+        assert str(cm.exception) == "Batch subscriber already registered for hello"
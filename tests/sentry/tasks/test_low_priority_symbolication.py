@@ -16,6 +16,7 @@ from sentry.tasks import low_priority_symbolication
 from sentry.tasks.low_priority_symbolication import (
     _scan_for_suspect_projects,
     _update_lpq_eligibility,
+    _update_lpq_eligibility_for_projects,
     excessive_event_duration,
     excessive_event_rate,
 )
@@ -60,7 +61,9 @@ class TestScanForSuspectProjects:
         self, monkeypatch: "pytest.MonkeyPatch"
     ) -> Generator[mock.Mock, None, None]:
         mock_fn = mock.Mock()
-        monkeypatch.setattr(low_priority_symbolication, "update_lpq_eligibility", mock_fn)
+        monkeypatch.setattr(
+            low_priority_symbolication, "update_lpq_eligibility_for_projects", mock_fn
+        )
         yield mock_fn
 
     def test_no_metrics_not_in_lpq(
@@ -97,6 +100,28 @@ class TestScanForSuspectProjects:
 
         assert mock_update_lpq_eligibility.delay.called
 
+    @freeze_time(datetime.fromtimestamp(0))
+    def test_chunks_projects(
+        self,
+        store: RealtimeMetricsStore,
+        mock_update_lpq_eligibility: mock.Mock,
+        monkeypatch: "pytest.MonkeyPatch",
+    ) -> None:
+        monkeypatch.setattr(low_priority_symbolication, "ELIGIBILITY_CHUNK_SIZE", 2)
+        for project_id in (17, 18, 19):
+            store.increment_project_event_counter(project_id=project_id, timestamp=0)
+
+        with TaskRunner():
+            _scan_for_suspect_projects()
+
+        assert mock_update_lpq_eligibility.delay.call_count == 2
+        project_ids = [
+            project_id
+            for call in mock_update_lpq_eligibility.delay.call_args_list
+            for project_id in call.kwargs["project_ids"]
+        ]
+        assert sorted(project_ids) == [17, 18, 19]
+
 
 class TestUpdateLpqEligibility:
     def test_no_counts_no_durations_in_lpq(self, store: RealtimeMetricsStore) -> None:
@@ -169,6 +194,28 @@ class TestUpdateLpqEligibility:
         assert store.get_lpq_projects() == {17}
 
 
+class TestUpdateLpqEligibilityForProjects:
+    @freeze_time(datetime.fromtimestamp(0))
+    def test_mixed_eligibility(
+        self, store: RealtimeMetricsStore, monkeypatch: "pytest.MonkeyPatch"
+    ) -> None:
+        store.add_project_to_lpq(18)
+        store.add_project_to_lpq(19)
+        store.increment_project_event_counter(project_id=17, timestamp=0)
+        store.increment_project_event_counter(project_id=17, timestamp=0)
+        store.increment_project_event_counter(project_id=19, timestamp=0)
+        store.increment_project_event_counter(project_id=19, timestamp=0)
+
+        monkeypatch.setattr(
+            low_priority_symbolication,
+            "excessive_event_rate",
+            lambda proj, counts: counts.total_count() > 1,
+        )
+
+        _update_lpq_eligibility_for_projects([17, 18, 19, 20], cutoff=10)
+        assert store.get_lpq_projects() == {17, 19}
+
+
 class TestExcessiveEventRate:
     def test_high_rate_no_spike(self) -> None:
         # 600 events/10s for 2 minutes
@@ -179,6 +179,38 @@ class RedisTSDBTest(TestCase):
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert results == {1: 0, 2: 0}
 
+    def test_get_range_downsampling(self):
+        now = int(to_timestamp(datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)))
+        start = to_datetime(now - (now % (ONE_HOUR * 2)))
+        dts = [start + timedelta(hours=i) for i in range(4)]
+
+        self.db.incr(TSDBModel.project, 1, dts[0])
+        self.db.incr(TSDBModel.project, 1, dts[1], count=2)
+        self.db.incr(TSDBModel.project, 1, dts[3], count=3)
+
+        epoch = int(to_timestamp(start))
+        results = self.db.get_range(TSDBModel.project, [1, 2], dts[0], dts[-1], rollup=ONE_HOUR * 2)
+        assert results == {
+            1: [(epoch, 0), (epoch + ONE_HOUR * 2, 0)],
+            2: [(epoch, 0), (epoch + ONE_HOUR * 2, 0)],
+        }
+
+        db = RedisTSDB(
+            rollups=self.db.rollups.items(),
+            vnodes=64,
+            enable_range_downsampling=True,
+            hosts={i - 6: {"db": i} for i in range(6, 9)},
+        )
+        assert db.get_stored_rollup(ONE_HOUR) == ONE_HOUR
+        assert db.get_stored_rollup(ONE_HOUR * 2) == ONE_HOUR
+        assert db.get_stored_rollup(ONE_DAY * 7) == ONE_DAY
+
+        results = db.get_range(TSDBModel.project, [1, 2], dts[0], dts[-1], rollup=ONE_HOUR * 2)
+        assert results == {
+            1: [(epoch, 3), (epoch + ONE_HOUR * 2, 3)],
+            2: [(epoch, 0), (epoch + ONE_HOUR * 2, 0)],
+        }
+
     def test_count_distinct(self):
         now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
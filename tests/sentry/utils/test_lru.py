@@ -0,0 +1,46 @@
+from sentry.utils.lru import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert len(cache) == 2
+
+
+def test_delete_and_clear():
+    cache = LRUCache(10)
+    cache.set_many({"a": 1, "b": 2})
+    cache.delete("a")
+    cache.delete("missing")
+    assert "a" not in cache
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_evicts_by_weight():
+    cache = LRUCache(10, max_weight=10)
+    cache.set("a", 1, weight=4)
+    cache.set("b", 2, weight=4)
+    cache.set("a", 1, weight=5)
+    assert cache.weight == 9
+
+    cache.set("c", 3, weight=3)
+    assert "b" not in cache
+    assert cache.get_many(["a", "c"]) == {"a": 1, "c": 3}
+    assert cache.weight == 8
+
+    # Items heavier than the whole cache are never stored
+    cache.set("d", 4, weight=11)
+    assert "d" not in cache
+    assert cache.weight == 8
+
+    cache.clear()
+    assert cache.weight == 0
@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 from datetime import datetime, timedelta
 from unittest import mock
@@ -12,6 +14,8 @@ from sentry.utils.snuba import (
     Dataset,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
+    _inflight_queries,
     _prepare_query_params,
     get_json_type,
     get_query_params_to_update_for_projects,
@@ -277,6 +281,64 @@ class PrepareQueryParamsTest(TestCase):
             _prepare_query_params(query_params)
 
 
+def _identity(x):
+    return x
+
+
+class QueryCacheTest(TestCase):
+    def query(self, query_params):
+        return list(
+            _apply_cache_and_build_results(
+                [(query_params, _identity, _identity)], referrer="test", use_cache=True
+            )
+        )[0]
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_cached_result(self, bulk_snuba_query):
+        result = {"data": [{"count": 1, "name": "foo", "avg": 0.5}], "meta": []}
+        bulk_snuba_query.return_value = [result]
+
+        assert self.query({"id": "test_cached_result"}) == result
+        assert self.query({"id": "test_cached_result"}) == result
+        assert bulk_snuba_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_coalesces_concurrent_queries(self, bulk_snuba_query):
+        started = threading.Event()
+        finish = threading.Event()
+
+        def run_query(snuba_param_list, headers):
+            started.set()
+            finish.wait(5)
+            return [{"data": [{"count": 1}]} for _ in snuba_param_list]
+
+        bulk_snuba_query.side_effect = run_query
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.query({"id": "test_coalesces"})))
+            for _ in range(3)
+        ]
+        with mock.patch.object(_inflight_queries, "claim", wraps=_inflight_queries.claim) as claim:
+            threads[0].start()
+            assert started.wait(5)
+            for thread in threads[1:]:
+                thread.start()
+
+            # Wait for all callers to find the running query before finishing it
+            deadline = time.monotonic() + 5
+            while claim.call_count < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            finish.set()
+            for thread in threads:
+                thread.join(5)
+
+        assert bulk_snuba_query.call_count == 1
+        assert results == [{"data": [{"count": 1}]}] * 3
+        # Every caller gets its own copy of the result
+        assert len({id(result) for result in results}) == 3
+
+
 class QuantizeTimeTest(unittest.TestCase):
     def setUp(self):
         self.now = timezone.now().replace(microsecond=0)
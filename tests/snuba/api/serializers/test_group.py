@@ -25,7 +25,8 @@ from sentry.models import (
     UserOption,
 )
 from sentry.notifications.types import NotificationSettingOptionValues, NotificationSettingTypes
-from sentry.testutils import APITestCase, SnubaTestCase
+from sentry.testutils import APITestCase, SnubaTestCase, TransactionTestCase
+from sentry.testutils.helpers import override_options
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.types.integrations import ExternalProviders
 from sentry.utils.cache import cache
@@ -624,3 +625,44 @@ class StreamGroupSerializerTestCase(APITestCase, SnubaTestCase):
         assert result[0]["sessionCount"] == 2
         # No sessions in project2
         assert result[1]["sessionCount"] is None
+
+
+class StreamGroupSerializerConcurrentQueriesTest(TransactionTestCase, SnubaTestCase):
+    # The queries run on other threads, which only see committed data.
+    def test_concurrent_queries(self):
+        data = {
+            "fingerprint": ["group-1"],
+            "timestamp": iso_format(before_now(minutes=1)),
+            "environment": "production",
+        }
+        group = self.store_event(data=data, project_id=self.project.id).group
+        self.store_event(data=data, project_id=self.project.id)
+        environment = Environment.objects.get(name="production")
+
+        def serialize_groups():
+            return serialize(
+                [group],
+                serializer=StreamGroupSerializerSnuba(
+                    environment_ids=[environment.id],
+                    stats_period="24h",
+                    start=before_now(days=1),
+                    end=before_now(seconds=1),
+                    expand=["sessions"],
+                ),
+            )
+
+        expected = serialize_groups()
+        assert expected[0]["count"] == "2"
+
+        with override_options({"serializers.group-stream.concurrent-queries": True}), patch(
+            "sentry.api.serializers.models.group.metrics.timing"
+        ) as timing:
+            assert serialize_groups() == expected
+
+        queries = {
+            call[1]["tags"]["query"]
+            for call in timing.call_args_list
+            if call[0][0] == "serializers.group_stream.query"
+        }
+        assert queries == {"time_range", "lifetime", "stats", "session_counts"}
+        assert all(call[1]["tags"]["mode"] == "concurrent" for call in timing.call_args_list)
@@ -78,24 +78,49 @@ class MetricsIndexerWorkerTest(TestCase):
         mock_message.value = MagicMock(return_value=json.dumps(metrics_payload))
 
         parsed = metrics_worker.process_message(mock_message)
-        assert parsed["tags"] == {
-            PGStringIndexer().resolve(string=k): PGStringIndexer().resolve(string=str(v))
-            for k, v in payload["tags"].items()
-        }
-        assert parsed["metric_id"] == PGStringIndexer().resolve(string=payload["name"])
+        assert parsed["tags"] == payload["tags"]
 
         if with_exception:
             with pytest.raises(Exception, match="didn't get all the callbacks: 1 left"):
                 metrics_worker.flush_batch([parsed])
         else:
             metrics_worker.flush_batch([parsed])
+            translated = translate_payload()
+            assert translated["tags"] == {
+                PGStringIndexer().resolve(string=k): PGStringIndexer().resolve(string=str(v))
+                for k, v in payload["tags"].items()
+            }
             producer.produce.assert_called_with(
                 topic="snuba-metrics",
                 key=None,
-                value=json.dumps(parsed).encode(),
+                value=json.dumps(translated).encode(),
                 on_delivery=metrics_worker.callback,
             )
 
+    @pytest.mark.django_db
+    @patch("sentry.sentry_metrics.indexer.indexer_consumer.process_indexed_metrics")
+    @patch("sentry.sentry_metrics.indexer.indexer_consumer.indexer")
+    def test_resolves_batch_once(self, indexer, mock_task):
+        indexer.bulk_record = MagicMock(side_effect=lambda strings: {s: len(s) for s in strings})
+        producer = MagicMock()
+        producer.flush = MagicMock(return_value=0)
+        metrics_worker = MetricsIndexerWorker(producer=producer)
+
+        other_payload = dict(payload, tags={"environment": "staging"})
+        batch = []
+        for p in (payload, other_payload):
+            mock_message = Mock()
+            mock_message.value = MagicMock(return_value=json.dumps(p))
+            batch.append(metrics_worker.process_message(mock_message))
+
+        metrics_worker.flush_batch(batch)
+
+        (call,) = indexer.bulk_record.mock_calls
+        assert sorted(call.args[0]) == sorted(
+            {"session", "staging", *payload["tags"].keys(), *payload["tags"].values()}
+        )
+        assert producer.produce.call_count == 2
+
 
 class MetricsIndexerConsumerTest(TestCase):
     def _get_producer(self, topic):